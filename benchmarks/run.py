@@ -0,0 +1,299 @@
+"""
+ViperX Benchmarks - Scaling of the core operations with workspace size
+
+Usage:
+    python benchmarks/run.py                      # Compare against baselines.json
+    python benchmarks/run.py --sizes 10,100       # Subset of sizes
+    python benchmarks/run.py -k scanner           # Only cases matching a substring
+    python benchmarks/run.py --save               # Record new baselines
+    python benchmarks/run.py --check              # Exit 1 on regression (CI)
+    python benchmarks/run.py --real-uv            # Use the real `uv` instead of the stand-in
+
+Each case is measured on synthetic workspaces of 10, 100 and 1000 packages
+(see workspace.py) for:
+- Wall time: median of --repeat runs (setup excluded)
+- Peak memory: one extra run under tracemalloc (Python allocations)
+
+`uv` is replaced by the offline stand-in (viperx.fake_uv, VIPERX_UV=fake) so
+timings measure ViperX itself rather than uv or the network.
+
+Cases:
+    apply_fresh        ConfigEngine.apply on an empty directory (runs `uv init`)
+    apply_noop         ConfigEngine.apply on an up-to-date workspace
+    scanner_scan       ConfigScanner.scan
+    scanner_update     ConfigScanner.update_config (with drift)
+    scanner_write      ConfigScanner.write_config
+    annotate_conflicts ConfigEngine._annotate_config_conflicts
+    render_templates   Package templates rendered for every package
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from workspace import make_workspace, write_config
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+DEFAULT_SIZES = [10, 100, 1000]
+PACKAGE_TEMPLATES = ["__init__.py.j2", "main.py.j2", "config.py.j2", "config.yaml.j2"]
+
+
+@dataclass
+class Case:
+    name: str
+    # setup(tmp_dir, n) -> zero-argument callable measured by the runner
+    setup: Callable[[Path, int], Callable[[], object]]
+    # Largest size run by default (subprocess-bound cases are too slow at 1000)
+    max_size: int = 1000
+    repeat: int = 0  # 0 = use --repeat
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence rich/print output of the code under test."""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def chdir(path: Path):
+    old = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(old)
+
+
+# =============================================================================
+# Cases
+# =============================================================================
+
+def setup_apply_fresh(tmp: Path, n: int):
+    from viperx.config_engine import ConfigEngine
+
+    config_path = write_config(tmp / "viperx.yaml", n)
+    run_dir = tmp / "run"
+
+    def run():
+        # Every run starts from an empty directory
+        if run_dir.exists():
+            shutil.rmtree(run_dir)
+        run_dir.mkdir()
+        with chdir(run_dir):
+            ConfigEngine(config_path).apply()
+    return run
+
+
+def setup_apply_noop(tmp: Path, n: int):
+    from viperx.config_engine import ConfigEngine
+
+    project = make_workspace(tmp, n)
+
+    def run():
+        with chdir(project):
+            ConfigEngine(project / "viperx.yaml").apply()
+    return run
+
+
+def _scanner_setup(tmp: Path, n: int):
+    import yaml
+
+    from viperx.config_scanner import ConfigScanner
+
+    project = make_workspace(tmp, n, drift=True)
+    existing = yaml.safe_load((project / "viperx.yaml").read_text())
+    return project, existing, ConfigScanner
+
+
+def setup_scanner_scan(tmp: Path, n: int):
+    project, _, ConfigScanner = _scanner_setup(tmp, n)
+    return lambda: ConfigScanner(project, explain=False).scan()
+
+
+def setup_scanner_update(tmp: Path, n: int):
+    project, existing, ConfigScanner = _scanner_setup(tmp, n)
+    return lambda: ConfigScanner(project, explain=False).update_config(existing)
+
+
+def setup_scanner_write(tmp: Path, n: int):
+    project, existing, ConfigScanner = _scanner_setup(tmp, n)
+    scanner = ConfigScanner(project, explain=False)
+    config, annotations = scanner.update_config(existing)
+    out = tmp / "written.yaml"
+    return lambda: scanner.write_config(config, annotations, out)
+
+
+def setup_annotate_conflicts(tmp: Path, n: int):
+    from viperx.config_engine import ConfigEngine
+    from viperx.report import UpdateReport
+
+    project = make_workspace(tmp, n, drift=True)
+    config_path = project / "viperx.yaml"
+    original = config_path.read_text()
+    engine = ConfigEngine(config_path)
+    conflicts = [
+        f"Package '{pkg['name']}': use_env=False but .env exists"
+        for pkg in engine.config["workspace"]["packages"]
+        if (project / "src" / pkg["name"] / ".env").exists() and not pkg["use_env"]
+    ]
+
+    def run():
+        config_path.write_text(original)
+        engine._annotate_config_conflicts(project, UpdateReport(conflicts=list(conflicts)))
+    return run
+
+
+def setup_render_templates(tmp: Path, n: int):
+    from viperx.config_engine import ConfigEngine
+
+    config_path = write_config(tmp / "viperx.yaml", n)
+    engine = ConfigEngine(config_path)
+    scripts, dep_context, _ = engine._aggregate_context()
+    generators = [
+        engine._package_generator(pkg, scripts, dep_context)
+        for pkg in engine.config["workspace"]["packages"]
+    ]
+
+    def run():
+        for gen in generators:
+            context = gen.build_context(is_subpackage=True)
+            for name in PACKAGE_TEMPLATES:
+                gen.render_string(name, context)
+    return run
+
+
+CASES = [
+    Case("apply_fresh", setup_apply_fresh, max_size=100, repeat=1),
+    Case("apply_noop", setup_apply_noop),
+    Case("scanner_scan", setup_scanner_scan),
+    Case("scanner_update", setup_scanner_update),
+    Case("scanner_write", setup_scanner_write),
+    Case("annotate_conflicts", setup_annotate_conflicts),
+    Case("render_templates", setup_render_templates),
+]
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+def measure(case: Case, n: int, repeat: int) -> dict:
+    """Median wall time and tracemalloc peak for one case/size."""
+    with tempfile.TemporaryDirectory(prefix=f"viperx-bench-{case.name}-") as tmp:
+        with quiet():
+            run = case.setup(Path(tmp), n)
+
+            times = []
+            for _ in range(case.repeat or repeat):
+                start = time.perf_counter()
+                run()
+                times.append(time.perf_counter() - start)
+
+            tracemalloc.start()
+            try:
+                run()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+    return {"time_s": round(statistics.median(times), 6), "peak_mib": round(peak / 2**20, 3)}
+
+
+def compare(results: dict, baselines: dict, time_tolerance: float, mem_tolerance: float) -> list[dict]:
+    rows = []
+    for key, result in results.items():
+        base = baselines.get(key)
+        row = {"case": key, **result, "time_ratio": None, "mem_ratio": None, "regression": False}
+        if base:
+            row["time_ratio"] = result["time_s"] / base["time_s"] if base["time_s"] else None
+            row["mem_ratio"] = result["peak_mib"] / base["peak_mib"] if base["peak_mib"] else None
+            row["regression"] = (
+                (row["time_ratio"] or 0) > time_tolerance or (row["mem_ratio"] or 0) > mem_tolerance
+            )
+        rows.append(row)
+    return rows
+
+
+def print_rows(rows: list[dict]):
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="🐍 ViperX Benchmarks", border_style="blue")
+    table.add_column("Case", style="cyan")
+    table.add_column("Time (ms)", justify="right")
+    table.add_column("vs base", justify="right")
+    table.add_column("Peak (MiB)", justify="right")
+    table.add_column("vs base", justify="right")
+
+    def ratio(value):
+        if value is None:
+            return "[dim]-[/dim]"
+        color = "red" if value > 1.1 else "green" if value < 0.9 else "white"
+        return f"[{color}]{value:.2f}x[/{color}]"
+
+    for row in rows:
+        name = f"[bold red]{row['case']} ⚠[/bold red]" if row["regression"] else row["case"]
+        table.add_row(
+            name, f"{row['time_s'] * 1000:.1f}", ratio(row["time_ratio"]),
+            f"{row['peak_mib']:.2f}", ratio(row["mem_ratio"]),
+        )
+    Console().print(table)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ViperX scaling benchmarks")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated package counts")
+    parser.add_argument("-k", dest="keyword", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (median reported)")
+    parser.add_argument("--full", action="store_true", help="Ignore per-case size caps (e.g. apply_fresh at 1000)")
+    parser.add_argument("--save", action="store_true", help="Write results to baselines.json")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a case regressed beyond tolerance")
+    parser.add_argument("--time-tolerance", type=float, default=1.5, help="Allowed time ratio vs baseline")
+    parser.add_argument("--mem-tolerance", type=float, default=1.2, help="Allowed peak memory ratio vs baseline")
+    parser.add_argument("--real-uv", action="store_true", help="Run the real `uv` (default: viperx.fake_uv)")
+    parser.add_argument("--json", dest="json_output", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    if not args.real_uv:
+        os.environ["VIPERX_UV"] = "fake"
+    results = {}
+    for case in CASES:
+        if args.keyword not in case.name:
+            continue
+        for n in sizes:
+            if n > case.max_size and not args.full:
+                continue
+            results[f"{case.name}[{n}]"] = measure(case, n, args.repeat)
+
+    baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    rows = compare(results, baselines, args.time_tolerance, args.mem_tolerance)
+
+    if args.json_output:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_rows(rows)
+
+    if args.save:
+        baselines.update(results)
+        BASELINES_PATH.write_text(json.dumps(dict(sorted(baselines.items())), indent=2) + "\n")
+        print(f"Baselines saved to {BASELINES_PATH}")
+
+    if args.check and any(r["regression"] for r in rows):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Synthetic workspaces for the ViperX benchmarks.
+
+- `make_config(n)`: a viperx.yaml with n workspace packages and mixed
+  feature flags (use_env / use_config / use_tests / use_readme, classic/ml).
+- `make_workspace(root, n, drift)`: the matching on-disk workspace, written
+  directly (no `uv`), so even 1000 packages are built in well under a second.
+  With `drift`, one package in ten gets a `.env` its config disables, which
+  produces conflicts (and viperx.yaml annotations) on apply.
+
+Generation is deterministic: the same `n` always yields the same tree.
+"""
+from pathlib import Path
+
+import yaml
+
+ROOT_NAME = "bench_ws"
+
+
+def package_flags(i: int) -> dict:
+    """Mixed, deterministic feature flags for the i-th package."""
+    pkg = {
+        "name": f"pkg_{i:04d}",
+        "description": f"Synthetic package {i}",
+        "use_env": i % 2 == 0,
+        "use_config": i % 3 != 0,
+        "use_tests": i % 4 != 0,
+        "use_readme": i % 5 == 0,
+    }
+    if i % 7 == 0:
+        pkg["type"] = "ml"
+    return pkg
+
+
+def make_config(n: int) -> dict:
+    return {
+        "project": {
+            "name": ROOT_NAME,
+            "description": f"Synthetic workspace with {n} packages",
+            "author": "Bench Mark",
+            "license": "MIT",
+            "builder": "uv",
+        },
+        "settings": {
+            # Must match the type detected from the aggregated dependencies
+            # (ml packages => ml root), or apply stops at the type-change guard
+            "type": "ml",
+            "use_env": False,
+            "use_config": True,
+            "use_tests": True,
+        },
+        "workspace": {"packages": [package_flags(i) for i in range(n)]},
+    }
+
+
+def write_config(path: Path, n: int) -> Path:
+    path.write_text(yaml.safe_dump(make_config(n), sort_keys=False))
+    return path
+
+
+def _write_package(pkg_dir: Path, pkg: dict, drift: bool):
+    pkg_dir.mkdir(parents=True)
+    (pkg_dir / "__init__.py").write_text(f'"""{pkg.get("description", "")}"""\n')
+    (pkg_dir / "main.py").write_text("def main():\n    print('hello')\n")
+    if pkg.get("use_config", True):
+        (pkg_dir / "config.py").write_text("SETTINGS = {}\n")
+        (pkg_dir / "config.yaml").write_text("# Config\n")
+    if pkg.get("use_env", False) or drift:
+        (pkg_dir / ".env").write_text("# Environment Variables\n")
+    if pkg.get("use_tests", True):
+        (pkg_dir / "tests").mkdir()
+        (pkg_dir / "tests" / "__init__.py").write_text("")
+        (pkg_dir / "tests" / "test_core.py").write_text("def test_dummy():\n    assert True\n")
+    if pkg.get("use_readme", False):
+        (pkg_dir / "README.md").write_text(f"# {pkg['name']}\n")
+
+
+def make_workspace(root: Path, n: int, drift: bool = False) -> Path:
+    """
+    Build an already-generated workspace of n packages under root/bench_ws
+    (pyproject.toml rendered from the real template, package files stubbed).
+    Returns the project root (which also holds viperx.yaml).
+    """
+    from viperx.config_engine import ConfigEngine
+
+    project = root / ROOT_NAME
+    project.mkdir(parents=True)
+    config_path = write_config(project / "viperx.yaml", n)
+
+    engine = ConfigEngine(config_path)
+    scripts, dep_context, _ = engine._aggregate_context()
+    root_gen = engine._root_generator(scripts, dep_context)
+    context = root_gen.build_context()
+    (project / "pyproject.toml").write_text(root_gen.render_string("pyproject.toml.j2", context))
+    (project / "README.md").write_text(f"# {ROOT_NAME}\n")
+
+    config = engine.config
+    _write_package(project / "src" / ROOT_NAME, {"name": ROOT_NAME, **config["settings"]}, drift=False)
+    for i, pkg in enumerate(config["workspace"]["packages"]):
+        # Drift: a .env the config disables
+        _write_package(project / "src" / pkg["name"], pkg, drift=drift and i % 10 == 1 and not pkg["use_env"])
+    return project
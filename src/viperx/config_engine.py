@@ -1,14 +1,18 @@
 import yaml
 from pathlib import Path
+from typing import Optional
 from rich.console import Console
 from rich.panel import Panel
 
 from viperx.core import ProjectGenerator
+from viperx.instrumentation import count, phase, span, traced
+from viperx.utils import write_text
 from viperx.constants import (
     DEFAULT_LICENSE, DEFAULT_BUILDER,
     TYPE_CLASSIC, TYPE_ML, TYPE_DL, PROJECT_TYPES,
     FRAMEWORK_PYTORCH, DL_FRAMEWORKS,
-    SUPPORTED_BUILDERS, SUPPORTED_LICENSES
+    SUPPORTED_BUILDERS, SUPPORTED_LICENSES,
+    BENCHMARKS_DIR, PYTEST_BENCHMARK_REQUIREMENT
 )
 
 console = Console()
@@ -19,11 +23,15 @@ class ConfigEngine:
     Implements the 'Infrastructure as Code' pattern for ViperX.
     """
     
-    def __init__(self, config_path: Path, verbose: bool = False):
+    def __init__(self, config_path: Path, verbose: bool = False, uv: Optional[str] = None):
         self.config_path = config_path
         self.verbose = verbose
+        # uv executable for the generators (see ProjectGenerator)
+        self.uv = uv
         self.config = self._load_config()
         self.root_path = Path.cwd()
+        # (path, tomlkit document) of the root pyproject.toml, see _load_pyproject
+        self._pyproject_cache = None
 
     def _load_config(self) -> dict:
         """Load and validate the YAML configuration."""
@@ -33,7 +41,8 @@ class ConfigEngine:
             
         with open(self.config_path, "r") as f:
             try:
-                data = yaml.safe_load(f)
+                with span("yaml.parse", "parse", path=self.config_path):
+                    data = yaml.safe_load(f)
             except yaml.YAMLError as e:
                 console.print(f"[bold red]Error:[/bold red] Invalid YAML format: {e}")
                 raise ValueError("Invalid YAML")
@@ -77,19 +86,21 @@ class ConfigEngine:
                  raise ValueError(f"Invalid Framework '{f}'")
         
         # 3. Boolean Flags (Strict Check)
-        for key in ["use_env", "use_config", "use_tests", "use_readme"]:
+        for key in ["use_env", "use_config", "use_tests", "use_bench", "use_readme"]:
             if key in sets and not isinstance(sets[key], bool):
                  console.print(f"[bold red]Error:[/bold red] '{key}' must be 'true' or 'false' (boolean), not '{sets[key]}'")
                  raise ValueError(f"Invalid Boolean '{key}'")
         
         return data
 
+    @traced("ConfigEngine.apply")
     def apply(self):
         """Apply the configuration to the current directory."""
         from viperx.report import UpdateReport
         from viperx.utils import sanitize_project_name
         
         report = UpdateReport()
+        self._pyproject_cache = None
         project_conf = self.config.get("project", {})
         settings_conf = self.config.get("settings", {})
         workspace_conf = self.config.get("workspace", {})
@@ -106,75 +117,19 @@ class ConfigEngine:
         # ---------------------------------------------------------
         # Phase 0: Context Aggregation (PRESERVED LOGIC)
         # ---------------------------------------------------------
+        phase("aggregate")
         # We assume dependencies logic is required for both generation and validation.
-        
         root_use_config = settings_conf.get("use_config", True)
         root_use_env = settings_conf.get("use_env", False)
         root_use_tests = settings_conf.get("use_tests", True)
-        root_type = settings_conf.get("type", TYPE_CLASSIC)
-        root_framework = settings_conf.get("framework", FRAMEWORK_PYTORCH)
-        
-        glob_has_config = root_use_config
-        glob_has_env = root_use_env
-        glob_is_ml_dl = root_type in [TYPE_ML, TYPE_DL]
-        glob_is_dl = root_type == TYPE_DL
-        glob_frameworks = {root_framework} if glob_is_dl else set()
-
-        project_scripts = {project_name: f"{clean_name}.main:main"} # Use clean mapping
-        
-        # List for README generation (Order: Root, then packages)
-        packages_list = [{
-            "raw_name": project_name,
-            "clean_name": clean_name,
-            "use_config": root_use_config,
-            "use_tests": root_use_tests,
-            "use_env": root_use_env
-        }]
         
+        project_scripts, dep_context, packages_list = self._aggregate_context()
         packages = workspace_conf.get("packages", [])
-        for pkg in packages:
-            # Scripts
-            pkg_name = pkg.get("name")
-            pkg_name_clean = sanitize_project_name(pkg_name)
-            project_scripts[pkg_name] = f"{pkg_name_clean}.main:main"
-            
-            # Dependency Aggregation
-            p_config = pkg.get("use_config", settings_conf.get("use_config", True))
-            p_env = pkg.get("use_env", settings_conf.get("use_env", False))
-            p_tests = pkg.get("use_tests", settings_conf.get("use_tests", True))
-            p_type = pkg.get("type", TYPE_CLASSIC)
-            p_framework = pkg.get("framework", FRAMEWORK_PYTORCH)
-
-            if p_config:
-                glob_has_config = True
-            if p_env:
-                glob_has_env = True
-            if p_type in [TYPE_ML, TYPE_DL]:
-                glob_is_ml_dl = True
-            if p_type == TYPE_DL:
-                glob_is_dl = True
-                glob_frameworks.add(p_framework)
-                 
-            packages_list.append({
-                "raw_name": pkg_name,
-                "clean_name": pkg_name_clean,
-                "use_config": p_config,
-                "use_tests": p_tests,
-                "use_env": p_env
-            })
-
-        dep_context = {
-            "has_config": glob_has_config,
-            "has_env": glob_has_env,
-            "is_ml_dl": glob_is_ml_dl,
-            "is_dl": glob_is_dl,
-            "frameworks": list(glob_frameworks),
-            "packages": packages_list
-        }
 
         # ---------------------------------------------------------
         # Phase 0.5: Type Change Detection (Block Breaking Changes)
         # ---------------------------------------------------------
+        phase("type check")
         existing_pyproject = current_root / "pyproject.toml"
         if existing_pyproject.exists():
             existing_type = self._detect_project_type(current_root)
@@ -205,6 +160,7 @@ class ConfigEngine:
         # ---------------------------------------------------------
         # Phase 1: Root Project (Hydration vs Update)
         # ---------------------------------------------------------
+        phase("root project")
         if not (current_root / "pyproject.toml").exists():
             # CASE A: New Project (Hydration)
             if not current_root.exists() and current_root != self.root_path:
@@ -212,21 +168,7 @@ class ConfigEngine:
             else:
                 report.added.append(f"Project Scaffolding in existing '{current_root.name}'")
                 
-            gen = ProjectGenerator(
-                name=project_name, # Raw name
-                description=project_conf.get("description", ""),
-                type=settings_conf.get("type", TYPE_CLASSIC),
-                author=project_conf.get("author", None),
-                license=project_conf.get("license", DEFAULT_LICENSE),
-                builder=project_conf.get("builder", DEFAULT_BUILDER),
-                use_env=settings_conf.get("use_env", False),
-                use_config=settings_conf.get("use_config", True),
-                use_tests=settings_conf.get("use_tests", True),
-                framework=settings_conf.get("framework", FRAMEWORK_PYTORCH),
-                scripts=project_scripts,
-                dependency_context=dep_context,
-                verbose=self.verbose
-            )
+            gen = self._root_generator(project_scripts, dep_context)
             # We generate at parent if we are creating subfolder, or current if inside
             target_gen_path = current_root.parent if current_root != self.root_path else self.root_path
             gen.generate(target_gen_path)
@@ -246,6 +188,7 @@ class ConfigEngine:
         # ---------------------------------------------------------
         # Phase 2: Workspace Packages (Iterative Sync)
         # ---------------------------------------------------------
+        phase("packages")
         
         for pkg in packages:
             pkg_name = pkg.get("name")
@@ -273,23 +216,11 @@ class ConfigEngine:
             else:
                 # --- NEW PACKAGE ---
                 report.added.append(f"Package '{pkg_name}'")
+                count("viperx.packages.added")
                 
                 p_use_tests = pkg.get("use_tests", settings_conf.get("use_tests", True))
                 
-                pkg_gen = ProjectGenerator(
-                    name=pkg_name,
-                    description=pkg.get("description", ""),
-                    type=pkg.get("type", TYPE_CLASSIC),
-                    author=project_conf.get("author", "Your Name"),
-                    use_env=pkg.get("use_env", settings_conf.get("use_env", False)),
-                    use_config=pkg.get("use_config", settings_conf.get("use_config", True)),
-                    use_readme=pkg.get("use_readme", False),
-                    use_tests=p_use_tests,
-                    framework=pkg.get("framework", FRAMEWORK_PYTORCH),
-                    scripts=project_scripts, 
-                    dependency_context=dep_context,
-                    verbose=self.verbose
-                )
+                pkg_gen = self._package_generator(pkg, project_scripts, dep_context)
                 pkg_gen.add_to_workspace(current_root)
                 
                 # Update testpaths if package has tests enabled
@@ -300,6 +231,7 @@ class ConfigEngine:
         # Check for Deletions (Packages on disk not in config)
         existing_pkgs = set()
         if (current_root / "src").exists():
+             count("viperx.fs.scans")
              existing_pkgs = {p.name for p in (current_root / "src").iterdir() if p.is_dir()}
         
         # We need to map config names to folder names to check existence
@@ -315,11 +247,11 @@ class ConfigEngine:
         # ---------------------------------------------------------
         # Phase 3: Config Sync & Reporting
         # ---------------------------------------------------------
+        phase("config sync")
         # Sync viperx.yaml
         system_config_path = current_root / "viperx.yaml"
         if self.config_path.absolute() != system_config_path.absolute():
-            import shutil
-            shutil.copy2(self.config_path, system_config_path)
+            write_text(system_config_path, self.config_path.read_text())
         
         # Sync Scripts (Safe Update)
         # We recalculate all expected scripts from the current config
@@ -328,8 +260,9 @@ class ConfigEngine:
         # ---------------------------------------------------------
         # Phase 4: Smart Feature Toggle (Hydration & Cleanup Nags)
         # ---------------------------------------------------------
+        phase("feature toggles")
         # Helper to check toggles
-        def check_feature(path_check: Path, use_flag: bool, feature_name: str, pkg_label: str, pkg_clean_name: str = ""):
+        def check_feature(path_check: Path, use_flag: bool, feature_name: str, pkg_label: str, pkg_clean_name: str = "", make_generator=None):
             if feature_name == "use_env":
                 feature_path = path_check / ".env"
             elif feature_name == "use_config":
@@ -338,6 +271,8 @@ class ConfigEngine:
                 feature_path = path_check / "tests"
             elif feature_name == "use_readme":
                 feature_path = path_check / "README.md"
+            elif feature_name == "use_bench":
+                feature_path = path_check / BENCHMARKS_DIR
             else:
                 return
 
@@ -363,34 +298,32 @@ class ConfigEngine:
                           # Generate it!
                           report.added.append(f"{pkg_label}: Enabled {feature_name} (Created {feature_path.name})")
                           if feature_name == "use_env":
-                               with open(feature_path, "w") as f:
-                                   f.write("# Environment Variables (Hydrated)\n")
-                               with open(path_check / ".env.example", "w") as f:
-                                   f.write("# Example\n")
+                               write_text(feature_path, "# Environment Variables (Hydrated)\n")
+                               write_text(path_check / ".env.example", "# Example\n")
                           elif feature_name == "use_config":
                                # Minimal Config
-                               with open(feature_path, "w") as f:
-                                   f.write("import os\nfrom pathlib import Path\n\n# Configuration\n")
-                               with open(path_check / "config.yaml", "w") as f:
-                                   f.write("# Config\n")
+                               write_text(feature_path, "import os\nfrom pathlib import Path\n\n# Configuration\n")
+                               write_text(path_check / "config.yaml", "# Config\n")
                                # Inject imports into __init__.py if exists
                                init_py = path_check / "__init__.py"
                                if init_py.exists():
                                    content = init_py.read_text()
                                    if "SETTINGS" not in content:
-                                       with open(init_py, "a") as f:
-                                           f.write("\nfrom .config import SETTINGS, get_config\n")
+                                       write_text(init_py, "\nfrom .config import SETTINGS, get_config\n", append=True)
+                                       self._touch_manifest(current_root, init_py, init_py.read_text())
 
                           elif feature_name == "use_tests":
                                feature_path.mkdir(exist_ok=True)
-                               with open(feature_path / "__init__.py", "w") as f: 
-                                   pass
-                               with open(feature_path / "test_core.py", "w") as f:
-                                   f.write("def test_dummy():\n    assert True\n")
+                               write_text(feature_path / "__init__.py", "")
+                               write_text(feature_path / "test_core.py", "def test_dummy():\n    assert True\n")
                                # Update testpaths in pyproject.toml
                                if pkg_clean_name:
                                    self._update_testpaths(current_root, pkg_clean_name, report)
                           
+                          elif feature_name == "use_bench":
+                               # Generator of this package (built lazily: git lookup)
+                               make_generator().generate_benchmarks(path_check, is_subpackage=pkg_label != f"Package '{project_name}'")
+
                           elif feature_name == "use_readme":
                                # Detect actual files in package for accurate README
                                actual_use_config = (path_check / "config.py").exists() or (path_check / "config.yaml").exists()
@@ -412,8 +345,7 @@ class ConfigEngine:
                                    is_subpackage=True,
                                    packages=[]
                                )
-                               with open(feature_path, "w") as f:
-                                   f.write(readme_content)
+                               write_text(feature_path, readme_content)
             else:
                 # DISABLED: Check if exists -> Warn/Conflict
                 if feature_path.exists():
@@ -444,6 +376,10 @@ class ConfigEngine:
              check_feature(main_pkg_path, root_use_env, "use_env", f"Package '{project_name}'", clean_name)
              check_feature(main_pkg_path, root_use_config, "use_config", f"Package '{project_name}'", clean_name)
              check_feature(main_pkg_path, root_use_tests, "use_tests", f"Package '{project_name}'", clean_name)
+             check_feature(
+                 main_pkg_path, settings_conf.get("use_bench", False), "use_bench", f"Package '{project_name}'", clean_name,
+                 make_generator=lambda: self._root_generator(project_scripts, dep_context),
+             )
 
         # Now check additional packages
         for pkg in packages:
@@ -463,6 +399,19 @@ class ConfigEngine:
                   check_feature(p_path, p_config, "use_config", f"Package '{pkg_name}'", pkg_clean)
                   check_feature(p_path, p_tests, "use_tests", f"Package '{pkg_name}'", pkg_clean)
                   check_feature(p_path, p_readme, "use_readme", f"Package '{pkg_name}'", pkg_clean)
+                  check_feature(
+                      p_path, pkg.get("use_bench", settings_conf.get("use_bench", False)), "use_bench", f"Package '{pkg_name}'", pkg_clean,
+                      make_generator=lambda pkg=pkg: self._package_generator(pkg, project_scripts, dep_context),
+                  )
+
+        # Benchmarks need pytest-benchmark in the dev group, whichever package has them
+        if any(p["use_bench"] for p in packages_list):
+            from viperx.utils import add_dev_requirement
+            pyproject_path = current_root / "pyproject.toml"
+            if add_dev_requirement(pyproject_path, PYTEST_BENCHMARK_REQUIREMENT):
+                report.updated.append(f"Added '{PYTEST_BENCHMARK_REQUIREMENT}' to dev dependencies")
+                self._touch_manifest(current_root, pyproject_path, pyproject_path.read_text())
+                self._pyproject_cache = None  # Edited on disk: parse again if needed
 
         is_fresh_init = any("Scaffolding" in item for item in report.added)
         if (report.added or report.updated) and not is_fresh_init:
@@ -474,17 +423,192 @@ class ConfigEngine:
 
         self._print_report(report)
 
-    def _update_root_metadata(self, root: Path, project_conf: dict, report):
-        """Safely update pyproject.toml metadata using tomlkit to preserve comments."""
+    def _aggregate_context(self) -> tuple[dict, dict, list]:
+        """
+        Aggregate workspace-wide generation context from the config.
+        Returns (project_scripts, dependency_context, packages_list).
+        """
+        from viperx.utils import sanitize_project_name
+        
+        project_conf = self.config.get("project", {})
+        settings_conf = self.config.get("settings", {})
+        workspace_conf = self.config.get("workspace", {})
+        
+        project_name = project_conf.get("name")
+        clean_name = sanitize_project_name(project_name)
+        
+        root_use_config = settings_conf.get("use_config", True)
+        root_use_env = settings_conf.get("use_env", False)
+        root_use_tests = settings_conf.get("use_tests", True)
+        root_use_bench = settings_conf.get("use_bench", False)
+        root_type = settings_conf.get("type", TYPE_CLASSIC)
+        root_framework = settings_conf.get("framework", FRAMEWORK_PYTORCH)
+        
+        glob_has_config = root_use_config
+        glob_has_env = root_use_env
+        glob_is_ml_dl = root_type in [TYPE_ML, TYPE_DL]
+        glob_is_dl = root_type == TYPE_DL
+        glob_frameworks = {root_framework} if glob_is_dl else set()
+
+        project_scripts = {project_name: f"{clean_name}.main:main"} # Use clean mapping
+        
+        # List for README generation (Order: Root, then packages)
+        packages_list = [{
+            "raw_name": project_name,
+            "clean_name": clean_name,
+            "use_config": root_use_config,
+            "use_tests": root_use_tests,
+            "use_bench": root_use_bench,
+            "use_env": root_use_env
+        }]
+        
+        packages = workspace_conf.get("packages", [])
+        for pkg in packages:
+            # Scripts
+            pkg_name = pkg.get("name")
+            pkg_name_clean = sanitize_project_name(pkg_name)
+            project_scripts[pkg_name] = f"{pkg_name_clean}.main:main"
+            
+            # Dependency Aggregation
+            p_config = pkg.get("use_config", settings_conf.get("use_config", True))
+            p_env = pkg.get("use_env", settings_conf.get("use_env", False))
+            p_tests = pkg.get("use_tests", settings_conf.get("use_tests", True))
+            p_bench = pkg.get("use_bench", settings_conf.get("use_bench", False))
+            p_type = pkg.get("type", TYPE_CLASSIC)
+            p_framework = pkg.get("framework", FRAMEWORK_PYTORCH)
+
+            if p_config:
+                glob_has_config = True
+            if p_env:
+                glob_has_env = True
+            if p_type in [TYPE_ML, TYPE_DL]:
+                glob_is_ml_dl = True
+            if p_type == TYPE_DL:
+                glob_is_dl = True
+                glob_frameworks.add(p_framework)
+                 
+            packages_list.append({
+                "raw_name": pkg_name,
+                "clean_name": pkg_name_clean,
+                "use_config": p_config,
+                "use_tests": p_tests,
+                "use_bench": p_bench,
+                "use_env": p_env
+            })
+
+        dep_context = {
+            "has_config": glob_has_config,
+            "has_env": glob_has_env,
+            "is_ml_dl": glob_is_ml_dl,
+            "is_dl": glob_is_dl,
+            # Sorted: deterministic context (render manifest digests)
+            "frameworks": sorted(glob_frameworks),
+            "packages": packages_list
+        }
+        return project_scripts, dep_context, packages_list
+
+    def _root_generator(self, project_scripts: dict, dep_context: dict) -> ProjectGenerator:
+        """ProjectGenerator for the root project, as declared in the config."""
+        project_conf = self.config.get("project", {})
+        settings_conf = self.config.get("settings", {})
+        return ProjectGenerator(
+            name=project_conf.get("name"), # Raw name
+            description=project_conf.get("description", ""),
+            type=settings_conf.get("type", TYPE_CLASSIC),
+            author=project_conf.get("author", None),
+            license=project_conf.get("license", DEFAULT_LICENSE),
+            builder=project_conf.get("builder", DEFAULT_BUILDER),
+            use_env=settings_conf.get("use_env", False),
+            use_config=settings_conf.get("use_config", True),
+            use_tests=settings_conf.get("use_tests", True),
+            use_bench=settings_conf.get("use_bench", False),
+            framework=settings_conf.get("framework", FRAMEWORK_PYTORCH),
+            scripts=project_scripts,
+            dependency_context=dep_context,
+            verbose=self.verbose,
+            uv=self.uv
+        )
+
+    def _package_generator(self, pkg: dict, project_scripts: dict, dep_context: dict) -> ProjectGenerator:
+        """ProjectGenerator for a workspace package, as declared in the config."""
+        project_conf = self.config.get("project", {})
+        settings_conf = self.config.get("settings", {})
+        return ProjectGenerator(
+            name=pkg.get("name"),
+            description=pkg.get("description", ""),
+            type=pkg.get("type", TYPE_CLASSIC),
+            author=project_conf.get("author", "Your Name"),
+            use_env=pkg.get("use_env", settings_conf.get("use_env", False)),
+            use_config=pkg.get("use_config", settings_conf.get("use_config", True)),
+            use_readme=pkg.get("use_readme", False),
+            use_tests=pkg.get("use_tests", settings_conf.get("use_tests", True)),
+            use_bench=pkg.get("use_bench", settings_conf.get("use_bench", False)),
+            framework=pkg.get("framework", FRAMEWORK_PYTORCH),
+            scripts=project_scripts, 
+            dependency_context=dep_context,
+            verbose=self.verbose,
+            uv=self.uv
+        )
+
+    @traced("ConfigEngine.regenerate")
+    def regenerate(self, dry_run: bool = False):
+        """
+        Re-render generated files whose template or context changed since
+        generation, leaving user-edited files untouched (see viperx.manifest).
+        """
+        from viperx.manifest import regenerate
+        from viperx.report import UpdateReport
+        
+        report = UpdateReport()
+        project_scripts, dep_context, _ = self._aggregate_context()
+        
+        generators = {self.config["project"]["name"]: self._root_generator(project_scripts, dep_context)}
+        for pkg in self.config.get("workspace", {}).get("packages", []) or []:
+            generators[pkg.get("name")] = self._package_generator(pkg, project_scripts, dep_context)
+        
+        regenerate(self.config_path.resolve().parent, generators, report, dry_run=dry_run)
+        self._print_report(report)
+        return report
+
+    def _load_pyproject(self, root: Path):
+        """
+        tomlkit document of root/pyproject.toml, parsed once per apply.
+        Every pyproject update of a run edits this same document (comments
+        preserved) and writes it back with `_save_pyproject`.
+        """
         import tomlkit
         pyproject_path = root / "pyproject.toml"
+        cached = self._pyproject_cache
+        if cached is not None and cached[0] == pyproject_path:
+            return cached[1]
         if not pyproject_path.exists():
-            return
-            
+            return None
+        
         with open(pyproject_path, "r") as f:
             content = f.read()
-        
-        doc = tomlkit.parse(content)
+        with span("toml.parse", "parse", path=pyproject_path):
+            doc = tomlkit.parse(content)
+        self._pyproject_cache = (pyproject_path, doc)
+        return doc
+
+    def _save_pyproject(self, root: Path, doc):
+        content = doc.as_string()
+        write_text(root / "pyproject.toml", content)
+        self._touch_manifest(root, root / "pyproject.toml", content)
+
+    def _touch_manifest(self, root: Path, path: Path, content: str):
+        """Record an edit of a rendered file in the render manifest (see RenderManifest.touch)."""
+        from viperx.manifest import RenderManifest
+        manifest = RenderManifest.load(root)
+        if manifest.touch(path, content):
+            manifest.save()
+
+    def _update_root_metadata(self, root: Path, project_conf: dict, report):
+        """Safely update pyproject.toml metadata using tomlkit to preserve comments."""
+        import tomlkit
+        doc = self._load_pyproject(root)
+        if doc is None:
+            return
         project = doc.get("project", {})
         changed = False
 
@@ -523,8 +647,7 @@ class ConfigEngine:
         if changed:
             # Write back
             # tomlkit preserves structure automatically
-            with open(pyproject_path, "w") as f:
-                f.write(doc.as_string())
+            self._save_pyproject(root, doc)
 
     def _detect_project_type(self, root: Path) -> str | None:
         """Detect existing project type from structure and dependencies."""
@@ -579,7 +702,7 @@ class ConfigEngine:
         if is_known_license and new_license in LICENSE_TEMPLATES:
             # Safe to update
             new_content = LICENSE_TEMPLATES[new_license]
-            license_path.write_text(new_content)
+            write_text(license_path, new_content)
             report.updated.append(f"LICENSE file updated to {new_license}")
         else:
             # Not safe, just warn
@@ -588,14 +711,10 @@ class ConfigEngine:
     def _update_testpaths(self, root: Path, pkg_clean_name: str, report):
         """Add package tests path to testpaths in pyproject.toml using tomlkit."""
         import tomlkit
-        pyproject_path = root / "pyproject.toml"
-        if not pyproject_path.exists():
+        doc = self._load_pyproject(root)
+        if doc is None:
             return
         
-        with open(pyproject_path, "r") as f:
-            content = f.read()
-            
-        doc = tomlkit.parse(content)
         tool = doc.setdefault("tool", tomlkit.table())
         pytest = tool.setdefault("pytest", tomlkit.table())
         ini_options = pytest.setdefault("ini_options", tomlkit.table())
@@ -613,21 +732,14 @@ class ConfigEngine:
         if new_path not in testpaths:
             testpaths.append(new_path)
             report.updated.append(f"Added {pkg_clean_name}/tests to testpaths")
-            
-            with open(pyproject_path, "w") as f:
-                f.write(doc.as_string())
+            self._save_pyproject(root, doc)
 
     def _update_root_scripts(self, root: Path, scripts: dict, report):
         """Safely update [project.scripts] in pyproject.toml using tomlkit."""
         import tomlkit
-        pyproject_path = root / "pyproject.toml"
-        if not pyproject_path.exists():
+        doc = self._load_pyproject(root)
+        if doc is None:
             return
-
-        with open(pyproject_path, "r") as f:
-            content = f.read()
-        
-        doc = tomlkit.parse(content)
         project = doc.get("project", {})
         
         # Ensure correct type for scripts table
@@ -649,9 +761,9 @@ class ConfigEngine:
                 pass
         
         if changed:
-            with open(pyproject_path, "w") as f:
-                f.write(doc.as_string())
+            self._save_pyproject(root, doc)
                 
+    @traced("rich.render_report", "render")
     def _print_report(self, report):
         from rich.tree import Tree
         
@@ -769,6 +881,6 @@ class ConfigEngine:
                             break
         
         if annotated:
-            config_path.write_text('\n'.join(lines))
+            write_text(config_path, '\n'.join(lines))
             report.manual_checks.append("viperx.yaml annotated with NOT_APPLIED comments. Review and resolve.")
 
@@ -4,18 +4,35 @@ Config Scanner: Rebuilds viperx.yaml from existing project structure.
 
 import re
 from pathlib import Path
+from typing import Optional
 from rich.console import Console
 
+from viperx.constants import BENCHMARKS_DIR
+from viperx.instrumentation import count, span, traced
+from viperx.utils import write_text
+
 console = Console()
 
 
 class ConfigScanner:
     """Scans existing project and generates/updates viperx.yaml."""
     
-    def __init__(self, project_root: Path, verbose: bool = False):
+    def __init__(self, project_root: Path, verbose: bool = False, explain: Optional[bool] = None):
         self.project_root = project_root
         self.verbose = verbose
+        # None = follow persistent settings (viperx explain --activate)
+        self.explain = explain
+        self._pyproject_text: Optional[str] = None
+    
+    def _read_pyproject(self) -> Optional[str]:
+        """Read pyproject.toml once per scanner (shared by metadata & type detection)."""
+        if self._pyproject_text is None:
+            pyproject_path = self.project_root / "pyproject.toml"
+            if pyproject_path.exists():
+                self._pyproject_text = pyproject_path.read_text()
+        return self._pyproject_text
     
+    @traced("ConfigScanner.scan")
     def scan(self) -> dict:
         """Scan project and generate viperx.yaml config dict."""
         config = {
@@ -25,9 +42,8 @@ class ConfigScanner:
         }
         
         # 1. Read pyproject.toml for project metadata
-        pyproject_path = self.project_root / "pyproject.toml"
-        if pyproject_path.exists():
-            config["project"] = self._parse_pyproject(pyproject_path)
+        if self._read_pyproject() is not None:
+            config["project"] = self._parse_pyproject()
         
         # 2. Detect project type from structure
         config["settings"]["type"] = self._detect_type()
@@ -41,12 +57,17 @@ class ConfigScanner:
         
         return config
     
-    def _parse_pyproject(self, pyproject_path: Path) -> dict:
-        """Parse project metadata from pyproject.toml using tomlkit."""
-        import tomlkit
+    def _parse_pyproject(self) -> dict:
+        """
+        Parse project metadata from pyproject.toml.
+        Read-only, so we use the stdlib `tomllib` (much faster than tomlkit,
+        which is only needed when comments must survive a rewrite).
+        """
+        import tomllib
         
-        content = pyproject_path.read_text()
-        data = tomlkit.parse(content)
+        pyproject_path = self.project_root / "pyproject.toml"
+        with span("toml.parse", "parse", path=pyproject_path):
+            data = tomllib.loads(self._read_pyproject())
         project_data = data.get("project", {})
         
         project = {}
@@ -85,9 +106,9 @@ class ConfigScanner:
         """Detect project type from structure and dependencies."""
         from viperx.constants import TYPE_CLASSIC, TYPE_ML, TYPE_DL
         
-        pyproject_path = self.project_root / "pyproject.toml"
-        if pyproject_path.exists():
-            content = pyproject_path.read_text().lower()
+        content = self._read_pyproject()
+        if content is not None:
+            content = content.lower()
             
             if "torch" in content or "tensorflow" in content:
                 return TYPE_DL
@@ -106,6 +127,7 @@ class ConfigScanner:
         packages = []
         root_clean = sanitize_project_name(root_name) if root_name else ""
         
+        count("viperx.fs.scans")
         for pkg_dir in src_dir.iterdir():
             if not pkg_dir.is_dir():
                 continue
@@ -123,6 +145,9 @@ class ConfigScanner:
                 "use_tests": (pkg_dir / "tests").exists(),
                 "use_readme": (pkg_dir / "README.md").exists()
             }
+            # Opt-in feature: only reported when present
+            if (pkg_dir / BENCHMARKS_DIR).exists():
+                pkg_config["use_bench"] = True
             
             # Get description from __init__.py docstring if exists
             init_py = pkg_dir / "__init__.py"
@@ -134,15 +159,20 @@ class ConfigScanner:
             
             packages.append(pkg_config)
         
+        count("viperx.scanner.packages", len(packages))
         return packages
     
+    @traced("ConfigScanner.update_config")
     def update_config(self, existing_config: dict) -> tuple[dict, list[str]]:
         """Update existing config with detected changes. Returns (new_config, annotations)."""
         scanned = self.scan()
         annotations = []
         
-        from viperx.settings import settings
-        if settings.explain_mode:
+        explain = self.explain
+        if explain is None:
+            from viperx.settings import settings
+            explain = settings.explain_mode
+        if explain:
             from rich.panel import Panel
             console.print(Panel(
                 f"[bold]Scanning Project Structure[/bold]\n"
@@ -191,9 +221,9 @@ class ConfigScanner:
                 annotations.append(f"workspace.packages: ADDED - '{pkg_name}' detected in src/")
             else:
                 # Check for mismatches
-                for key in ["use_env", "use_config", "use_tests", "use_readme"]:
+                for key in ["use_env", "use_config", "use_tests", "use_bench", "use_readme"]:
                     config_val = existing_pkgs[pkg_name].get(key)
-                    actual_val = pkg_config.get(key)
+                    actual_val = pkg_config.get(key, False if key == "use_bench" else None)
                     if config_val is not None and config_val != actual_val:
                         annotations.append(f"packages.{pkg_name}.{key}: MISMATCH - config says {config_val}, actual is {actual_val}")
         
@@ -282,7 +312,7 @@ class ConfigScanner:
         else:
             final_content = header + content
 
-        output_path.write_text(final_content)
+        write_text(output_path, final_content)
         return len(annotations)
 
     def _write_raw_yaml(self, config: dict, annotations: list[str], output_path: Path):
@@ -293,5 +323,5 @@ class ConfigScanner:
         if annotations:
             for ann in annotations:
                 header += f"# {ann}\n"
-        output_path.write_text(header + yaml_content)
+        write_text(output_path, header + yaml_content)
         return len(annotations)
@@ -8,22 +8,48 @@ DEFAULT_BUILDER = "uv"
 
 # File Names
 CONFIG_FILENAME = "config.yaml"
+VIPERX_CONFIG_FILENAME = "viperx.yaml"
 PYPROJECT_FILENAME = "pyproject.toml"
 PACKAGE_NAME = "viperx"
 README_FILENAME = "README.md"
 INIT_FILENAME = "__init__.py"
 MAIN_FILENAME = "main.py"
+SETTINGS_MODEL_FILENAME = "settings_model.py"
 
 # Directory Names
 SRC_DIR = "src"
 NOTEBOOKS_DIR = "notebooks"
 TESTS_DIR = "tests"
+BENCHMARKS_DIR = "benchmarks"
+
+# Benchmark scaffold (use_bench): template -> file in <pkg>/benchmarks/
+BENCH_TEMPLATES = {
+    "bench_pytest.ini.j2": "pytest.ini",
+    "bench_conftest.py.j2": "conftest.py",
+    "bench_core.py.j2": "bench_core.py",
+}
+PYTEST_BENCHMARK_REQUIREMENT = "pytest-benchmark>=5.1.0"
+
+# Fleet Discovery (directories never scanned for viperx.yaml)
+FLEET_PRUNED_DIRS = frozenset({
+    ".git", ".hg", ".svn",
+    ".venv", "venv",
+    "node_modules",
+    "__pycache__",
+    ".tox", ".nox",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache",
+})
 
 # Templates
 TEMPLATE_DIR_NAME = "templates"
 TEMPLATES_DIR = Path(__file__).parent / TEMPLATE_DIR_NAME
 USER_CONFIG_DIR = Path.home() / ".config" / "viperx"
 USER_TEMPLATES_DIR = USER_CONFIG_DIR / "templates"
+USER_CACHE_DIR = Path.home() / ".cache" / "viperx"
+TEMPLATE_PACKS_DIR = USER_CACHE_DIR / "template-packs"
+
+# Instrumentation plugins (entry point group returning viperx.instrumentation.Instrument)
+INSTRUMENTATION_ENTRY_POINT_GROUP = "viperx.instrumentation"
 
 # Types
 TYPE_CLASSIC = "classic"
@@ -41,5 +67,9 @@ BUILDER_UV = "uv"
 BUILDER_HATCH = "hatch"
 SUPPORTED_BUILDERS = [BUILDER_UV, BUILDER_HATCH]
 
+# uv executable override: a path, or "fake" for the offline stand-in (viperx.fake_uv)
+UV_ENV_VAR = "VIPERX_UV"
+FAKE_UV = "fake"
+
 # Licenses
 SUPPORTED_LICENSES = ["MIT", "Apache-2.0", "GPLv3"]
@@ -30,9 +30,13 @@ from viperx.constants import (
     SRC_DIR,
     NOTEBOOKS_DIR,
     TESTS_DIR,
+    BENCHMARKS_DIR,
+    BENCH_TEMPLATES,
+    PYTEST_BENCHMARK_REQUIREMENT,
 )
-from .utils import sanitize_project_name, get_author_from_git
+from .utils import sanitize_project_name, get_author_from_git, resolve_uv, run_uv, write_text
 from .licenses import LICENSES
+from .instrumentation import count, span, traced
 
 console = Console()
 
@@ -41,13 +45,15 @@ class ProjectGenerator:
                   author: str, 
                   use_env: bool = False, use_config: bool = True, 
                  use_readme: bool = True, use_tests: bool = True,
+                 use_bench: bool = False,
                  license: str = DEFAULT_LICENSE, 
                  builder: str = DEFAULT_BUILDER, 
                  framework: str = "pytorch",
                  scripts: Optional[dict] = None,
                  dependency_context: Optional[dict] = None,
                  verbose: bool = False,
-                 explain: bool = False):
+                 explain: bool = False,
+                 uv: Optional[str] = None):
         self.raw_name = name
         self.project_name = sanitize_project_name(name)
         self.description = description or name
@@ -73,18 +79,24 @@ class ProjectGenerator:
              
         self.author = author
         if not self.author or self.author == "Your Name":
-             self.author, self.author_email = get_author_from_git()
+             with span("git: author lookup"):
+                 self.author, self.author_email = get_author_from_git()
         else:
              self.author_email = "your.email@example.com"
         
         self.license = license
         self.builder = builder
+        # uv executable (None = VIPERX_UV env var, then `uv` on PATH; "fake" = viperx.fake_uv)
+        self.uv = resolve_uv(uv)
         self.use_env = use_env
         self.use_config = use_config
         self.use_readme = use_readme
         self.use_tests = use_tests
+        self.use_bench = use_bench
         self.verbose = verbose
         self.explain_mode = explain
+        # Render manifest of the current generation run (see viperx.manifest)
+        self.manifest = None
         
         # Detect System Python (For logging/diagnostics)
         self.system_python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
@@ -97,7 +109,7 @@ class ProjectGenerator:
         
         # Validate Choices
         from viperx.utils import validate_choice, check_builder_installed
-        from viperx.constants import PROJECT_TYPES, DL_FRAMEWORKS, TYPE_DL
+        from viperx.constants import PROJECT_TYPES, DL_FRAMEWORKS, TYPE_DL, BUILDER_UV
         
         try:
             validate_choice(self.type, PROJECT_TYPES, "project type")
@@ -105,7 +117,9 @@ class ProjectGenerator:
                 validate_choice(self.framework, DL_FRAMEWORKS, "framework")
             
             # Validate Builder Existence & Support
-            if not check_builder_installed(self.builder):
+            # A selected uv executable replaces the PATH lookup
+            uv_selected = self.builder == BUILDER_UV and self.uv != BUILDER_UV
+            if not uv_selected and not check_builder_installed(self.builder):
                  from viperx.constants import SUPPORTED_BUILDERS
                  if self.builder not in SUPPORTED_BUILDERS:
                       console.print(f"[bold red]Error:[/bold red] Invalid builder '[bold]{self.builder}[/bold]'.")
@@ -158,6 +172,7 @@ class ProjectGenerator:
                 padding=(0, 2)
             ))
 
+    @traced("ProjectGenerator.generate")
     def generate(self, target_dir: Path, is_subpackage: bool = False):
         """Main generation flow using uv init."""
         
@@ -179,10 +194,11 @@ We are about to create **{self.project_name}**.
                     return
                 # Hydrate existing directory
                 console.print(f"  [yellow]Hydrating existing directory {project_dir}...[/yellow]")
-                subprocess.run(
-                    ["uv", "init", "--package", "--no-workspace"], 
-                    check=True, cwd=project_dir, capture_output=True
-                )
+                with span("subprocess: uv init", "subprocess", cwd=project_dir):
+                    run_uv(
+                        ["init", "--package", "--no-workspace"],
+                        cwd=project_dir, uv=self.uv, capture_output=True
+                    )
             else:
                 # Create new
                 # STRICT DIR NAMING: Use self.project_name (underscores) for directory
@@ -190,10 +206,11 @@ We are about to create **{self.project_name}**.
                 # uv init [NAME] creates directory NAME.
                 # If we want dir=test_classic but name=test-classic:
                 # uv init test_classic --name test-classic
-                subprocess.run(
-                    ["uv", "init", "--package", "--no-workspace", self.project_name, "--name", self.raw_name], 
-                    check=True, cwd=target_dir, capture_output=True
-                )
+                with span("subprocess: uv init", "subprocess", cwd=target_dir):
+                    run_uv(
+                        ["init", "--package", "--no-workspace", self.project_name, "--name", self.raw_name],
+                        cwd=target_dir, uv=self.uv, capture_output=True
+                    )
             console.print("  [blue]✓ Scaffolding created with uv init[/blue]")
         except subprocess.CalledProcessError as e:
              console.print(f"[bold red]Error running uv init:[/bold red] {e}")
@@ -209,12 +226,15 @@ We are about to create **{self.project_name}**.
             
             if src_pkg_path.exists():
                 # Move children of src/pkg to root
+                count("viperx.fs.scans")
                 for item in src_pkg_path.iterdir():
                     shutil.move(str(item), str(project_dir))
                 
                 # Cleanup src/pkg and src
+                count("viperx.fs.unlinks")
                 shutil.rmtree(src_pkg_path)
                 if (project_dir / "src").exists() and not any((project_dir / "src").iterdir()):
+                     count("viperx.fs.unlinks")
                      shutil.rmtree(project_dir / "src")
                 self.log("Converted to Ultra-Flat Layout (Code at Root)")
 
@@ -222,13 +242,19 @@ We are about to create **{self.project_name}**.
         self._create_extra_dirs(project_dir, is_subpackage)
         
         # 4. Overwrite/Add Files
+        # Subpackages live in <workspace>/src/<pkg>: the manifest belongs to the workspace root
+        from viperx.manifest import RenderManifest
+        self.manifest = RenderManifest.load(target_dir.parent if is_subpackage else project_dir)
         self._generate_files(project_dir, is_subpackage)
+        self.manifest.save()
+        self.manifest = None
         
         
         # Cleanup extra files for subpackages
         if is_subpackage:
             for f in [".gitignore", ".python-version"]:
                 if (project_dir / f).exists():
+                    count("viperx.fs.unlinks")
                     (project_dir / f).unlink()
         
         # 5. Git & Final Steps
@@ -260,14 +286,12 @@ We are about to create **{self.project_name}**.
             tests_dir = pkg_root / TESTS_DIR
             tests_dir.mkdir(parents=True, exist_ok=True)
             
-            with open(tests_dir / "__init__.py", "w") as f:
-                pass
-            with open(tests_dir / "test_core.py", "w") as f:
-                f.write("def test_dummy():\n    assert True\n")
+            write_text(tests_dir / "__init__.py", "")
+            write_text(tests_dir / "test_core.py", "def test_dummy():\n    assert True\n")
             self.log(f"Created tests directory at {tests_dir.relative_to(root)}")
 
-    def _generate_files(self, root: Path, is_subpackage: bool = False):
-        self.log(f"Generating files for {self.project_name}...")
+    def build_context(self, is_subpackage: bool = False) -> dict:
+        """Template render context for this project/package."""
         context = {
             "project_name": self.raw_name,
             "package_name": self.project_name,
@@ -282,6 +306,8 @@ We are about to create **{self.project_name}**.
             "use_uv": self.builder == "uv",
             "use_config": self.use_config,
             "use_tests": self.use_tests,
+            "use_bench": self.use_bench,
+            "pytest_benchmark_requirement": PYTEST_BENCHMARK_REQUIREMENT,
             "use_readme": self.use_readme,
             "use_env": self.use_env,
             "framework": self.framework,
@@ -290,6 +316,11 @@ We are about to create **{self.project_name}**.
         }
         # Merge dependency context overrides
         context.update(self.dependency_context)
+        return context
+
+    def _generate_files(self, root: Path, is_subpackage: bool = False):
+        self.log(f"Generating files for {self.project_name}...")
+        context = self.build_context(is_subpackage)
         
         # pyproject.toml (Overwrite uv's basic one to add our specific deps)
         # Even subpackages need this if they are Workspace Members (which they are in our model)
@@ -299,6 +330,7 @@ We are about to create **{self.project_name}**.
             # User Requested: No pyproject.toml in subpackages.
             # If uv generated one (which it does), remove it.
             # Use Case: Pure "Mono-repo" module structure.
+            count("viperx.fs.unlinks")
             (root / "pyproject.toml").unlink()
         
         # Determine Package Root
@@ -326,6 +358,7 @@ We are about to create **{self.project_name}**.
                  self._render("README.md.j2", root / "README.md", context)
             else:
                  if (root / "README.md").exists():
+                     count("viperx.fs.unlinks")
                      (root / "README.md").unlink()
                      self.log("Removed default README.md (requested --no-readme)")
         else:
@@ -334,6 +367,7 @@ We are about to create **{self.project_name}**.
                   self._render("README.md.j2", root / "README.md", context)
              elif (root / "README.md").exists():
                  # Cleanup default README from uv init if we didn't request one
+                 count("viperx.fs.unlinks")
                  (root / "README.md").unlink()
 
         
@@ -341,20 +375,28 @@ We are about to create **{self.project_name}**.
         if not is_subpackage:
             license_text = LICENSES.get(self.license, LICENSES["MIT"])
             license_text = license_text.format(year=datetime.now().year, author=self.author)
-            with open(root / "LICENSE", "w") as f:
-                f.write(license_text)
+            write_text(root / "LICENSE", license_text)
             self.log(f"Generated LICENSE ({self.license})")
         elif (root / "LICENSE").exists():
+            count("viperx.fs.unlinks")
             (root / "LICENSE").unlink()
 
         # Config files
         if self.use_config:
             self._render("config.yaml.j2", pkg_root / "config.yaml", context)
             self._render("config.py.j2", pkg_root / "config.py", context)
+            # Typed settings classes derived from the config.yaml just written
+            from viperx.settings_model import write_settings_model
+            write_settings_model(pkg_root, self.project_name)
+            self.log("Generated settings_model.py")
             
         # Entry points & Logic
         self._render("main.py.j2", pkg_root / "main.py", context)
 
+        # Benchmarks (pytest-benchmark, run apart from the tests)
+        if self.use_bench:
+            self.generate_benchmarks(pkg_root, context)
+
         if not is_subpackage and self.type in [TYPE_ML, TYPE_DL]:
              # Render Notebooks
              self._render("Base_Kaggle.ipynb.j2", root / NOTEBOOKS_DIR / "Base_Kaggle.ipynb", context)
@@ -362,29 +404,63 @@ We are about to create **{self.project_name}**.
              # Render Data Loader
              self._render("data_loader.py.j2", pkg_root / "data_loader.py", context)
              self.log("Generated wrappers: Base_Kaggle.ipynb, Base_General.ipynb, data_loader.py")
+             if self.type == TYPE_DL:
+                 # Input pipeline (DataLoader / tf.data) and training loop for the selected framework
+                 self._render("pipeline.py.j2", pkg_root / "pipeline.py", context)
+                 self._render("train.py.j2", pkg_root / "train.py", context)
+             else:
+                 # scikit-learn preprocessing and cached, parallel training pipeline
+                 self._render("features.py.j2", pkg_root / "features.py", context)
+                 self._render("ml_train.py.j2", pkg_root / "train.py", context)
              
         # .env (Strict Isolation: In pkg_root)
         if self.use_env:
-            with open(pkg_root / ".env", "w") as f:
-                f.write("# Environment Variables (Isolated)\n")
-            with open(pkg_root / ".env.example", "w") as f:
-                f.write("# Environment Variables Example\n")
+            write_text(pkg_root / ".env", "# Environment Variables (Isolated)\n")
+            write_text(pkg_root / ".env.example", "# Environment Variables Example\n")
             self.log(f"Created .env and .env.example in {pkg_root.relative_to(root)}")
                 
         # .gitignore
         # Only for Root
         if not is_subpackage: 
-            with open(root / ".gitignore", "a") as f:
-                # Add data/ to gitignore but allow .gitkeep
-                f.write("\n# ViperX specific\n.ipynb_checkpoints/\n# Isolated Env\nsrc/**/.env\n# Data (Local)\ndata/*\n!data/.gitkeep\n")
+            # Add data/ to gitignore but allow .gitkeep
+            write_text(
+                root / ".gitignore",
+                "\n# ViperX specific\n.ipynb_checkpoints/\n# Isolated Env\nsrc/**/.env\n# Data (Local)\ndata/*\n!data/.gitkeep\n",
+                append=True,
+            )
             self.log("Updated .gitignore")
 
+    def template_source(self, template_name: str) -> str:
+        """Source of a template as resolved by the loader (user override first)."""
+        source, _, _ = self.env.loader.get_source(self.env, template_name)
+        return source
+
+    def render_string(self, template_name: str, context: dict) -> str:
+        return self.env.get_template(template_name).render(**context)
+
+    def generate_benchmarks(self, pkg_root: Path, context: Optional[dict] = None, is_subpackage: bool = False):
+        """Scaffold <pkg_root>/benchmarks: run config, memory budget fixture, sample benchmark."""
+        context = context or self.build_context(is_subpackage)
+        bench_dir = pkg_root / BENCHMARKS_DIR
+        bench_dir.mkdir(exist_ok=True)
+        write_text(bench_dir / "__init__.py", "")
+        for template_name, filename in BENCH_TEMPLATES.items():
+            self._render(template_name, bench_dir / filename, context)
+        self.log(f"Created benchmarks directory at {bench_dir}")
+
     def _render(self, template_name: str, target_path: Path, context: dict):
-        template = self.env.get_template(template_name)
-        content = template.render(**context)
-        with open(target_path, "w") as f:
-            f.write(content)
-        self.log(f"Rendered {target_path.name}")
+        with span(f"render: {template_name}", "render", target=target_path.name):
+            content = self.render_string(template_name, context)
+            write_text(target_path, content)
+            self.log(f"Rendered {target_path.name}")
+            count("viperx.templates.rendered", template=template_name)
+            
+            # Track the output for selective regeneration (viperx regenerate)
+            if self.manifest is not None:
+                self.manifest.record(
+                    target_path, template_name, self.template_source(template_name),
+                    context, content, self.raw_name, context.get("is_subpackage", False)
+                )
 
     def add_to_workspace(self, workspace_root: Path):
         """Add a new package to an existing workspace."""
@@ -418,6 +494,7 @@ We are about to create **{self.project_name}**.
         # 1. Remove directory
         if target_dir.exists():
             import shutil
+            count("viperx.fs.unlinks")
             shutil.rmtree(target_dir)
             self.log(f"Removed directory {target_dir}")
         else:
@@ -458,8 +535,7 @@ We are about to create **{self.project_name}**.
             new_content = re.sub(r',\s*,', ',', new_content) # Double comma
             new_content = re.sub(r',\s*\]', ']', new_content) # Trailing comma
             
-            with open(pyproject_path, "w") as f:
-                f.write(new_content)
+            write_text(pyproject_path, new_content)
             self.log("Removed member from pyproject.toml")
         
         console.print(f"[bold green]✓ Removed {self.raw_name} successfully.[/bold green]")
@@ -483,9 +559,10 @@ We are about to create **{self.project_name}**.
         
         import subprocess
         try:
-            cmd = ["uv", "lock", "--upgrade"]
-            self.log(f"Running {' '.join(cmd)}")
-            subprocess.run(cmd, cwd=target_dir, check=True)
+            cmd = ["lock", "--upgrade"]
+            self.log(f"Running {self.uv} {' '.join(cmd)}")
+            with span("subprocess: uv lock", "subprocess", cwd=target_dir):
+                run_uv(cmd, cwd=target_dir, uv=self.uv)
             console.print(f"[bold green]✓ Updated {self.raw_name} dependencies.[/bold green]")
         except subprocess.CalledProcessError:
             console.print(f"[red]Failed to update {self.raw_name}.[/red]")
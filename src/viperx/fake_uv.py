@@ -0,0 +1,166 @@
+"""
+ViperX Fake uv - Offline stand-in for the `uv` binary
+
+Reproduces, instantly and without network, the file layout of the uv
+commands ViperX drives:
+- `uv init --package [--no-workspace] [PATH] [--name NAME]`
+- `uv lock [--upgrade]`
+- `uv sync`
+
+Every invocation (argv, cwd, time) is appended as a JSON line to the file
+named by `VIPERX_FAKE_UV_LOG`, so tests and benchmarks can assert on or
+replay exactly what ViperX asked uv to do.
+
+Select it with `VIPERX_UV=fake` (or `uv="fake"` on ProjectGenerator /
+ConfigEngine): ViperX then calls `main()` in-process (see utils.run_uv), so
+a "uv call" costs only the files it writes. It also runs standalone as
+`python -m viperx.fake_uv` or `viperx-fake-uv`.
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from viperx.constants import DEFAULT_PYTHON_VERSION, DEFAULT_VERSION, PYPROJECT_FILENAME
+
+FAKE_UV_VERSION = "uv 0.0.0 (viperx fake)"
+FAKE_UV_LOG_ENV_VAR = "VIPERX_FAKE_UV_LOG"
+BUILD_REQUIRES = "uv_build>=0.9.21,<0.10.0"
+
+GITIGNORE = """# Python-generated files
+__pycache__/
+*.py[oc]
+build/
+dist/
+wheels/
+*.egg-info
+
+# Virtual environments
+.venv
+"""
+
+
+def _error(message: str) -> int:
+    print(f"error: {message}", file=sys.stderr)
+    return 2
+
+
+def _record(argv: list[str], cwd: Path):
+    log = os.environ.get(FAKE_UV_LOG_ENV_VAR)
+    if not log:
+        return
+    entry = {"argv": argv, "cwd": str(cwd), "time": time.time()}
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def _find_project(start: Path) -> Path | None:
+    """Nearest directory (start or a parent) holding a pyproject.toml."""
+    for directory in (start, *start.parents):
+        if (directory / PYPROJECT_FILENAME).exists():
+            return directory
+    return None
+
+
+def _project_name(project: Path) -> str:
+    import tomllib
+    with open(project / PYPROJECT_FILENAME, "rb") as f:
+        return tomllib.load(f).get("project", {}).get("name", project.name)
+
+
+def init(args: list[str], cwd: Path) -> int:
+    """`uv init --package`: pyproject.toml, src/<module>/__init__.py, README, .python-version."""
+    name = None
+    path = None
+    rest = iter(args)
+    for arg in rest:
+        if arg == "--name":
+            name = next(rest, None)
+        elif arg.startswith("--name="):
+            name = arg.split("=", 1)[1]
+        elif not arg.startswith("-"):
+            path = arg
+
+    target = cwd / path if path else cwd
+    if (target / PYPROJECT_FILENAME).exists():
+        return _error(f"Project is already initialized in `{target}`")
+    name = name or target.name
+    module = name.replace("-", "_").lower()
+
+    (target / "src" / module).mkdir(parents=True, exist_ok=True)
+    (target / "src" / module / "__init__.py").write_text(
+        f'def main() -> None:\n    print("Hello from {name}!")\n'
+    )
+    (target / "README.md").write_text("")
+    (target / ".python-version").write_text(f"{DEFAULT_PYTHON_VERSION}\n")
+    (target / ".gitignore").write_text(GITIGNORE)
+    (target / PYPROJECT_FILENAME).write_text(f"""[project]
+name = "{name}"
+version = "{DEFAULT_VERSION}"
+description = "Add your description here"
+readme = "README.md"
+requires-python = ">={DEFAULT_PYTHON_VERSION}"
+dependencies = []
+
+[project.scripts]
+{name} = "{module}:main"
+
+[build-system]
+requires = ["{BUILD_REQUIRES}"]
+build-backend = "uv_build"
+""")
+    print(f"Initialized project `{name}`" + (f" at `{target}`" if path else ""))
+    return 0
+
+
+def lock(args: list[str], cwd: Path) -> int:
+    """`uv lock`: a uv.lock listing the project itself (no resolution)."""
+    project = _find_project(cwd)
+    if project is None:
+        return _error(f"No `{PYPROJECT_FILENAME}` found in current directory or any parent directory")
+    name = _project_name(project)
+    (project / "uv.lock").write_text(f"""version = 1
+requires-python = ">={DEFAULT_PYTHON_VERSION}"
+
+[[package]]
+name = "{name}"
+version = "{DEFAULT_VERSION}"
+source = {{ editable = "." }}
+""")
+    print("Resolved 1 package in 0ms")
+    return 0
+
+
+def sync(args: list[str], cwd: Path) -> int:
+    """`uv sync`: lock, then an (empty) .venv."""
+    status = lock(args, cwd)
+    if status:
+        return status
+    venv = _find_project(cwd) / ".venv"
+    venv.mkdir(exist_ok=True)
+    (venv / ".gitignore").write_text("*\n")
+    (venv / "pyvenv.cfg").write_text(f"home = {Path(sys.executable).parent}\nversion_info = {DEFAULT_PYTHON_VERSION}\n")
+    print("Audited 1 package in 0ms")
+    return 0
+
+
+COMMANDS = {"init": init, "lock": lock, "sync": sync}
+
+
+def main(argv: list[str] | None = None, cwd: Path | None = None) -> int:
+    """Run a uv command line (without the leading `uv`); returns the exit status."""
+    argv = sys.argv[1:] if argv is None else argv
+    cwd = Path(cwd or os.getcwd()).absolute()
+    _record(argv, cwd)
+    if not argv or argv[0] in ("--version", "-V", "version"):
+        print(FAKE_UV_VERSION)
+        return 0
+    command = COMMANDS.get(argv[0])
+    if command is None:
+        return _error(f"unrecognized subcommand '{argv[0]}' (viperx fake uv)")
+    return command(argv[1:], cwd)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+ViperX Fleet - Operations across many viperx-managed projects
+
+This module powers the multi-repository commands:
+- Project discovery: find every viperx.yaml under a directory tree,
+  pruning virtualenvs, VCS metadata and other heavy folders.
+- Fleet migration (`viperx migrate --recursive`): run migrations for every
+  discovered project in a process pool and collect a per-repo summary.
+- Fleet audit (`viperx audit`): compare each viperx.yaml with its codebase
+  (ConfigScanner.update_config) in parallel, read-only, into one report.
+
+Workers only receive plain paths/strings and return plain dicts, so results
+are JSON-serializable and safe to ship across process boundaries.
+"""
+import os
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from viperx.constants import FLEET_PRUNED_DIRS, VIPERX_CONFIG_FILENAME
+
+
+def discover_projects(root: Path, pruned: Iterable[str] = FLEET_PRUNED_DIRS) -> list[Path]:
+    """
+    Find all project roots (directories containing viperx.yaml) under `root`.
+
+    Uses os.walk with in-place pruning so ignored trees (.venv, .git,
+    node_modules, ...) are never entered. Results are sorted for stable output.
+    """
+    pruned = set(pruned)
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in pruned]
+        if VIPERX_CONFIG_FILENAME in filenames:
+            found.append(Path(dirpath))
+    return sorted(found)
+
+
+def default_jobs() -> int:
+    """Worker count for process pools (one per CPU)."""
+    return os.cpu_count() or 1
+
+
+def run_parallel(func: Callable[..., dict], tasks: list[tuple], jobs: Optional[int] = None) -> list[dict]:
+    """
+    Run `func(*task)` for each task, in a process pool when jobs > 1.
+    Results keep the order of `tasks`.
+    """
+    jobs = jobs or default_jobs()
+    if jobs <= 1 or len(tasks) <= 1:
+        return [func(*task) for task in tasks]
+    workers = min(jobs, len(tasks))
+    # Batch tasks per worker round-trip: hundreds of tiny jobs are IPC-bound otherwise
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, *zip(*tasks), chunksize=chunksize))
+
+
+def _relative(project_root: Path, fleet_root: Path) -> str:
+    rel = os.path.relpath(project_root, fleet_root)
+    return "." if rel == os.curdir else Path(rel).as_posix()
+
+
+def prefix_diff(diff: str, prefix: str) -> str:
+    """Rewrite a/ b/ headers of a unified diff so paths are relative to the fleet root."""
+    if not prefix or prefix == ".":
+        return diff
+    lines = []
+    for line in diff.splitlines(keepends=True):
+        if line.startswith("--- a/"):
+            line = f"--- a/{prefix}/" + line[len("--- a/"):]
+        elif line.startswith("+++ b/"):
+            line = f"+++ b/{prefix}/" + line[len("+++ b/"):]
+        lines.append(line)
+    return "".join(lines)
+
+
+def migrate_one(project_root: str, fleet_root: str, to_version: str, dry_run: bool) -> dict:
+    """
+    Migrate a single project (process-pool worker).
+    Never raises: failures are reported in the returned summary.
+    """
+    # Import to register migrations (needed with 'spawn' start method)
+    import viperx.migrations.v1_0_x  # noqa
+    from viperx.migrations import migrate_project
+
+    rel = _relative(Path(project_root), Path(fleet_root))
+    started = time.perf_counter()
+    summary = {
+        "project": rel,
+        "status": "ok",
+        "from_version": None,
+        "to_version": None,
+        "changes": [],
+        "files": [],
+        "error": None,
+    }
+    try:
+        result = migrate_project(Path(project_root), to_version, dry_run)
+    # Migrations may be third-party code; one failing repo must not abort pool.map for the fleet
+    except Exception as e:  # noqa: BLE001
+        summary["status"] = "error"
+        summary["error"] = f"{type(e).__name__}: {e}"
+    else:
+        summary.update(
+            from_version=result.from_version,
+            to_version=result.to_version,
+            changes=result.changes,
+            files=result.files,
+        )
+        if not result.files:
+            summary["status"] = "up-to-date"
+        if dry_run:
+            summary["diff"] = prefix_diff(result.diff, rel)
+    summary["duration_s"] = round(time.perf_counter() - started, 4)
+    return summary
+
+
+def migrate_fleet(root: Path, to_version: str, dry_run: bool = False, jobs: Optional[int] = None) -> list[dict]:
+    """Discover all projects under `root` and migrate them in parallel."""
+    root = Path(root).resolve()
+    tasks = [(str(p), str(root), to_version, dry_run) for p in discover_projects(root)]
+    return run_parallel(migrate_one, tasks, jobs)
+
+
+def consolidated_diff(summaries: list[dict]) -> str:
+    """Concatenate per-repo dry-run diffs into a single patch (paths relative to the fleet root)."""
+    return "".join(s.get("diff", "") for s in summaries)
+
+
+# =============================================================================
+# Drift Audit
+# =============================================================================
+
+AUDIT_CSV_FIELDS = ["project", "status", "field", "kind", "detail"]
+
+
+def _parse_annotation(annotation: str) -> dict:
+    """Split a ConfigScanner annotation ("field: KIND - detail") into columns."""
+    field_name, _, rest = annotation.partition(": ")
+    kind, _, detail = rest.partition(" - ")
+    return {"field": field_name, "kind": kind.strip(), "detail": detail.strip()}
+
+
+def audit_one(project_root: str, fleet_root: str) -> dict:
+    """
+    Compare one project's viperx.yaml with its codebase (process-pool worker).
+    Strictly read-only: nothing is written. Never raises.
+    """
+    import yaml
+
+    from viperx.config_scanner import ConfigScanner
+
+    root = Path(project_root)
+    summary = {"project": _relative(root, Path(fleet_root)), "status": "in-sync", "drift": [], "error": None}
+    try:
+        # The C loader is several times faster when libyaml is available
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        existing = yaml.load((root / VIPERX_CONFIG_FILENAME).read_text(), Loader=loader) or {}
+        if not isinstance(existing, dict):
+            raise TypeError("viperx.yaml is not a mapping")
+        _, annotations = ConfigScanner(root, explain=False).update_config(existing)
+    # The scanner parses arbitrary project sources; one unreadable repo must not abort the fleet report
+    except Exception as e:  # noqa: BLE001
+        summary["status"] = "error"
+        summary["error"] = f"{type(e).__name__}: {e}"
+        return summary
+
+    summary["drift"] = [_parse_annotation(a) for a in annotations]
+    if annotations:
+        summary["status"] = "drift"
+    return summary
+
+
+def audit_fleet(root: Path, jobs: Optional[int] = None) -> list[dict]:
+    """Discover all projects under `root` and audit them in parallel."""
+    root = Path(root).resolve()
+    tasks = [(str(p), str(root)) for p in discover_projects(root)]
+    return run_parallel(audit_one, tasks, jobs)
+
+
+def audit_rows(summaries: list[dict]) -> list[dict]:
+    """Flatten audit summaries into one row per drift item (CSV friendly)."""
+    rows = []
+    for s in summaries:
+        if s["drift"]:
+            for d in s["drift"]:
+                rows.append({"project": s["project"], "status": s["status"], **d})
+        else:
+            rows.append({
+                "project": s["project"], "status": s["status"],
+                "field": "", "kind": "", "detail": s["error"] or "",
+            })
+    return rows
+
+
+def write_audit_csv(summaries: list[dict], stream):
+    """Write the audit report as CSV to a text stream."""
+    import csv
+
+    writer = csv.DictWriter(stream, fieldnames=AUDIT_CSV_FIELDS)
+    writer.writeheader()
+    writer.writerows(audit_rows(summaries))
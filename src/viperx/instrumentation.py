@@ -0,0 +1,279 @@
+"""
+ViperX Instrumentation - Spans & counters for observability backends
+
+A tiny, dependency-free instrumentation API used across ViperX:
+- `span(name, category, **attributes)`: time a block
+- `traced(name)`: time every call of a function
+- `phase(name)`: split the innermost traced function into named phases
+- `count(name, value, **attributes)`: increment a counter
+
+Calls are dispatched to the registered `Instrument` backends:
+- `viperx.profiling.Profiler`: Chrome trace (`viperx --profile trace.json`)
+- `OTLPFileExporter`: OTLP-JSON lines (`viperx --otlp-file spans.jsonl`)
+- Plugins: any installed distribution exposing an entry point in the
+  `viperx.instrumentation` group (a callable returning an `Instrument`),
+  enabled with `VIPERX_INSTRUMENTATION=<name>[,<name>...]` or `=all`
+
+With no backend registered (the default), `span()` returns a shared no-op
+context manager and `traced` functions call straight through.
+"""
+import json
+import secrets
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import Any
+
+from viperx.constants import INSTRUMENTATION_ENTRY_POINT_GROUP
+
+_NOOP = nullcontext()
+
+
+class Instrument:
+    """
+    Backend interface. All methods are no-ops; override what you need.
+    `start_span` returns an opaque handle passed back to `end_span`.
+    """
+
+    def start_span(self, name: str, category: str, attributes: dict) -> Any:
+        return None
+
+    def end_span(self, handle: Any):
+        pass
+
+    def add(self, name: str, value: float, attributes: dict):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+# Registered backends (empty = instrumentation disabled)
+_instruments: list[Instrument] = []
+# Open traced frames per thread: [(name, phase_handles or None), ...]
+_local = threading.local()
+
+
+def register(instrument: Instrument) -> Instrument:
+    _instruments.append(instrument)
+    return instrument
+
+
+def unregister(instrument: Instrument):
+    if instrument in _instruments:
+        _instruments.remove(instrument)
+
+
+def enabled() -> bool:
+    return bool(_instruments)
+
+
+def shutdown():
+    """Flush and remove every registered backend."""
+    while _instruments:
+        _instruments.pop().shutdown()
+
+
+def _start(name: str, category: str, attributes: dict) -> list:
+    return [(inst, inst.start_span(name, category, attributes)) for inst in _instruments]
+
+
+def _end(handles: list):
+    for inst, handle in reversed(handles):
+        inst.end_span(handle)
+
+
+@contextmanager
+def _span(name: str, category: str, attributes: dict):
+    handles = _start(name, category, attributes)
+    try:
+        yield
+    finally:
+        _end(handles)
+
+
+def span(name: str, category: str = "viperx", **attributes):
+    """Context manager timing a block (no-op when no backend is registered)."""
+    if not _instruments:
+        return _NOOP
+    return _span(name, category, attributes)
+
+
+def count(name: str, value: float = 1, **attributes):
+    """Increment a counter."""
+    for inst in _instruments:
+        inst.add(name, value, attributes)
+
+
+def _frames() -> list:
+    frames = getattr(_local, "frames", None)
+    if frames is None:
+        frames = _local.frames = []
+    return frames
+
+
+def phase(name: str):
+    """
+    Start a named phase inside the innermost `traced` function, ending the
+    previous one. Phases end automatically when the traced function returns,
+    so long functions can be split without re-indenting them.
+    """
+    if not _instruments:
+        return
+    frames = _frames()
+    if not frames:
+        return
+    prefix, handles = frames[-1]
+    if handles is not None:
+        _end(handles)
+    frames[-1] = (prefix, _start(f"{prefix}: {name}", "phase", {}))
+
+
+def traced(name: str, category: str = "viperx"):
+    """Decorator recording a span for each call of the function."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _instruments:
+                return func(*args, **kwargs)
+            handles = _start(name, category, {})
+            frames = _frames()
+            frames.append((name, None))
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _, phase_handles = frames.pop()
+                if phase_handles is not None:
+                    _end(phase_handles)
+                _end(handles)
+        return wrapper
+    return decorator
+
+
+def load_plugins(names: str) -> list[Instrument]:
+    """
+    Register backends exposed by installed plugins (entry points).
+
+    Args:
+        names: Comma-separated entry point names, or "all". Discovery scans
+            installed distributions, so it only runs when explicitly requested
+            (VIPERX_INSTRUMENTATION) to keep CLI startup free.
+    """
+    from importlib.metadata import entry_points
+
+    wanted = {n.strip() for n in names.split(",") if n.strip()}
+    loaded = []
+    for ep in entry_points(group=INSTRUMENTATION_ENTRY_POINT_GROUP):
+        if "all" not in wanted and ep.name not in wanted:
+            continue
+        try:
+            loaded.append(register(ep.load()()))
+        except (ImportError, AttributeError, TypeError, ValueError, OSError, RuntimeError) as e:
+            # A broken plugin (missing module or dependency, bad factory) must never break the command
+            from rich.console import Console
+            Console(stderr=True).print(f"[yellow]Warning:[/yellow] Instrumentation plugin '{ep.name}' failed: {e}")
+    return loaded
+
+
+# =============================================================================
+# OTLP-JSON Lines File Exporter
+# =============================================================================
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict) -> list[dict]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()]
+
+
+class OTLPFileExporter(Instrument):
+    """
+    Writes finished spans (and counters, on shutdown) as OTLP-JSON lines:
+    one ExportTraceServiceRequest / ExportMetricsServiceRequest object per
+    line, the format of the OpenTelemetry Collector `file` exporter, ready
+    to be replayed by the collector's `otlpjsonfile` receiver.
+    """
+
+    def __init__(self, path: Path, service_name: str = "viperx"):
+        self.path = Path(path)
+        self.resource = {"attributes": _otlp_attributes({"service.name": service_name})}
+        self.scope = {"name": "viperx"}
+        self.trace_id = secrets.token_hex(16)
+        self._stack = threading.local()
+        self._counters: dict[tuple, float] = {}
+        self._start_ns = time.time_ns()
+        self._lock = threading.Lock()
+        self.path.touch()  # Fail at registration, not on the first span
+
+    def start_span(self, name: str, category: str, attributes: dict) -> Any:
+        stack = getattr(self._stack, "ids", None)
+        if stack is None:
+            stack = self._stack.ids = []
+        span_id = secrets.token_hex(8)
+        parent = stack[-1] if stack else ""
+        stack.append(span_id)
+        return (span_id, parent, name, category, attributes, time.time_ns())
+
+    def end_span(self, handle: Any):
+        span_id, parent, name, category, attributes, start_ns = handle
+        self._stack.ids.pop()
+        record = {
+            "traceId": self.trace_id,
+            "spanId": span_id,
+            "parentSpanId": parent,
+            "name": name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(time.time_ns()),
+            "attributes": _otlp_attributes({"viperx.category": category, **attributes}),
+        }
+        self._emit({"resourceSpans": [{
+            "resource": self.resource,
+            "scopeSpans": [{"scope": self.scope, "spans": [record]}],
+        }]})
+
+    def add(self, name: str, value: float, attributes: dict):
+        key = (name, tuple(sorted(attributes.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def _emit(self, payload: dict):
+        line = json.dumps(payload, separators=(",", ":"))
+        # Appended line by line: spans already written survive a crashed command
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+    def shutdown(self):
+        if self._counters:
+            now = str(time.time_ns())
+            by_name: dict[str, list] = {}
+            for (name, attrs), value in sorted(self._counters.items()):
+                by_name.setdefault(name, []).append({
+                    "attributes": _otlp_attributes(dict(attrs)),
+                    "startTimeUnixNano": str(self._start_ns),
+                    "timeUnixNano": now,
+                    "asDouble": value,
+                })
+            metrics = [
+                {"name": name, "sum": {
+                    "dataPoints": points,
+                    "aggregationTemporality": 2,  # CUMULATIVE
+                    "isMonotonic": True,
+                }}
+                for name, points in by_name.items()
+            ]
+            self._emit({"resourceMetrics": [{
+                "resource": self.resource,
+                "scopeMetrics": [{"scope": self.scope, "metrics": metrics}],
+            }]})
+            self._counters.clear()
+
@@ -7,6 +7,8 @@ This module provides the command-line interface for ViperX, supporting:
 - Workspace management (viperx package add/delete/update)
 - Config synchronization (viperx config update)
 - Version migrations (viperx migrate)
+- Fleet drift audit (viperx audit)
+- Selective regeneration of template outputs (viperx regenerate)
 
 CLI Structure:
     viperx config [OPTIONS]     Apply configuration or create project
@@ -14,6 +16,8 @@ CLI Structure:
     viperx config update        Sync viperx.yaml with codebase
     viperx package add/delete   Manage workspace packages
     viperx migrate              Upgrade to newer ViperX versions
+    viperx audit                Report config drift across many projects
+    viperx regenerate           Re-render outdated, unedited generated files
 """
 import typer
 from pathlib import Path
@@ -27,6 +31,7 @@ from viperx.constants import (
     PROJECT_TYPES,
     DL_FRAMEWORKS,
     FRAMEWORK_PYTORCH,
+    PYTEST_BENCHMARK_REQUIREMENT,
 )
 import importlib.metadata
 try:
@@ -59,6 +64,47 @@ def version_callback(value: bool):
         console.print(f"ViperX CLI Version: [bold green]{version}[/bold green]")
         raise typer.Exit()
 
+def _start_profiling(ctx: typer.Context, trace_path: Path):
+    """Record spans for this command; write the trace and print a summary on exit."""
+    from viperx import profiling
+    
+    profiling.start()
+    
+    def finish():
+        profiler = profiling.stop()
+        if profiler is None:
+            return
+        profiler.write(trace_path)
+        # stderr: keep machine-readable stdout (e.g. audit --format json) intact
+        err_console = Console(stderr=True, force_terminal=True)
+        profiling.print_summary(profiler, err_console)
+        err_console.print(f"[dim]Trace written to {trace_path} (open in https://ui.perfetto.dev)[/dim]")
+    
+    ctx.call_on_close(finish)
+
+def _start_instrumentation(ctx: typer.Context, otlp_file: Path, plugins: str):
+    """Register the OTLP file exporter and/or plugins; flush them on exit."""
+    from viperx import instrumentation
+    
+    if otlp_file:
+        instrumentation.register(instrumentation.OTLPFileExporter(otlp_file))
+    if plugins:
+        instrumentation.load_plugins(plugins)
+    ctx.call_on_close(instrumentation.shutdown)
+
+def _start_stats(ctx: typer.Context):
+    """Count operations of this command; print them on exit."""
+    from viperx import instrumentation
+    from viperx.stats import OperationStats, print_stats
+    
+    collector = instrumentation.register(OperationStats())
+    
+    def finish():
+        instrumentation.unregister(collector)
+        print_stats(collector, Console(stderr=True, force_terminal=True))
+    
+    ctx.call_on_close(finish)
+
 @app.callback(invoke_without_command=True)
 def cli_callback(
     ctx: typer.Context,
@@ -71,6 +117,22 @@ def cli_callback(
     explain: bool = typer.Option(
          False, "--explain",
          help="Temporarily enable educational mode for this command."
+    ),
+    profile: Path = typer.Option(
+        None, "--profile",
+        help="Write a Chrome trace (Perfetto) of this command to the given file."
+    ),
+    otlp_file: Path = typer.Option(
+        None, "--otlp-file", envvar="VIPERX_OTLP_FILE",
+        help="Append spans and counters of this command as OTLP-JSON lines."
+    ),
+    plugins: str = typer.Option(
+        None, "--instrument", envvar="VIPERX_INSTRUMENTATION",
+        help="Instrumentation plugins to enable (entry point names, or 'all')."
+    ),
+    stats: bool = typer.Option(
+        False, "--stats",
+        help="Print operation counts (subprocesses, file writes, parses) on exit."
     )
 ):
     """
@@ -79,6 +141,13 @@ def cli_callback(
     Automates the creation of professional-grade Python projects using `uv`.
     Focuses on education, transparency, and freedom.
     """
+    if profile:
+        _start_profiling(ctx, profile)
+    if otlp_file or plugins:
+        _start_instrumentation(ctx, otlp_file, plugins)
+    if stats:
+        _start_stats(ctx)
+    
     # Load persistent state
     from viperx.settings import settings
     
@@ -203,6 +272,7 @@ def config_main(
     ),
     use_env: bool = typer.Option(True, "--env/--no-env", help="Generate .env file"),
     use_config: bool = typer.Option(True, "--embed-config/--no-embed-config", help="Generate embedded config"),
+    use_bench: bool = typer.Option(False, "--with-bench", help="Scaffold benchmarks/ (pytest-benchmark, memory budgets)"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
 ):
     """
@@ -290,6 +360,7 @@ def config_main(
         builder=builder,
         use_env=use_env,
         use_config=use_config,
+        use_bench=use_bench,
         framework=framework,
         verbose=verbose or state["verbose"],
         explain=verbose or state["explain"]
@@ -355,7 +426,8 @@ def config_update(
     
     if config_path.exists():
         # Update existing config
-        with open(config_path, "r") as f:
+        from viperx.instrumentation import span
+        with open(config_path, "r") as f, span("yaml.parse", "parse", path=config_path):
             existing_config = yaml.safe_load(f) or {}
         
         new_config, annotations = scanner.update_config(existing_config)
@@ -384,6 +456,55 @@ def config_update(
         ))
 
 
+@config_app.command("model")
+def config_model(
+    packages: list[Path] = typer.Argument(
+        None, help="Package directories (default: every src/<pkg> with a config.yaml)"
+    ),
+    check: bool = typer.Option(False, "--check", help="Exit 1 if a settings_model.py is outdated, write nothing"),
+):
+    """
+    **Regenerate settings_model.py** from each package's config.yaml.
+    
+    The typed, frozen dataclasses mirror the structure of config.yaml.
+    Run this after adding, removing or retyping keys.
+    """
+    import yaml
+
+    from viperx.constants import CONFIG_FILENAME, SETTINGS_MODEL_FILENAME, SRC_DIR
+    from viperx.settings_model import settings_model_source, write_settings_model
+    
+    if not packages:
+        packages = sorted(p.parent for p in (Path.cwd() / SRC_DIR).glob(f"*/{CONFIG_FILENAME}"))
+    if not packages:
+        console.print(f"[bold red]Error:[/bold red] No {SRC_DIR}/<package>/{CONFIG_FILENAME} found.")
+        raise typer.Exit(1)
+    
+    outdated = []
+    for pkg_dir in packages:
+        if not (pkg_dir / CONFIG_FILENAME).exists():
+            console.print(f"[bold red]Error:[/bold red] {pkg_dir / CONFIG_FILENAME} not found.")
+            raise typer.Exit(1)
+        target = pkg_dir / SETTINGS_MODEL_FILENAME
+        try:
+            if check:
+                changed = not target.exists() or target.read_text() != settings_model_source(pkg_dir, pkg_dir.name)
+            else:
+                changed = write_settings_model(pkg_dir, pkg_dir.name)
+        except (OSError, TypeError, yaml.YAMLError) as e:
+            console.print(f"[bold red]Error:[/bold red] {pkg_dir / CONFIG_FILENAME}: {e}")
+            raise typer.Exit(1)
+        if changed:
+            outdated.append(target)
+            console.print(f"{'[yellow]Outdated[/yellow]' if check else '[green]✓ Updated[/green]'} {target}")
+        else:
+            console.print(f"[dim]Up to date {target}[/dim]")
+    
+    if check and outdated:
+        console.print(f"\nRun [bold]viperx config model[/bold] to regenerate {len(outdated)} file(s).")
+        raise typer.Exit(1)
+
+
 @config_app.command("eject")
 def config_eject(
     force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation")
@@ -436,6 +557,7 @@ def package_add(
     use_env: bool = typer.Option(True, "--env/--no-env", help="Generate .env file"),
     use_config: bool = typer.Option(True, "--embed-config/--no-embed-config", help="Generate embedded config"),
     use_readme: bool = typer.Option(False, "--readme/--no-readme", help="Generate README.md"),
+    use_bench: bool = typer.Option(False, "--with-bench", help="Scaffold benchmarks/ (pytest-benchmark, memory budgets)"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
 ):
     """
@@ -455,11 +577,16 @@ def package_add(
         use_env=use_env, 
         use_config=use_config,
         use_readme=use_readme,
+        use_bench=use_bench,
         framework=framework,
         verbose=verbose or state["verbose"],
         explain=verbose or state["explain"]
     )
     generator.add_to_workspace(Path.cwd())
+    if use_bench:
+        from viperx.utils import add_dev_requirement
+        if add_dev_requirement(Path.cwd() / "pyproject.toml", PYTEST_BENCHMARK_REQUIREMENT):
+            generator.log(f"Added {PYTEST_BENCHMARK_REQUIREMENT} to dev dependencies")
 
 @package_app.command("delete")
 def package_delete(
@@ -545,15 +672,19 @@ def template_eject(
 
 @template_app.command("add")
 def template_add(
-    url: str = typer.Argument(..., help="Git URL of the template pack")
+    url: str = typer.Argument(..., help="Git URL (or local path / file:// URL) of the template pack"),
+    ref: str = typer.Option(None, "--ref", "-r", help="Pin to a branch, tag or commit (default: remote HEAD)"),
+    offline: bool = typer.Option(False, "--offline", help="Install from the local pack cache only (no network)"),
 ):
     """
     Download templates from a Git repository (Plugin system).
     
+    Packs are cached in ~/.cache/viperx/template-packs by repo URL and commit,
+    updated incrementally with `git fetch`, and validated before install.
     Flattens all .j2 files from the repo into your user template dir.
     """
     from viperx.templates import TemplateManager
-    TemplateManager().add_template_pack(url)
+    TemplateManager().add_template_pack(url, ref=ref, offline=offline)
 
 
 
@@ -565,14 +696,26 @@ def template_add(
 def migrate(
     dry_run: bool = typer.Option(False, "--dry-run", help="Preview changes without applying"),
     target_version: str = typer.Option(None, "--to", help="Target version (default: current ViperX version)"),
+    recursive: bool = typer.Option(False, "--recursive", "-r", help="Migrate every viperx.yaml project found under --root"),
+    root: Path = typer.Option(Path("."), "--root", help="Directory tree to scan in --recursive mode"),
+    jobs: int = typer.Option(None, "--jobs", "-j", help="Parallel worker processes for --recursive (default: CPU count)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the per-repo summary as JSON (--recursive)"),
+    diff_file: Path = typer.Option(None, "--diff-file", help="Write the consolidated --dry-run diff to this file (--recursive)"),
 ):
     """
     Migrate an existing project to a newer ViperX version.
+    
+    With [bold]--recursive[/bold], discovers every viperx.yaml under a directory
+    tree (skipping .venv, .git, node_modules, ...) and migrates all projects in parallel.
     """
-    from viperx.migrations import run_migrations, get_project_version
+    from viperx.migrations import migrate_project, get_project_version
     # Import to register migrations
     import viperx.migrations.v1_0_x  # noqa
     
+    if recursive:
+        _migrate_recursive(root, target_version or version, dry_run, jobs, json_output, diff_file)
+        return
+    
     project_root = Path.cwd()
     
     # Check if viperx.yaml exists
@@ -592,7 +735,16 @@ def migrate(
     if dry_run:
         console.print("[dim]Dry run mode - no changes will be made[/dim]\n")
     
-    changes = run_migrations(project_root, target, dry_run)
+    import yaml
+
+    try:
+        result = migrate_project(project_root, target, dry_run)
+    # I/O and unparseable project files (tomlkit and UnicodeDecodeError are ValueErrors); bugs propagate
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        console.print(f"[bold red]Migration failed:[/bold red] {e}")
+        console.print("[dim]All changes were rolled back.[/dim]")
+        raise typer.Exit(1)
+    changes = result.changes
     
     if changes:
         console.print("[green]Changes:[/green]")
@@ -601,8 +753,152 @@ def migrate(
     else:
         console.print("[green]✓[/green] Project is already up to date!")
     
+    if dry_run and result.diff:
+        from rich.syntax import Syntax
+        console.print("\n[bold]Pending diff:[/bold]")
+        console.print(Syntax(result.diff, "diff", theme="ansi_dark"))
+    
     if not dry_run and changes:
-        console.print(f"\n[green]✓[/green] Migrated to version {target}")
+        console.print(f"\n[green]✓[/green] Migrated to version {result.to_version}")
+
+
+def _migrate_recursive(root: Path, target: str, dry_run: bool, jobs: int, json_output: bool, diff_file: Path):
+    """Fleet mode for `viperx migrate --recursive`."""
+    import json
+
+    from rich.table import Table
+
+    from viperx.fleet import consolidated_diff, migrate_fleet
+    
+    if not root.is_dir():
+        console.print(f"[bold red]Error:[/bold red] '{root}' is not a directory.")
+        raise typer.Exit(1)
+    
+    summaries = migrate_fleet(root, target, dry_run=dry_run, jobs=jobs)
+    failed = [s for s in summaries if s["status"] == "error"]
+    patch = consolidated_diff(summaries) if dry_run else ""
+    
+    if diff_file and dry_run:
+        diff_file.write_text(patch)
+    
+    if json_output:
+        # Plain stdout: keep the output machine-readable
+        print(json.dumps(summaries, indent=2))
+    else:
+        table = Table(title=f"🔄 Fleet Migration → {target}" + (" (dry run)" if dry_run else ""), border_style="blue")
+        table.add_column("Project", style="cyan")
+        table.add_column("Status")
+        table.add_column("From")
+        table.add_column("To")
+        table.add_column("Files", justify="right")
+        styles = {"ok": "green", "up-to-date": "dim", "error": "red"}
+        for s in summaries:
+            style = styles[s["status"]]
+            table.add_row(
+                s["project"], f"[{style}]{s['status']}[/{style}]",
+                s["from_version"] or "-", s["to_version"] or "-", str(len(s["files"]))
+            )
+        console.print(table)
+        for s in failed:
+            console.print(f"[red]✗ {s['project']}: {s['error']}[/red]")
+        if dry_run and patch and not diff_file:
+            from rich.syntax import Syntax
+            console.print("\n[bold]Consolidated diff:[/bold]")
+            console.print(Syntax(patch, "diff", theme="ansi_dark"))
+        elif diff_file and dry_run:
+            console.print(f"[dim]Consolidated diff written to {diff_file}[/dim]")
+        console.print(f"\n{len(summaries)} project(s), {len(failed)} failed.")
+    
+    if failed:
+        raise typer.Exit(1)
+
+
+# =============================================================================
+# Audit Command
+# =============================================================================
+
+@app.command()
+def audit(
+    root: Path = typer.Argument(Path("."), help="Directory tree to scan for viperx.yaml projects"),
+    format: str = typer.Option("table", "--format", "-F", help="Report format: table, json, csv"),
+    output: Path = typer.Option(None, "--output", "-o", help="Write the json/csv report to this file"),
+    jobs: int = typer.Option(None, "--jobs", "-j", help="Parallel worker processes (default: CPU count)"),
+    strict: bool = typer.Option(False, "--strict", help="Exit with code 1 if any project drifted"),
+):
+    """
+    **Audit drift** between viperx.yaml and the codebase across many projects.
+    
+    Runs the same comparison as [bold]viperx config update[/bold] for every
+    project found under ROOT, in parallel, without writing anything.
+    """
+    import io
+    import json
+
+    from viperx.fleet import audit_fleet, write_audit_csv
+    
+    if format not in ("table", "json", "csv"):
+        console.print(f"[bold red]Error:[/bold red] Invalid format '{format}'. Use table, json or csv.")
+        raise typer.Exit(1)
+    if not root.is_dir():
+        console.print(f"[bold red]Error:[/bold red] '{root}' is not a directory.")
+        raise typer.Exit(1)
+    
+    summaries = audit_fleet(root, jobs=jobs)
+    drifted = [s for s in summaries if s["status"] != "in-sync"]
+    
+    if format == "table":
+        from rich.table import Table
+        table = Table(title=f"🔍 ViperX Audit ({len(summaries)} projects)", border_style="blue")
+        table.add_column("Project", style="cyan")
+        table.add_column("Field")
+        table.add_column("Kind")
+        table.add_column("Detail", style="dim")
+        for s in drifted:
+            if s["error"]:
+                table.add_row(s["project"], "-", "[red]ERROR[/red]", s["error"])
+            for d in s["drift"]:
+                table.add_row(s["project"], d["field"], f"[yellow]{d['kind']}[/yellow]", d["detail"])
+        console.print(table)
+        console.print(f"{len(summaries) - len(drifted)} in sync, [yellow]{len(drifted)}[/yellow] drifted or failed.")
+    else:
+        if format == "json":
+            report = json.dumps(summaries, indent=2) + "\n"
+        else:
+            buffer = io.StringIO()
+            write_audit_csv(summaries, buffer)
+            report = buffer.getvalue()
+        if output:
+            output.write_text(report)
+            console.print(f"[green]✓[/green] Audit report written to {output}")
+        else:
+            # Plain stdout: keep the output machine-readable
+            print(report, end="")
+    
+    if strict and drifted:
+        raise typer.Exit(1)
+
+
+@app.command()
+def regenerate(
+    config: Path = typer.Option(
+        Path("viperx.yaml"), "-c", "--config",
+        help="Path to viperx.yaml (project root)"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show what would be regenerated"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
+):
+    """
+    **Re-render generated files** whose template or config changed.
+    
+    Uses [bold].viperx/manifest.json[/bold] (written at generation) to find
+    outdated files. Files you edited since generation are never touched.
+    """
+    if not config.exists():
+        console.print(f"[bold red]Error:[/bold red] Configuration file '{config}' not found.")
+        raise typer.Exit(1)
+    
+    engine = ConfigEngine(config, verbose=verbose or state["verbose"])
+    engine.regenerate(dry_run=dry_run)
 
 
 if __name__ == "__main__":
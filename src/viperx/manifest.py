@@ -0,0 +1,184 @@
+"""
+ViperX Render Manifest - Selective regeneration of template outputs
+
+Every file rendered from a Jinja2 template is recorded in
+`.viperx/manifest.json` at the project root:
+
+    {
+      "version": 1,
+      "contexts": {"<context digest>": {...render context...}},
+      "files": {
+        "src/pkg/config.py": {
+          "template": "config.py.j2",
+          "template_digest": "...",   # sha256 of the template source
+          "context_digest": "...",    # sha256 of the render context
+          "output_digest": "...",     # sha256 of what we wrote
+          "package": "pkg",           # generator that owns the file
+          "subpackage": false
+        }
+      }
+    }
+
+`viperx regenerate` uses it to re-render only files whose template or context
+changed AND whose content is still exactly what ViperX wrote (user edits are
+never overwritten). Unchanged files are not touched. Files that ViperX edits
+after rendering (e.g. `viperx config` updating pyproject.toml) are refreshed
+with `RenderManifest.touch`.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+from viperx.utils import atomic_write_text
+
+MANIFEST_DIR = ".viperx"
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def digest_text(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def digest_context(context: dict) -> str:
+    """Stable digest of a render context (key order independent)."""
+    return digest_text(json.dumps(context, sort_keys=True, default=str))
+
+
+class RenderManifest:
+    """Record of generated files for one project root."""
+
+    def __init__(self, root: Path, data: Optional[dict] = None):
+        self.root = Path(root)
+        self.data = data or {"version": MANIFEST_VERSION, "contexts": {}, "files": {}}
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self.root / MANIFEST_DIR / MANIFEST_FILENAME
+
+    @classmethod
+    def load(cls, root: Path) -> "RenderManifest":
+        manifest = cls(root)
+        if manifest.path.exists():
+            try:
+                manifest.data = json.loads(manifest.path.read_text())
+            except json.JSONDecodeError:
+                pass
+        return manifest
+
+    @property
+    def files(self) -> dict:
+        return self.data["files"]
+
+    def context(self, digest: str) -> Optional[dict]:
+        return self.data["contexts"].get(digest)
+
+    def relative(self, path: Path) -> str:
+        return Path(path).resolve().relative_to(self.root.resolve()).as_posix()
+
+    def record(self, path: Path, template: str, template_source: str, context: dict,
+               output: str, package: str, subpackage: bool):
+        """Record (or refresh) the entry for a rendered file."""
+        ctx_digest = digest_context(context)
+        self.data["contexts"].setdefault(ctx_digest, json.loads(json.dumps(context, default=str)))
+        self.files[self.relative(path)] = {
+            "template": template,
+            "template_digest": digest_text(template_source),
+            "context_digest": ctx_digest,
+            "output_digest": digest_text(output),
+            "package": package,
+            "subpackage": subpackage,
+        }
+        self._dirty = True
+
+    def touch(self, path: Path, text: str) -> bool:
+        """
+        Refresh the recorded output of a tracked file that ViperX itself
+        rewrote after rendering (e.g. pyproject.toml scripts and testpaths),
+        so `regenerate` does not mistake the edit for a user change.
+        Untracked paths are ignored. Returns True if the entry changed.
+        """
+        try:
+            entry = self.files.get(self.relative(path))
+        except ValueError:  # Outside the project root
+            return False
+        digest = digest_text(text)
+        if entry is None or entry["output_digest"] == digest:
+            return False
+        entry["output_digest"] = digest
+        self._dirty = True
+        return True
+
+    def save(self):
+        """Write the manifest (only if something changed), dropping unused contexts."""
+        if not self._dirty:
+            return
+        used = {entry["context_digest"] for entry in self.files.values()}
+        self.data["contexts"] = {k: v for k, v in self.data["contexts"].items() if k in used}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.path, json.dumps(self.data, indent=2, sort_keys=True) + "\n")
+        self._dirty = False
+
+
+def regenerate(root: Path, generators: dict, report, dry_run: bool = False):
+    """
+    Re-render outdated, unedited files recorded in the manifest.
+
+    Args:
+        root: Project root holding `.viperx/manifest.json`.
+        generators: Map of package raw name -> ProjectGenerator built from the
+            current viperx.yaml (provides the new context & template env).
+        report: UpdateReport collecting the outcome.
+        dry_run: Only report what would be regenerated.
+    """
+    manifest = RenderManifest.load(root)
+    if not manifest.files:
+        report.manual_checks.append("No .viperx/manifest.json found. Nothing to regenerate.")
+        return
+
+    contexts: dict = {}
+    for rel, entry in sorted(manifest.files.items()):
+        target = root / rel
+        gen = generators.get(entry["package"])
+        if gen is None:
+            report.deletions.append(f"{rel}: package '{entry['package']}' no longer in viperx.yaml (skipped)")
+            continue
+        if not target.exists():
+            report.deletions.append(f"{rel}: missing on disk (skipped)")
+            continue
+        if digest_text(target.read_text()) != entry["output_digest"]:
+            report.conflicts.append(f"{rel}: modified since generation (skipped)")
+            continue
+
+        template_source = gen.template_source(entry["template"])
+        key = (entry["package"], entry["subpackage"])
+        if key not in contexts:
+            contexts[key] = gen.build_context(entry["subpackage"])
+        context = contexts[key]
+
+        template_changed = digest_text(template_source) != entry["template_digest"]
+        context_changed = digest_context(context) != entry["context_digest"]
+        if not (template_changed or context_changed):
+            continue
+
+        output = gen.render_string(entry["template"], context)
+        reason = "template" if template_changed else "context"
+        if context_changed and template_changed:
+            reason = "template & context"
+
+        if digest_text(output) == entry["output_digest"]:
+            # Same bytes: just refresh the manifest, leave the file alone
+            if not dry_run:
+                manifest.record(target, entry["template"], template_source, context,
+                                output, entry["package"], entry["subpackage"])
+            continue
+
+        report.updated.append(f"{rel} ({reason} changed)" + (" [dry run]" if dry_run else ""))
+        if not dry_run:
+            atomic_write_text(target, output)
+            manifest.record(target, entry["template"], template_source, context,
+                            output, entry["package"], entry["subpackage"])
+
+    manifest.save()
@@ -2,34 +2,67 @@
 ViperX Migration System
 
 Handles project upgrades between ViperX versions.
+
+Migrations form a graph: each one is an edge `from_version → to_version`.
+The planner parses versions numerically (so "1.10.0" > "1.9.0") and picks the
+shortest chain of migrations that takes a project as close as possible to the
+target version.
+
+The whole chain runs against one transactional `ProjectView`: files are
+loaded lazily, parsed once, and committed atomically at the end (or shown as
+a unified diff with --dry-run). If any migration fails, nothing is written.
 """
 
+import re
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 from rich.console import Console
 
+from viperx.migrations.project_view import ProjectView
+from viperx.instrumentation import count, span, traced
+
 console = Console()
 
 
 class Migration:
-    """Base class for migrations."""
-    
+    """
+    Base class for migrations.
+
+    `check` and `apply` receive the shared `ProjectView` of the run. Read and
+    stage edits through it (`project.read_text`, `project.toml()`,
+    `project.write_text`, ...) instead of touching the filesystem directly.
+    """
+
     from_version: str
     to_version: str
     description: str
-    
-    def check(self, project_root: Path) -> bool:
+
+    def check(self, project: ProjectView) -> bool:
         """Check if migration is needed. Override in subclass."""
         return True
-    
-    def apply(self, project_root: Path, dry_run: bool = False) -> list[str]:
+
+    def apply(self, project: ProjectView, dry_run: bool = False) -> list[str]:
         """Apply migration. Returns list of changes. Override in subclass."""
         return []
-    
+
     def __repr__(self):
         return f"Migration({self.from_version} → {self.to_version})"
 
 
+@dataclass
+class MigrationResult:
+    """Outcome of a migration run on one project."""
+    project_root: str
+    from_version: Optional[str]
+    to_version: Optional[str]
+    changes: list[str] = field(default_factory=list)
+    files: list[str] = field(default_factory=list)
+    diff: str = ""
+    dry_run: bool = False
+
+
 # Migration Registry
 MIGRATIONS: list[Migration] = []
 
@@ -40,84 +73,193 @@ def register(migration_class):
     return migration_class
 
 
+def parse_version(version: str) -> tuple[int, ...]:
+    """
+    Parse a version string into a comparable tuple of integers.
+
+    Only the numeric release segment is considered ("1.10.0rc1" -> (1, 10, 0)).
+    Trailing zeros are dropped so "1.0" and "1.0.0" compare equal.
+    Unparseable strings (e.g. "unknown") yield an empty tuple.
+    """
+    match = re.match(r"^\s*v?(\d+(?:\.\d+)*)", str(version))
+    if not match:
+        return ()
+    parts = [int(p) for p in match.group(1).split(".")]
+    while parts and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
 def get_project_version(project_root: Path) -> Optional[str]:
     """Get ViperX version from viperx.yaml."""
-    import yaml
-    
     config_path = project_root / "viperx.yaml"
     if not config_path.exists():
         return None
-    
-    with open(config_path) as f:
-        try:
-            data = yaml.safe_load(f)
-            return data.get("viperx_version")
-        except yaml.YAMLError:
-            return None
+    return _read_version(config_path.read_text())
 
 
-def set_project_version(project_root: Path, version: str):
-    """Set ViperX version in viperx.yaml."""
-    
-    config_path = project_root / "viperx.yaml"
-    if not config_path.exists():
-        return
-    
-    with open(config_path) as f:
-        content = f.read()
-    
+def _read_version(content: Optional[str]) -> Optional[str]:
+    """Extract viperx_version from viperx.yaml content."""
+    import yaml
+
+    if content is None:
+        return None
+    try:
+        with span("yaml.parse", "parse"):
+            data = yaml.safe_load(content)
+    except yaml.YAMLError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    value = data.get("viperx_version")
+    return str(value) if value is not None else None
+
+
+def _with_version(content: str, version: str) -> str:
+    """Return viperx.yaml content with viperx_version set (text-level, keeps comments)."""
     # Check if viperx_version exists
-    if "viperx_version:" in content:
+    if re.search(r'^viperx_version:', content, flags=re.MULTILINE):
         # Replace existing
-        import re
-        content = re.sub(
+        return re.sub(
             r'^viperx_version:.*$',
             f'viperx_version: "{version}"',
             content,
             flags=re.MULTILINE
         )
-    else:
-        # Add at top after first line
-        lines = content.splitlines()
-        lines.insert(1, f'viperx_version: "{version}"')
-        content = "\n".join(lines)
-    
-    with open(config_path, "w") as f:
-        f.write(content)
+    # Add at top after first line
+    lines = content.splitlines()
+    lines.insert(1, f'viperx_version: "{version}"')
+    return "\n".join(lines)
 
 
-def get_applicable_migrations(from_version: Optional[str], to_version: str) -> list[Migration]:
-    """Get list of migrations to apply."""
-    # Sort migrations by from_version
-    sorted_migrations = sorted(MIGRATIONS, key=lambda m: m.from_version)
-    
-    applicable = []
-    for m in sorted_migrations:
-        # If no from_version, apply all migrations up to to_version
-        if from_version is None:
-            if m.to_version <= to_version:
-                applicable.append(m)
+def set_project_version(project_root: Path, version: str):
+    """Set ViperX version in viperx.yaml."""
+    config_path = project_root / "viperx.yaml"
+    if not config_path.exists():
+        return
+    config_path.write_text(_with_version(config_path.read_text(), version))
+
+
+def plan_migrations(
+    from_version: Optional[str],
+    to_version: str,
+    migrations: Optional[list[Migration]] = None,
+) -> list[Migration]:
+    """
+    Compute the shortest migration path from `from_version` towards `to_version`.
+
+    Versions are graph nodes and migrations are edges. From a version where no
+    migration starts, the planner may jump for free to the next version where
+    one does (releases without migrations need no work). Among all reachable
+    versions <= `to_version`, the highest one wins; ties are broken by the
+    fewest migrations.
+
+    If `from_version` is None (legacy project), planning starts from the
+    oldest known migration.
+    """
+    migrations = MIGRATIONS if migrations is None else migrations
+    target = parse_version(to_version)
+
+    # Only forward edges that stay within the target are usable
+    edges: dict[tuple, list[Migration]] = {}
+    for m in migrations:
+        src, dst = parse_version(m.from_version), parse_version(m.to_version)
+        if src < dst <= target:
+            edges.setdefault(src, []).append(m)
+
+    if not edges:
+        return []
+
+    sources = sorted(edges)
+    start = parse_version(from_version) if from_version is not None else sources[0]
+
+    def next_source(node: tuple) -> Optional[tuple]:
+        for src in sources:
+            if src > node:
+                return src
+        return None
+
+    # 0-1 BFS: migration edges cost 1, free jumps cost 0
+    dist: dict[tuple, int] = {start: 0}
+    prev: dict[tuple, tuple[tuple, Optional[Migration]]] = {}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if node in edges:
+            for m in edges[node]:
+                dst = parse_version(m.to_version)
+                if dst not in dist or dist[node] + 1 < dist[dst]:
+                    dist[dst] = dist[node] + 1
+                    prev[dst] = (node, m)
+                    queue.append(dst)
         else:
-            # Apply migrations that are newer than current version
-            if m.from_version >= from_version and m.to_version <= to_version:
-                applicable.append(m)
-    
-    return applicable
+            jump = next_source(node)
+            if jump is not None and (jump not in dist or dist[node] < dist[jump]):
+                dist[jump] = dist[node]
+                prev[jump] = (node, None)
+                queue.appendleft(jump)
+
+    # Best end node: highest version, then fewest steps
+    end = max(dist, key=lambda v: (v, -dist[v]))
+
+    path: list[Migration] = []
+    node = end
+    while node in prev:
+        node, m = prev[node]
+        if m is not None:
+            path.append(m)
+    path.reverse()
+    return path
+
+
+def get_applicable_migrations(from_version: Optional[str], to_version: str) -> list[Migration]:
+    """Get list of migrations to apply (in order)."""
+    return plan_migrations(from_version, to_version)
+
+
+@traced("migrations.migrate_project")
+def migrate_project(project_root: Path, to_version: str, dry_run: bool = False) -> MigrationResult:
+    """
+    Plan and run migrations for one project.
+
+    All migrations share a single `ProjectView`. The version bump is staged in
+    the same view, then everything is committed atomically (or only diffed
+    when `dry_run`). On failure the view is rolled back and the error re-raised.
+    """
+    project = ProjectView(project_root)
+    current = _read_version(project.read_text("viperx.yaml"))
+    migrations = plan_migrations(current, to_version)
+
+    result = MigrationResult(
+        project_root=str(project_root),
+        from_version=current,
+        to_version=current,
+        dry_run=dry_run,
+    )
+
+    try:
+        for m in migrations:
+            with span(f"migration {m.from_version} -> {m.to_version}", "migration"):
+                if m.check(project):
+                    result.changes.extend(m.apply(project, dry_run))
+                    count("viperx.migrations.applied", dry_run=dry_run)
+            result.to_version = m.to_version
+
+        content = project.read_text("viperx.yaml")
+        if migrations and content is not None:
+            project.write_text("viperx.yaml", _with_version(content, result.to_version))
+
+        result.diff = project.diff()
+        result.files = project.changed_files()
+        if not dry_run:
+            project.commit()
+    except Exception:
+        project.rollback()
+        raise
+
+    return result
 
 
 def run_migrations(project_root: Path, to_version: str, dry_run: bool = False) -> list[str]:
-    """Run all applicable migrations."""
-    current = get_project_version(project_root)
-    migrations = get_applicable_migrations(current, to_version)
-    
-    all_changes = []
-    
-    for m in migrations:
-        if m.check(project_root):
-            changes = m.apply(project_root, dry_run)
-            all_changes.extend(changes)
-            
-            if not dry_run:
-                set_project_version(project_root, m.to_version)
-    
-    return all_changes
+    """Run all applicable migrations. Returns the list of changes."""
+    return migrate_project(project_root, to_version, dry_run).changes
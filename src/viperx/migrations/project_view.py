@@ -0,0 +1,177 @@
+"""
+Transactional in-memory view of a project, shared by all migrations of a run.
+
+Files are loaded lazily on first access and parsed documents (TOML via tomlkit,
+YAML via PyYAML) are cached, so a chain of N migrations touching the same
+files parses them once. Nothing reaches the disk until `commit()`:
+- `diff()` renders pending changes as a unified diff (used by --dry-run).
+- `commit()` writes every changed file atomically and restores the original
+  contents if any write fails.
+- `rollback()` discards pending changes.
+"""
+
+import difflib
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from viperx.instrumentation import span
+from viperx.utils import atomic_write_text
+
+# Sentinel for "file did not exist / is deleted"
+_MISSING = None
+
+
+class ProjectView:
+    """Lazy, transactional view over the files of a project root."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._original: dict[str, Optional[str]] = {}
+        self._current: dict[str, Optional[str]] = {}
+        self._toml: dict[str, Any] = {}
+        self._yaml: dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # File access
+    # ------------------------------------------------------------------
+    def _key(self, path: str | Path) -> str:
+        return Path(path).as_posix()
+
+    def _load(self, key: str):
+        if key not in self._original:
+            disk_path = self.root / key
+            content = disk_path.read_text() if disk_path.is_file() else _MISSING
+            self._original[key] = content
+            self._current[key] = content
+
+    def _sync_toml(self, key: str):
+        """Serialize a cached TOML document back into the text buffer."""
+        if key in self._toml:
+            self._current[key] = self._toml[key].as_string()
+
+    def exists(self, path: str | Path) -> bool:
+        key = self._key(path)
+        self._load(key)
+        return self._current[key] is not _MISSING
+
+    def read_text(self, path: str | Path) -> Optional[str]:
+        """Return file content (pending changes included) or None if missing."""
+        key = self._key(path)
+        self._load(key)
+        self._sync_toml(key)
+        return self._current[key]
+
+    def write_text(self, path: str | Path, content: str):
+        """Stage new content for a file."""
+        key = self._key(path)
+        self._load(key)
+        self._current[key] = content
+        self._toml.pop(key, None)
+        self._yaml.pop(key, None)
+
+    def delete(self, path: str | Path):
+        """Stage deletion of a file."""
+        key = self._key(path)
+        self._load(key)
+        self._current[key] = _MISSING
+        self._toml.pop(key, None)
+        self._yaml.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # Parsed documents
+    # ------------------------------------------------------------------
+    def toml(self, path: str | Path = "pyproject.toml"):
+        """
+        Return a mutable tomlkit document for the file (parsed once).
+        Edits to the document are picked up automatically at diff/commit time.
+        """
+        import tomlkit
+
+        key = self._key(path)
+        if key not in self._toml:
+            content = self.read_text(key)
+            with span("toml.parse", "parse", path=key):
+                self._toml[key] = tomlkit.parse(content or "")
+        return self._toml[key]
+
+    def yaml(self, path: str | Path = "viperx.yaml") -> Any:
+        """
+        Return the parsed YAML data for the file (parsed once, read-only).
+        Use `write_text` for edits so comments in the file are preserved.
+        """
+        import yaml
+
+        key = self._key(path)
+        if key not in self._yaml:
+            content = self.read_text(key)
+            with span("yaml.parse", "parse", path=key):
+                self._yaml[key] = yaml.safe_load(content) if content else None
+        return self._yaml[key]
+
+    # ------------------------------------------------------------------
+    # Transaction
+    # ------------------------------------------------------------------
+    def changed_files(self) -> list[str]:
+        """Relative paths of files whose content differs from disk."""
+        for key in self._toml:
+            self._sync_toml(key)
+        return sorted(k for k in self._current if self._current[k] != self._original[k])
+
+    def diff(self) -> str:
+        """Unified diff of all pending changes."""
+        chunks = []
+        for key in self.changed_files():
+            before = self._original[key]
+            after = self._current[key]
+            chunks.extend(difflib.unified_diff(
+                (before or "").splitlines(keepends=True),
+                (after or "").splitlines(keepends=True),
+                fromfile=f"a/{key}" if before is not _MISSING else "/dev/null",
+                tofile=f"b/{key}" if after is not _MISSING else "/dev/null",
+            ))
+        return "".join(line if line.endswith("\n") else line + "\n" for line in chunks)
+
+    def commit(self) -> list[str]:
+        """
+        Write all pending changes to disk. Each file is replaced atomically;
+        if any write fails, files already written are restored and the error
+        is re-raised. Returns the list of changed paths.
+        """
+        changed = self.changed_files()
+        done: list[str] = []
+        try:
+            for key in changed:
+                target = self.root / key
+                content = self._current[key]
+                if content is _MISSING:
+                    if target.exists():
+                        target.unlink()
+                else:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    atomic_write_text(target, content)
+                done.append(key)
+        except Exception:
+            for key in reversed(done):
+                self._restore(key)
+            raise
+
+        # The view now mirrors disk
+        for key in changed:
+            self._original[key] = self._current[key]
+        return changed
+
+    def _restore(self, key: str):
+        target = self.root / key
+        original = self._original[key]
+        if original is _MISSING:
+            if target.exists():
+                os.remove(target)
+        else:
+            atomic_write_text(target, original)
+
+    def rollback(self):
+        """Discard all pending changes."""
+        self._current = dict(self._original)
+        self._toml.clear()
+        self._yaml.clear()
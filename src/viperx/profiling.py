@@ -0,0 +1,105 @@
+"""
+ViperX Profiling - Trace-level timing of a command (`viperx --profile trace.json`)
+
+An instrumentation backend (see viperx.instrumentation) recording the spans
+emitted around the expensive parts of a run:
+- ConfigEngine.apply phases (aggregation, type check, root, packages, sync, toggles)
+- Each ProjectGenerator._render (one span per template)
+- Each subprocess invocation (uv, git)
+- Each TOML/YAML parse
+
+The result is a Chrome trace-event JSON file (open it in https://ui.perfetto.dev
+or chrome://tracing) plus a top-N summary printed on exit.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+from viperx import instrumentation
+from viperx.instrumentation import Instrument
+
+
+class Profiler(Instrument):
+    """Collects complete ("X") trace events for one process."""
+
+    def __init__(self):
+        self.events: list[dict] = []
+        self.pid = os.getpid()
+        self._t0 = time.perf_counter_ns()
+
+    def start_span(self, name: str, category: str, attributes: dict) -> Any:
+        return (name, category, attributes, time.perf_counter_ns())
+
+    def end_span(self, handle: Any):
+        name, category, attributes, start_ns = handle
+        self.add_event(name, category, start_ns, time.perf_counter_ns(), attributes)
+
+    def add_event(self, name: str, cat: str, start_ns: int, end_ns: int, args: Optional[dict] = None):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start_ns - self._t0) / 1000,  # microseconds
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {k: str(v) for k, v in args.items()}
+        self.events.append(event)
+
+    def write(self, path: Path):
+        """Write the Chrome trace-event JSON file."""
+        data = {"traceEvents": self.events, "displayTimeUnit": "ms"}
+        Path(path).write_text(json.dumps(data))
+
+    def summary(self, top: int = 10) -> list[dict]:
+        """Aggregate spans by name, most expensive (total time) first."""
+        stats = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        for event in self.events:
+            entry = stats[event["name"]]
+            dur_ms = event["dur"] / 1000
+            entry["count"] += 1
+            entry["total_ms"] += dur_ms
+            entry["max_ms"] = max(entry["max_ms"], dur_ms)
+        rows = [{"name": name, **entry} for name, entry in stats.items()]
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows[:top]
+
+
+# Active profiler (None = profiling disabled)
+_profiler: Optional[Profiler] = None
+
+
+def start() -> Profiler:
+    """Enable profiling for this process."""
+    global _profiler
+    _profiler = instrumentation.register(Profiler())
+    return _profiler
+
+
+def stop() -> Optional[Profiler]:
+    """Disable profiling and return the collected profiler."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        instrumentation.unregister(profiler)
+    return profiler
+
+
+def print_summary(profiler: Profiler, console, top: int = 10):
+    """Print the top-N spans as a rich table."""
+    from rich.table import Table
+
+    table = Table(title=f"⏱️  Profile (top {top} by total time)", border_style="blue")
+    table.add_column("Span", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total (ms)", justify="right")
+    table.add_column("Max (ms)", justify="right")
+    for row in profiler.summary(top):
+        table.add_row(row["name"], str(row["count"]), f"{row['total_ms']:.1f}", f"{row['max_ms']:.1f}")
+    console.print(table)
@@ -0,0 +1,233 @@
+"""
+ViperX Settings Model - Typed settings classes generated from config.yaml
+
+`render_settings_model()` turns the structure of a parsed config.yaml into the
+source of `settings_model.py`: one frozen, slotted dataclass per mapping, each
+with a `from_dict()` that validates types once, at load. Generated code then
+reads `get_settings().data_cache.max_size_gb` (plain slot attributes) instead
+of nested `SETTINGS.get(...)` dict lookups.
+
+Type inference from the values found in config.yaml:
+- str / int / float / bool -> same type (ints are accepted for floats)
+- mapping -> nested dataclass (an empty mapping stays a read-only Mapping)
+- list -> tuple[T, ...] for scalars of one type, else tuple[Any, ...]
+- null or anything else -> Any (not validated)
+
+The model mirrors config.yaml at generation time. After changing its
+structure, run `viperx config model` (`--check` fails when outdated).
+"""
+import json
+import keyword
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from viperx.constants import CONFIG_FILENAME, SETTINGS_MODEL_FILENAME
+from viperx.instrumentation import span
+from viperx.utils import atomic_write_text
+
+ROOT_CLASS = "Settings"
+# Module-level names of the generated file (not usable as class names)
+RESERVED_NAMES = {"Any", "Mapping", "MappingProxyType", "dataclass", "config", "get_settings"}
+SCALAR_TYPES = {bool: "bool", int: "int", float: "float", str: "str"}
+
+HEADER = '''"""
+Typed settings for {package_name}, generated by ViperX from config.yaml.
+
+Usage:
+    from {package_name}.settings_model import get_settings
+    settings = get_settings()   # Validated once per loaded config
+    settings.<section>.<key>     # Plain attribute access
+
+Do not edit by hand: after changing the structure of config.yaml, run
+`viperx config model` to regenerate this file.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from . import config
+
+
+def _join(path: str, key: Any) -> str:
+    return f"{{path}}.{{key}}" if path else str(key)
+
+
+def _check(value: Any, where: str, types: tuple) -> Any:
+    if types and (not isinstance(value, types) or (isinstance(value, bool) and bool not in types)):
+        expected = " or ".join(t.__name__ for t in types)
+        raise TypeError(f"config.yaml: '{{where}}' should be {{expected}}, got {{type(value).__name__}}")
+    return value
+
+
+def _get(data: Mapping, key: Any, path: str, *types: type) -> Any:
+    if key not in data:
+        raise ValueError(f"config.yaml: missing '{{_join(path, key)}}'")
+    return _check(data[key], _join(path, key), types)
+
+
+def _items(values: list, path: str, *types: type) -> tuple:
+    return tuple(_check(value, f"{{path}}[{{i}}]", types) for i, value in enumerate(values))
+'''
+
+FOOTER = f'''
+
+_cache: tuple = (None, None)
+
+
+def get_settings() -> {ROOT_CLASS}:
+    """
+    Typed view of config.SETTINGS. Validated on first call, then again only
+    when the settings dict changes (e.g. after a config hot reload).
+    """
+    global _cache
+    raw = config.SETTINGS
+    if _cache[0] is not raw:
+        _cache = (raw, {ROOT_CLASS}.from_dict(raw))
+    return _cache[1]
+'''
+
+
+@dataclass
+class ModelField:
+    name: str        # Python attribute
+    key: object      # Key in config.yaml
+    annotation: str
+    build: str       # Expression over `data` and `path`
+
+
+@dataclass
+class ModelClass:
+    name: str
+    yaml_path: str
+    fields: list[ModelField]
+
+
+def _literal(key) -> str:
+    """Key as a Python literal (double-quoted strings, like the templates)."""
+    return json.dumps(key) if isinstance(key, str) else repr(key)
+
+
+def _class_name(key: str) -> str:
+    name = "".join(part[:1].upper() + part[1:] for part in re.split(r"[^0-9a-zA-Z]+", key) if part)
+    if not name or name[0].isdigit():
+        name = f"Section{name}"
+    return name
+
+
+def _field_name(key: str, used: set[str]) -> str:
+    name = re.sub(r"\W", "_", key) or "key"
+    if name[0].isdigit():
+        name = f"key_{name}"
+    if keyword.iskeyword(name) or name == "from_dict":
+        name = f"{name}_"
+    base, n = name, 2
+    while name in used:
+        name, n = f"{base}_{n}", n + 1
+    used.add(name)
+    return name
+
+
+class ModelBuilder:
+    """Collects the dataclasses for one config.yaml (children before parents)."""
+
+    def __init__(self):
+        self.classes: list[ModelClass] = []
+        self.names = set(RESERVED_NAMES)
+
+    def _unique_class(self, key: str, parent: str) -> str:
+        name = _class_name(key)
+        if name in self.names:
+            name = f"{parent}{name}" if parent != ROOT_CLASS else name
+        base, n = name, 2
+        while name in self.names:
+            name, n = f"{base}{n}", n + 1
+        self.names.add(name)
+        return name
+
+    def add_class(self, mapping: dict, name: str, yaml_path: str = "") -> str:
+        self.names.add(name)
+        used: set[str] = set()
+        fields = []
+        for key, value in mapping.items():
+            attr = _field_name(str(key), used)
+            annotation, build = self._field(key, value, name, yaml_path)
+            fields.append(ModelField(attr, key, annotation, build))
+        self.classes.append(ModelClass(name, yaml_path, fields))
+        return name
+
+    def _field(self, key, value, parent: str, yaml_path: str) -> tuple[str, str]:
+        literal = _literal(key)
+        get = f"_get(data, {literal}, path"
+        if isinstance(value, dict) and value:
+            child_path = f"{yaml_path}.{key}" if yaml_path else str(key)
+            child = self.add_class(value, self._unique_class(str(key), parent), child_path)
+            return child, f"{child}.from_dict({get}, dict), _join(path, {literal}))"
+        if isinstance(value, dict):
+            return "Mapping[str, Any]", f"MappingProxyType(dict({get}, dict)))"
+        if isinstance(value, list):
+            item_types = {type(item) for item in value}
+            if len(item_types) == 1 and (item_type := item_types.pop()) in SCALAR_TYPES:
+                type_name = SCALAR_TYPES[item_type]
+                return f"tuple[{type_name}, ...]", f"_items({get}, list), _join(path, {literal}), {type_name})"
+            return "tuple[Any, ...]", f"tuple({get}, list))"
+        if type(value) is float:
+            return "float", f"float({get}, int, float))"
+        if type(value) in SCALAR_TYPES:
+            type_name = SCALAR_TYPES[type(value)]
+            return type_name, f"{get}, {type_name})"
+        return "Any", f"{get})"
+
+
+def _render_class(cls: ModelClass) -> str:
+    where = f"`{cls.yaml_path}` in config.yaml" if cls.yaml_path else "config.yaml"
+    lines = [
+        "",
+        "",
+        "@dataclass(frozen=True, slots=True)",
+        f"class {cls.name}:",
+        f'    """{where}"""',
+    ]
+    lines += [f"    {field.name}: {field.annotation}" for field in cls.fields]
+    lines += [
+        "",
+        "    @classmethod",
+        f'    def from_dict(cls, data: Mapping[str, Any], path: str = "") -> "{cls.name}":',
+    ]
+    if cls.fields:
+        lines.append("        return cls(")
+        lines += [f"            {field.name}={field.build}," for field in cls.fields]
+        lines.append("        )")
+    else:
+        lines.append("        return cls()")
+    return "\n".join(lines)
+
+
+def render_settings_model(settings: dict, package_name: str) -> str:
+    """Source of settings_model.py for the parsed config.yaml `settings`."""
+    builder = ModelBuilder()
+    builder.add_class(settings or {}, ROOT_CLASS)
+    body = "\n".join(_render_class(cls) for cls in builder.classes)
+    return HEADER.format(package_name=package_name) + body + "\n" + FOOTER
+
+
+def settings_model_source(pkg_root: Path, package_name: str) -> str:
+    """Render settings_model.py from the config.yaml in pkg_root."""
+    import yaml
+
+    config_path = Path(pkg_root) / CONFIG_FILENAME
+    with open(config_path, "r") as f, span("yaml.parse", "parse", path=config_path):
+        settings = yaml.safe_load(f) or {}
+    if not isinstance(settings, dict):
+        raise TypeError(f"{config_path} must contain a mapping")
+    return render_settings_model(settings, package_name)
+
+
+def write_settings_model(pkg_root: Path, package_name: str) -> bool:
+    """(Re)write pkg_root/settings_model.py; returns False when already up to date."""
+    target = Path(pkg_root) / SETTINGS_MODEL_FILENAME
+    content = settings_model_source(pkg_root, package_name)
+    if target.exists() and target.read_text() == content:
+        return False
+    atomic_write_text(target, content)
+    return True
@@ -0,0 +1,84 @@
+"""
+ViperX Stats - Operation counts of a command (`viperx --stats`)
+
+Wall-clock timings are noisy on shared runners; operation counts are not.
+This instrumentation backend (see viperx.instrumentation) counts:
+- Subprocesses (`uv`, `git`): spans of category "subprocess"
+- TOML / YAML parses: `toml.parse` / `yaml.parse` spans
+- File writes, unlinks and directory scans: `viperx.fs.*` counters
+
+Tests use `collect_stats()` to assert deterministic upper bounds
+(e.g. "one pyproject.toml parse per apply").
+"""
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any
+
+from viperx import instrumentation
+from viperx.instrumentation import Instrument
+
+# Summary rows: label -> how to read it from the collector
+STAT_FIELDS = {
+    "subprocesses": lambda s: s.categories["subprocess"],
+    "toml_parses": lambda s: s.spans["toml.parse"],
+    "yaml_parses": lambda s: s.spans["yaml.parse"],
+    "file_writes": lambda s: s.counters["viperx.fs.writes"],
+    "unlinks": lambda s: s.counters["viperx.fs.unlinks"],
+    "dir_scans": lambda s: s.counters["viperx.fs.scans"],
+    "templates_rendered": lambda s: s.counters["viperx.templates.rendered"],
+}
+
+
+class OperationStats(Instrument):
+    """Counts finished spans (by name and category) and counters."""
+
+    def __init__(self):
+        self.spans: Counter = Counter()
+        self.categories: Counter = Counter()
+        self.counters: Counter = Counter()
+
+    def start_span(self, name: str, category: str, attributes: dict) -> Any:
+        return (name, category)
+
+    def end_span(self, handle: Any):
+        name, category = handle
+        self.spans[name] += 1
+        self.categories[category] += 1
+
+    def add(self, name: str, value: float, attributes: dict):
+        self.counters[name] += value
+
+    def summary(self) -> dict:
+        return {label: int(read(self)) for label, read in STAT_FIELDS.items()}
+
+    def subprocesses(self) -> dict:
+        """Subprocess count per span name (e.g. 'subprocess: uv init')."""
+        return {
+            name.removeprefix("subprocess: "): n
+            for name, n in sorted(self.spans.items())
+            if name.startswith("subprocess: ")
+        }
+
+
+@contextmanager
+def collect_stats():
+    """Count operations performed inside the block."""
+    stats = instrumentation.register(OperationStats())
+    try:
+        yield stats
+    finally:
+        instrumentation.unregister(stats)
+
+
+def print_stats(stats: OperationStats, console):
+    """Print the operation counts as a rich table."""
+    from rich.table import Table
+
+    table = Table(title="🔢 Operation Stats", border_style="blue")
+    table.add_column("Operation", style="cyan")
+    table.add_column("Count", justify="right")
+    for label, value in stats.summary().items():
+        table.add_row(label.replace("_", " "), str(value))
+    for name, n in stats.subprocesses().items():
+        table.add_row(f"  [dim]{name}[/dim]", f"[dim]{n}[/dim]")
+    console.print(table)
@@ -1,9 +1,18 @@
+from datetime import datetime
 from pathlib import Path
+from typing import Optional
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from viperx.constants import TEMPLATES_DIR, USER_TEMPLATES_DIR
+from viperx.constants import TEMPLATES_DIR, USER_TEMPLATES_DIR, TEMPLATE_PACKS_DIR
+from viperx.instrumentation import count, span, traced
+import hashlib
+import io
+import json
+import os
+import re
 import shutil
+import tarfile
 import tempfile
 import subprocess
 
@@ -18,6 +27,7 @@ class TemplateManager:
     def __init__(self):
         self.user_dir = USER_TEMPLATES_DIR
         self.internal_dir = TEMPLATES_DIR
+        self.packs_dir = TEMPLATE_PACKS_DIR
 
     def list_templates(self):
         """Show available templates and their source (User vs System)."""
@@ -47,6 +57,7 @@ class TemplateManager:
         console.print(table)
         console.print(f"\n[dim]User templates location: {self.user_dir}[/dim]")
 
+    @traced("TemplateManager.eject_templates")
     def eject_templates(self, force: bool = False):
         """Copy all internal templates to user directory."""
         if not self.user_dir.exists():
@@ -66,43 +77,196 @@ class TemplateManager:
             
         console.print(Panel("✅ Templates Ejected! You can now edit them freely.", border_style="green"))
 
-    def add_template_pack(self, url: str):
+    # =========================================================================
+    # Template Packs (content-addressed cache)
+    # =========================================================================
+    #
+    # ~/.cache/viperx/template-packs/
+    #   index.json                   installed packs: url -> {refs, commit, files}
+    #   repos/<url-key>/             bare git repo, updated with `git fetch`
+    #   packs/<url-key>/<commit>/    validated .j2 files of that exact commit
+    #
+    # A pack is keyed by (repo URL, resolved commit). Re-installing a commit
+    # that is already cached needs no network and no git at all.
+
+    @traced("TemplateManager.add_template_pack")
+    def add_template_pack(self, url: str, ref: Optional[str] = None, offline: bool = False):
         """
-        Download templates from a git repository.
-        Strategies:
-        1. Clone to temp dir.
-        2. Find all .j2 files.
-        3. Copy them to USER_TEMPLATES_DIR (flattened).
+        Install templates from a git repository, through the pack cache.
+        Steps:
+        1. Resolve `ref` (branch, tag or commit; default: remote HEAD) to a commit,
+           with an incremental `git fetch` into the cached bare repo.
+        2. Extract & compile every .j2 of that commit once (content-addressed).
+        3. Copy them to USER_TEMPLATES_DIR (flattened), skipping unchanged files.
         """
-        console.print(f"[blue]Fetching templates from {url}...[/blue]")
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            try:
-                subprocess.run(
-                    ["git", "clone", "--depth", "1", url, temp_dir],
-                    check=True,
-                    capture_output=True
-                )
-            except subprocess.CalledProcessError:
-                console.print(f"[bold red]Error:[/bold red] Failed to clone {url}")
-                return
+        url = self._normalize_pack_url(url)
+        key = self._pack_key(url)
+        ref_name = ref or "HEAD"
+        index = self._load_pack_index()
 
-            # Find .j2 files
-            temp_path = Path(temp_dir)
-            j2_files = list(temp_path.rglob("*.j2"))
-            
-            if not j2_files:
-                console.print("[yellow]No .j2 templates found in this repository.[/yellow]")
+        console.print(f"[blue]Fetching templates from {url} ({ref_name})...[/blue]")
+
+        try:
+            commit = self._resolve_pack_commit(url, key, ref_name, offline, index)
+            if commit is None:
                 return
-                
-            if not self.user_dir.exists():
-                self.user_dir.mkdir(parents=True, exist_ok=True)
-
-            count = 0
-            for j2 in j2_files:
-                target = self.user_dir / j2.name
-                shutil.copy2(j2, target)
-                console.print(f"Installed [cyan]{j2.name}[/cyan]")
-                count += 1
-                
-            console.print(f"[bold green]Successfully installed {count} templates![/bold green]")
+            pack_dir = self._materialize_pack(key, commit)
+        except subprocess.CalledProcessError as e:
+            detail = (e.stderr or b"").decode(errors="replace").strip()
+            console.print(f"[bold red]Error:[/bold red] Failed to fetch {url} ({ref_name})")
+            if detail:
+                console.print(f"[dim]{detail}[/dim]")
+            return
+        if pack_dir is None:
+            return
+
+        j2_files = sorted(pack_dir.rglob("*.j2"))
+        if not j2_files:
+            console.print("[yellow]No .j2 templates found in this repository.[/yellow]")
+            return
+
+        if not self.user_dir.exists():
+            self.user_dir.mkdir(parents=True, exist_ok=True)
+
+        installed_count = 0
+        installed = {}
+        for j2 in j2_files:
+            if j2.name in installed:
+                console.print(f"[yellow]Skipped {j2.relative_to(pack_dir)} (name clash with {installed[j2.name]})[/yellow]")
+                continue
+            installed[j2.name] = j2.relative_to(pack_dir).as_posix()
+            target = self.user_dir / j2.name
+            if target.exists() and target.read_bytes() == j2.read_bytes():
+                continue
+            shutil.copy2(j2, target)
+            console.print(f"Installed [cyan]{j2.name}[/cyan]")
+            installed_count += 1
+
+        entry = index.setdefault(key, {"url": url, "refs": {}})
+        entry["refs"][ref_name] = commit
+        entry["commit"] = commit
+        entry["files"] = sorted(installed)
+        entry["installed_at"] = datetime.now().isoformat(timespec="seconds")
+        self._save_pack_index(index)
+
+        unchanged = len(installed) - installed_count
+        console.print(
+            f"[bold green]Successfully installed {installed_count} templates![/bold green] "
+            f"[dim]({commit[:12]}, {unchanged} unchanged)[/dim]"
+        )
+
+    @staticmethod
+    def _normalize_pack_url(url: str) -> str:
+        """Local directories become absolute file:// URLs so they share one cache key."""
+        if "://" not in url and Path(url).expanduser().is_dir():
+            return Path(url).expanduser().resolve().as_uri()
+        return url.rstrip("/")
+
+    @staticmethod
+    def _pack_key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+    def _load_pack_index(self) -> dict:
+        index_path = self.packs_dir / "index.json"
+        if not index_path.exists():
+            return {}
+        try:
+            return json.loads(index_path.read_text())
+        except json.JSONDecodeError:
+            return {}
+
+    def _save_pack_index(self, index: dict):
+        from viperx.utils import atomic_write_text
+        self.packs_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.packs_dir / "index.json", json.dumps(index, indent=2))
+
+    @staticmethod
+    def _git(*args: str) -> bytes:
+        with span(f"subprocess: git {args[0]}", "subprocess", args=" ".join(args)):
+            return subprocess.run(["git", *args], check=True, capture_output=True).stdout
+
+    def _resolve_pack_commit(self, url: str, key: str, ref_name: str, offline: bool, index: dict) -> Optional[str]:
+        """Resolve a ref to a commit, fetching only what is missing."""
+        is_commit = re.fullmatch(r"[0-9a-f]{40}", ref_name) is not None
+        repo_dir = self.packs_dir / "repos" / key
+
+        # Commits are immutable: a cached pack or object is always valid
+        if is_commit and (self.packs_dir / "packs" / key / ref_name).exists():
+            return ref_name
+        if is_commit and repo_dir.exists() and self._has_commit(repo_dir, ref_name):
+            return ref_name
+
+        if offline:
+            pinned = index.get(key, {}).get("refs", {}).get(ref_name)
+            if pinned is None:
+                console.print(f"[bold red]Error:[/bold red] {url} ({ref_name}) is not in the cache. Run once without --offline.")
+            return pinned
+
+        if not repo_dir.exists():
+            repo_dir.parent.mkdir(parents=True, exist_ok=True)
+            self._git("init", "--bare", "--quiet", str(repo_dir))
+        # Shallow & incremental: only objects we do not have yet are transferred
+        self._git("-C", str(repo_dir), "fetch", "--depth", "1", "--quiet", url, ref_name)
+        commit = self._git("-C", str(repo_dir), "rev-parse", "FETCH_HEAD^{commit}").decode().strip()
+        # Keep a ref so `git gc` never prunes an installed commit
+        self._git("-C", str(repo_dir), "update-ref", f"refs/viperx/{commit}", commit)
+        return commit
+
+    def _has_commit(self, repo_dir: Path, commit: str) -> bool:
+        try:
+            self._git("-C", str(repo_dir), "cat-file", "-e", f"{commit}^{{commit}}")
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def _materialize_pack(self, key: str, commit: str) -> Optional[Path]:
+        """
+        Extract and validate the .j2 files of a commit into the pack cache.
+        Templates that fail to compile abort the install (nothing is cached).
+        """
+        from jinja2 import Environment, TemplateSyntaxError
+
+        pack_dir = self.packs_dir / "packs" / key / commit
+        if pack_dir.exists():
+            count("viperx.template_packs.cache", result="hit")
+            return pack_dir
+        count("viperx.template_packs.cache", result="miss")
+
+        archive = self._git("-C", str(self.packs_dir / "repos" / key), "archive", "--format=tar", commit)
+        pack_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=pack_dir.parent, prefix=f".{commit[:12]}."))
+        env = Environment()
+        errors = []
+        try:
+            with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+                for member in tar.getmembers():
+                    rel = Path(member.name)
+                    if not member.isfile() or rel.suffix != ".j2":
+                        continue
+                    if rel.is_absolute() or ".." in rel.parts:
+                        continue
+                    try:
+                        source = tar.extractfile(member).read().decode()
+                        env.parse(source)
+                    except UnicodeDecodeError:
+                        errors.append(f"{member.name}: not UTF-8")
+                        continue
+                    except TemplateSyntaxError as e:
+                        errors.append(f"{member.name}:{e.lineno}: {e.message}")
+                        continue
+                    target = staging / rel
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_text(source)
+
+            if errors:
+                console.print("[bold red]Error:[/bold red] Invalid templates in pack (nothing installed):")
+                for err in errors:
+                    console.print(f"  [red]{err}[/red]")
+                shutil.rmtree(staging)
+                return None
+
+            os.replace(staging, pack_dir)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return pack_dir
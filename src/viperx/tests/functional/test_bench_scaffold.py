@@ -0,0 +1,136 @@
+"""
+Tests for the benchmark scaffold (use_bench / --with-bench):
+- benchmarks/ per package, pytest-benchmark in the dev group, tests' testpaths untouched
+- Enabling use_bench later hydrates benchmarks/ and the dev dependency
+- Scanner detection, `package add --with-bench`
+- Generated run config: baseline comparison and memory budget fixture
+  (needs pytest-benchmark)
+"""
+
+import os
+import subprocess
+import sys
+import tomllib
+
+import pytest
+import yaml
+
+from viperx.main import app
+
+CONFIG = """
+project:
+  name: "benchy"
+settings:
+  use_bench: true
+workspace:
+  packages:
+    - name: "worker"
+      use_bench: false
+    - name: "api"
+"""
+
+
+def apply(runner):
+    result = runner.invoke(app, ["config", "-c", "viperx.yaml"])
+    assert result.exit_code == 0, result.stdout
+    return result
+
+
+@pytest.fixture
+def project(runner, temp_workspace, mock_git_config, monkeypatch):
+    monkeypatch.setenv("VIPERX_UV", "fake")
+    (temp_workspace / "viperx.yaml").write_text(CONFIG)
+    apply(runner)
+    return temp_workspace / "benchy"
+
+
+def dev_group(project):
+    return tomllib.loads((project / "pyproject.toml").read_text())["dependency-groups"]["dev"]
+
+
+def test_scaffold(project):
+    bench = project / "src" / "benchy" / "benchmarks"
+    assert sorted(p.name for p in bench.iterdir()) == ["__init__.py", "bench_core.py", "conftest.py", "pytest.ini"]
+    assert "from benchy.main import main" in (bench / "bench_core.py").read_text()
+    assert "python_files = bench_*.py" in (bench / "pytest.ini").read_text()
+
+    # Inherited by api, disabled for worker
+    assert (project / "src" / "api" / "benchmarks" / "bench_core.py").exists()
+    assert not (project / "src" / "worker" / "benchmarks").exists()
+
+    assert "pytest-benchmark>=5.1.0" in dev_group(project)
+    pyproject = tomllib.loads((project / "pyproject.toml").read_text())
+    assert not any("benchmarks" in p for p in pyproject["tool"]["pytest"]["ini_options"]["testpaths"])
+
+
+def test_enable_later(runner, project):
+    os.chdir(project)
+    config = yaml.safe_load((project / "viperx.yaml").read_text())
+    config["workspace"]["packages"][0]["use_bench"] = True
+    (project / "viperx.yaml").write_text(yaml.safe_dump(config))
+
+    result = apply(runner)
+    assert "Enabled use_bench" in result.stdout
+    assert (project / "src" / "worker" / "benchmarks" / "bench_core.py").exists()
+    assert "from worker.main import main" in (project / "src" / "worker" / "benchmarks" / "bench_core.py").read_text()
+    assert dev_group(project).count("pytest-benchmark>=5.1.0") == 1
+
+
+def test_disabled_with_benchmarks_is_a_conflict(runner, project):
+    os.chdir(project)
+    config = yaml.safe_load((project / "viperx.yaml").read_text())
+    config["workspace"]["packages"][1]["use_bench"] = False
+    (project / "viperx.yaml").write_text(yaml.safe_dump(config))
+
+    result = apply(runner)
+    assert "use_bench=False but benchmarks exists" in result.stdout
+    assert (project / "src" / "api" / "benchmarks").exists()
+
+
+def test_scanner_and_package_add(runner, project):
+    from viperx.config_scanner import ConfigScanner
+
+    packages = {p["name"]: p for p in ConfigScanner(project, explain=False).scan()["workspace"]["packages"]}
+    assert packages["api"]["use_bench"] is True
+    assert "use_bench" not in packages["worker"]
+
+    os.chdir(project)
+    (project / "pyproject.toml").write_text(
+        (project / "pyproject.toml").read_text().replace('    "pytest-benchmark>=5.1.0",\n', "")
+    )
+    result = runner.invoke(app, ["package", "add", "-n", "extra", "--with-bench", "--no-env"])
+    assert result.exit_code == 0, result.stdout
+    assert (project / "src" / "extra" / "benchmarks" / "conftest.py").exists()
+    assert "pytest-benchmark>=5.1.0" in dev_group(project)
+
+
+def run_benchmarks(project, *args):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(project / "src"), *sys.path])}
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "src/benchy/benchmarks", *args],
+        cwd=project, env=env, capture_output=True, text=True, check=False,
+    )
+
+
+def test_generated_benchmarks_run(project):
+    pytest.importorskip("pytest_benchmark")
+    first = run_benchmarks(project, "--benchmark-save=baseline")
+    assert first.returncode == 0, first.stdout + first.stderr
+    assert list((project / "src" / "benchy" / "benchmarks" / ".benchmarks").glob("*/0001_baseline.json"))
+
+    # Compared with the baseline (tolerance widened: timings are noisy in CI)
+    second = run_benchmarks(project, "--benchmark-compare-fail=median:1000%")
+    assert second.returncode == 0, second.stdout + second.stderr
+    assert "Comparing against benchmarks from" in second.stdout + second.stderr
+
+
+def test_memory_budget_fixture(project):
+    pytest.importorskip("pytest_benchmark")
+    (project / "src" / "benchy" / "benchmarks" / "bench_alloc.py").write_text(
+        "def test_over_budget(memory_budget):\n"
+        "    with memory_budget(mib=1):\n"
+        "        data = bytearray(8 * 2**20)\n"
+    )
+    result = run_benchmarks(project, "-k", "budget")
+    assert result.returncode == 1
+    assert "exceeds the budget of 1 MiB" in result.stdout
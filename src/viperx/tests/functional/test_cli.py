@@ -107,3 +107,24 @@ def test_init_imperative_dl_pytorch(runner, temp_workspace, mock_git_config, moc
     # PyTorch dependencies
     assert "torch>=" in pyproject
     assert "notebooks" in [d.name for d in root.iterdir() if d.is_dir()]
+
+def test_cli_profile_writes_trace(runner, temp_workspace, mock_git_config, mock_builder_check):
+    """
+    --profile records apply phases, renders, subprocesses and parses as a Chrome trace.
+    """
+    import json
+    (temp_workspace / "viperx.yaml").write_text(
+        'project:\n  name: "traced"\nsettings:\n  type: "classic"\nworkspace:\n  packages: []\n'
+    )
+    trace = temp_workspace / "trace.json"
+    result = runner.invoke(app, ["--profile", str(trace), "config", "-c", "viperx.yaml"])
+    assert result.exit_code == 0, result.stdout
+
+    names = {e["name"] for e in json.loads(trace.read_text())["traceEvents"]}
+    assert "ConfigEngine.apply" in names
+    assert "ConfigEngine.apply: root project" in names
+    assert "render: pyproject.toml.j2" in names
+    assert "subprocess: uv init" in names
+    assert "yaml.parse" in names
+    # Summary goes to stderr
+    assert "Profile (top 10" in result.stderr
@@ -0,0 +1,496 @@
+"""
+Tests for the generated data_loader.py (ML/DL projects):
+- Rendered module compiles and uses the pooled, resumable downloader
+- Downloads against a local HTTP server: .part resume with Range / If-Range
+  (validators from the cache entry or a local '.part.json'), atomic rename,
+  fallback when Range is ignored or no validator is known
+- Concurrent download_many / prefetch with per-host limits
+- Global Cache: URL-keyed entries, conditional revalidation, sha256 checks,
+  LRU eviction and the list/prune/verify CLI
+- Parsed-frame cache behind load_csv (keyed by source version and kwargs)
+- iter_csv chunks (pandas and pyarrow engines), config.yaml read hints
+- Single-flight cache entry locks (threads and processes), stale locks,
+  memoized project root
+- optimize_memory: downcasts, categoricals, notebooks wired to it
+(Download tests need the generated project's runtime deps: pandas, requests, tqdm)
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import yaml
+
+from viperx.main import app
+
+ML_CONFIG = """
+project:
+  name: "loader_check"
+settings:
+  type: "ml"
+"""
+
+BODY = os.urandom(300_000)
+CSV = b"a,b\n1,x\n2,y\n3,z\n"
+
+
+@pytest.fixture
+def generated(runner, temp_workspace, mock_git_config, monkeypatch):
+    """An ML project generated offline; returns the package directory."""
+    monkeypatch.setenv("VIPERX_UV", "fake")
+    (temp_workspace / "viperx.yaml").write_text(ML_CONFIG)
+    result = runner.invoke(app, ["config", "-c", "viperx.yaml"])
+    assert result.exit_code == 0, result.stdout
+    return temp_workspace / "loader_check" / "src" / "loader_check"
+
+
+@pytest.fixture
+def data_loader(generated, tmp_path, monkeypatch):
+    """The generated data_loader module, caching into tmp_path."""
+    for dep in ("pandas", "requests", "tqdm"):
+        pytest.importorskip(dep)
+    monkeypatch.syspath_prepend(str(generated.parent))
+    module = importlib.import_module("loader_check.data_loader")
+    monkeypatch.setattr(module, "get_cache_dir", lambda local=False: tmp_path)
+    yield module
+    for name in [m for m in sys.modules if m.startswith("loader_check")]:
+        del sys.modules[name]
+
+
+@pytest.fixture
+def server():
+    """
+    HTTP server for BODY, honouring Range except on paths ending in 'norange'.
+    Paths ending in '.csv' serve CSV.
+    Paths containing 'slow' take 0.2s; 'missing' is a 404; 'cut' drops the
+    connection halfway through a full (non-Range) response. Serves ETag "v1"
+    (304 on a matching If-None-Match).
+    """
+    requests_seen = []
+    headers_seen = []
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            requests_seen.append(self.headers.get("Range"))
+            headers_seen.append(dict(self.headers))
+            body = CSV if self.path.endswith(".csv") else BODY
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            if "missing" in self.path:
+                self.send_error(404)
+                return
+            if "slow" in self.path:
+                with lock:
+                    in_flight["now"] += 1
+                    in_flight["max"] = max(in_flight["max"], in_flight["now"])
+                time.sleep(0.2)
+                with lock:
+                    in_flight["now"] -= 1
+            data = body
+            rng = self.headers.get("Range")
+            if rng and not self.path.endswith("norange"):
+                start = int(rng.removeprefix("bytes=").rstrip("-"))
+                if start >= len(body):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(body)}")
+                    self.end_headers()
+                    return
+                data = body[start:]
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            if "cut" in self.path and not rng:
+                self.wfile.write(data[:len(data) // 2])
+                self.close_connection = True
+                return
+            self.wfile.write(data)
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield SimpleNamespace(
+        url=f"http://127.0.0.1:{httpd.server_port}", seen=requests_seen, headers=headers_seen, in_flight=in_flight,
+    )
+    httpd.shutdown()
+
+
+def test_data_loader_content(generated):
+    source = (generated / "data_loader.py").read_text()
+    compile(source, "data_loader.py", "exec")
+    assert "requests.Session()" in source
+    assert '"Range"' in source
+    assert ".part" in source
+    assert "os.replace(part_path, target_path)" in source
+    assert "def prefetch(" in source
+
+    config = yaml.safe_load((generated / "config.yaml").read_text())
+    assert config["data_read_options"]["iris"]["dtype"] == {"species": "category"}
+    assert config["data_cache"]["max_size_gb"] > 0
+
+    notebook = generated.parents[1] / "notebooks" / "Base_General.ipynb"
+    cells = json.loads(notebook.read_text())["cells"]
+    assert any("prefetch()" in "".join(cell["source"]) for cell in cells)
+    assert any("optimize_memory(load_csv('iris'))" in "".join(cell["source"]) for cell in cells)
+
+    kaggle = json.loads((generated.parents[1] / "notebooks" / "Base_Kaggle.ipynb").read_text())["cells"]
+    assert any("optimize_memory(pd.read_csv(" in "".join(cell["source"]) for cell in kaggle)
+
+
+def entry_dir(data_loader, url):
+    path = data_loader._entry_dir(url)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def test_download_resumes_part_file(data_loader, server, tmp_path):
+    base, seen = server.url, server.seen
+    url = f"{base}/file.bin"
+    entry = entry_dir(data_loader, url)
+    (entry / "file.bin.part").write_bytes(BODY[:100_000])
+    data_loader._write_entry(entry, {"url": url, "filename": "file.bin", "partial": {"etag": '"v1"'}})
+
+    path = data_loader.download_file(url)
+
+    assert path == data_loader._entry_dir(url) / "file.bin"
+    assert path.read_bytes() == BODY
+    assert not path.with_name("file.bin.part").exists()
+    assert seen == ["bytes=100000-"]
+    assert server.headers[0]["If-Range"] == '"v1"'
+
+    # Cached: no request
+    data_loader.download_file(f"{base}/file.bin")
+    assert len(seen) == 1
+
+
+def test_download_complete_part_is_renamed(data_loader, server, tmp_path):
+    base = server.url
+    entry = entry_dir(data_loader, f"{base}/done.bin")
+    (entry / "done.bin.part").write_bytes(BODY)
+    data_loader._write_entry(entry, {"url": f"{base}/done.bin", "filename": "done.bin", "partial": {"etag": '"v1"'}})
+    assert data_loader.download_file(f"{base}/done.bin").read_bytes() == BODY
+
+
+def test_download_restarts_when_range_ignored(data_loader, server, tmp_path):
+    base, seen = server.url, server.seen
+    (tmp_path / "norange.part").write_bytes(b"stale bytes")
+    (tmp_path / "norange.part.json").write_text(json.dumps({"etag": '"v1"'}))
+
+    assert data_loader.download_file(f"{base}/norange", local=True).read_bytes() == BODY
+    assert seen == ["bytes=11-", None]
+    assert not (tmp_path / "norange.part.json").exists()
+
+
+def test_local_resume_uses_recorded_validators(data_loader, server, tmp_path):
+    base, seen = server.url, server.seen
+    with pytest.raises(data_loader.requests.RequestException):
+        data_loader.download_file(f"{base}/cut.bin", local=True, chunk_size=16_384)
+    received = (tmp_path / "cut.bin.part").stat().st_size
+    assert 0 < received < len(BODY)
+    assert json.loads((tmp_path / "cut.bin.part.json").read_text())["etag"] == '"v1"'
+
+    assert data_loader.download_file(f"{base}/cut.bin", local=True).read_bytes() == BODY
+    assert seen[1] == f"bytes={received}-"
+    assert server.headers[1]["If-Range"] == '"v1"'
+    assert not list(tmp_path.glob("cut.bin.part*"))
+
+
+def test_part_without_validators_is_discarded(data_loader, server, tmp_path):
+    (tmp_path / "plain.bin.part").write_bytes(b"unknown origin")
+
+    assert data_loader.download_file(f"{server.url}/plain.bin", local=True).read_bytes() == BODY
+    assert server.seen == [None]
+
+
+def test_failed_download_leaves_no_target(data_loader, tmp_path):
+    with pytest.raises(data_loader.requests.RequestException):
+        data_loader.download_file("http://127.0.0.1:9/missing.bin", timeout=1)
+    assert not (tmp_path / "missing.bin").exists()
+
+
+def test_download_many_limits_per_host(data_loader, server):
+    base = server.url
+    urls = [f"{base}/slow_{i}.bin" for i in range(6)]
+
+    start = time.perf_counter()
+    paths = data_loader.download_many(urls, max_workers=6, max_per_host=2)
+    elapsed = time.perf_counter() - start
+
+    assert sorted(paths) == sorted(urls)
+    assert all(path.read_bytes() == BODY for path in paths.values())
+    assert server.in_flight["max"] == 2
+    # 3 waves of 2 instead of 6 serial requests
+    assert elapsed < 6 * 0.2
+
+
+def test_download_many_reports_all_failures(data_loader, server, tmp_path):
+    base = server.url
+    with pytest.raises(RuntimeError, match="1 of 2 downloads failed: bad"):
+        data_loader.download_many({"good": f"{base}/good.bin", "bad": f"{base}/missing.bin"})
+    assert data_loader.download_file(f"{base}/good.bin").read_bytes() == BODY
+    assert len(data_loader.cache_entries()) == 1
+
+
+def test_prefetch_config_keys(data_loader, server, tmp_path, monkeypatch):
+    base = server.url
+    urls = {"iris": f"{base}/iris.csv", "titanic": f"{base}/titanic.csv", "local": "data/x.csv"}
+    monkeypatch.setattr(data_loader, "get_config", lambda key, default=None: urls if key == "data_urls" else default)
+
+    assert data_loader.prefetch(["iris"]) == {"iris": data_loader._entry_dir(urls["iris"]) / "iris.csv"}
+    assert set(data_loader.prefetch()) == {"iris", "titanic"}
+    with pytest.raises(KeyError, match="unknown"):
+        data_loader.prefetch(["unknown"])
+
+
+def test_cache_keys_by_url_and_revalidates(data_loader, server):
+    base = server.url
+    first = data_loader.download_file(f"{base}/a/data.bin")
+    second = data_loader.download_file(f"{base}/b/data.bin")
+    assert first != second and first.name == second.name == "data.bin"
+
+    entry = data_loader._read_entry(first.parent)
+    assert entry["etag"] == '"v1"'
+    assert entry["size"] == len(BODY)
+    assert entry["sha256"] == hashlib.sha256(BODY).hexdigest()
+
+    # Fresh: served from the cache without a request
+    data_loader.download_file(f"{base}/a/data.bin")
+    assert len(server.headers) == 2
+
+    # Stale: conditional GET, 304 keeps the cached copy
+    assert data_loader.download_file(f"{base}/a/data.bin", max_age=0) == first
+    assert server.headers[-1]["If-None-Match"] == '"v1"'
+    assert first.read_bytes() == BODY
+
+
+def test_cache_checksum(data_loader, server):
+    url = f"{server.url}/file.bin"
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        data_loader.download_file(url, sha256="0" * 64)
+    assert not (data_loader._entry_dir(url) / "file.bin").exists()
+
+    path = data_loader.download_file(url, sha256=hashlib.sha256(BODY).hexdigest())
+    assert data_loader.verify_cache() == []
+
+    # A cached file that no longer matches its index is downloaded again
+    path.write_bytes(b"corrupted")
+    assert [e["url"] for e in data_loader.verify_cache()] == [url]
+    assert data_loader.download_file(url).read_bytes() == BODY
+
+
+def test_cache_lru_eviction(data_loader, server, monkeypatch):
+    max_size_gb = 2.5 * len(BODY) / 2**30
+    monkeypatch.setattr(data_loader, "get_config", lambda key, default=None: {"max_size_gb": max_size_gb} if key == "data_cache" else default)
+    urls = [f"{server.url}/{name}.bin" for name in ("a", "b", "c")]
+
+    data_loader.download_file(urls[0])
+    data_loader.download_file(urls[1])
+    data_loader.download_file(urls[0])  # a is now more recent than b
+    data_loader.download_file(urls[2])
+
+    assert [e["url"] for e in data_loader.cache_entries()] == [urls[0], urls[2]]
+
+
+def test_cache_cli(data_loader, server, capsys):
+    data_loader.download_file(f"{server.url}/file.bin")
+
+    assert data_loader.main(["list"]) == 0
+    assert "1 entries" in capsys.readouterr().out
+
+    assert data_loader.main(["prune", "--max-size-gb", "0", "--dry-run"]) == 0
+    assert "Would evict 1 entries" in capsys.readouterr().out
+    assert len(data_loader.cache_entries()) == 1
+
+    assert data_loader.main(["prune", "--older-than-days", "0"]) == 0
+    assert data_loader.cache_entries() == []
+
+
+@pytest.fixture
+def parses(data_loader, monkeypatch):
+    """Paths passed to pd.read_csv."""
+    calls = []
+    read_csv = data_loader.pd.read_csv
+
+    def counting_read_csv(path, **kwargs):
+        calls.append(path)
+        return read_csv(path, **kwargs)
+
+    monkeypatch.setattr(data_loader.pd, "read_csv", counting_read_csv)
+    return calls
+
+
+def test_load_csv_caches_parsed_frame(data_loader, server, parses):
+    url = f"{server.url}/train.csv"
+    first = data_loader.load_csv(url)
+    second = data_loader.load_csv(url)
+
+    assert len(parses) == 1
+    assert second.equals(first)
+    assert list(second["a"]) == [1, 2, 3]
+    suffix = ".parquet" if importlib.util.find_spec("pyarrow") else ".pkl"
+    # Stored in the cache entry, so evicted together with the CSV
+    assert len(list(data_loader._entry_dir(url).glob(f"frame-*{suffix}"))) == 1
+
+    # Different read_csv kwargs, or bypass: parsed again
+    assert list(data_loader.load_csv(url, usecols=["b"]).columns) == ["b"]
+    data_loader.load_csv(url, cache=False)
+    assert len(parses) == 3
+
+
+def test_load_csv_invalidates_on_source_change(data_loader, parses, tmp_path):
+    source = tmp_path / "local.csv"
+    source.write_text("a\n1\n")
+    assert list(data_loader.load_csv(str(source))["a"]) == [1]
+
+    source.write_text("a\n1\n2\n")
+    os.utime(source, ns=(0, source.stat().st_mtime_ns + 10**9))
+    assert list(data_loader.load_csv(str(source))["a"]) == [1, 2]
+    assert len(parses) == 2
+    # The frame of the old version is gone
+    assert len(list((tmp_path / "frames").glob("frame-*"))) == 1
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_iter_csv_chunks(data_loader, tmp_path, engine):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    source = tmp_path / "big.csv"
+    source.write_text("a,b,c\n" + "".join(f"{i},{i % 2},x{i}\n" for i in range(5)))
+
+    chunks = list(data_loader.iter_csv(str(source), chunksize=2, engine=engine, usecols=["a", "b"], dtype={"b": "int8"}))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert all(list(chunk.columns) == ["a", "b"] for chunk in chunks)
+    assert all(str(chunk["b"].dtype) == "int8" for chunk in chunks)
+    assert sum(chunk["a"].sum() for chunk in chunks) == 10
+
+
+def test_read_hints_from_config(data_loader, tmp_path, monkeypatch):
+    source = tmp_path / "train.csv"
+    source.write_text("a,b,c\n1,x,2\n2,y,3\n")
+    config = {
+        "data_urls": {"train": str(source)},
+        "data_read_options": {"train": {"usecols": ["a", "b"], "dtype": {"b": "category"}}},
+    }
+    monkeypatch.setattr(data_loader, "get_config", lambda key, default=None: config.get(key, default))
+
+    df = data_loader.load_csv("train")
+    assert list(df.columns) == ["a", "b"]
+    assert str(df["b"].dtype) == "category"
+
+    # Explicit kwargs win over the hints
+    assert list(data_loader.load_csv("train", usecols=["c"]).columns) == ["c"]
+    assert [len(chunk) for chunk in data_loader.iter_csv("train", chunksize=1)] == [1, 1]
+
+
+def test_concurrent_downloads_single_flight(data_loader, server):
+    url = f"{server.url}/slow_shared.bin"
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(data_loader.download_file(url))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(server.seen) == 1
+    assert len(set(results)) == 1 and results[0].read_bytes() == BODY
+    assert not (results[0].parent / ".lock").exists()
+
+
+def test_cross_process_single_flight(data_loader, server, generated, tmp_path):
+    url = f"{server.url}/slow_processes.bin"
+    script = (
+        "import sys, pathlib\n"
+        "from loader_check import data_loader\n"
+        f"data_loader.get_cache_dir = lambda local=False: pathlib.Path({str(tmp_path)!r})\n"
+        f"print(data_loader.download_file({url!r}))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(generated.parent), *sys.path])}
+    procs = [
+        subprocess.Popen([sys.executable, "-c", script], env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(3)
+    ]
+    outputs = [proc.communicate(timeout=60)[0] for proc in procs]
+
+    assert all(proc.returncode == 0 for proc in procs)
+    assert len({out.strip().splitlines()[-1] for out in outputs}) == 1
+    assert len(server.seen) == 1
+
+
+def test_stale_locks_are_broken(data_loader, server):
+    dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True, check=True)
+    url = f"{server.url}/locked.bin"
+    lock = data_loader._entry_dir(url) / ".lock"
+    lock.parent.mkdir(parents=True)
+
+    # Owner process is gone
+    lock.write_text(json.dumps({"host": socket.gethostname(), "pid": int(dead.stdout)}))
+    assert data_loader.download_file(url).read_bytes() == BODY
+
+    # Lock from another host that is no longer refreshed
+    lock.write_text(json.dumps({"host": "elsewhere", "pid": 1}))
+    old = time.time() - data_loader.LOCK_STALE_SECONDS - 1
+    os.utime(lock, (old, old))
+    assert data_loader.download_file(url, force=True).read_bytes() == BODY
+    assert not lock.exists()
+
+
+def test_project_root_is_memoized(data_loader, generated):
+    data_loader._project_root.cache_clear()
+    assert data_loader._project_root() == generated.parents[1]
+    data_loader._project_root()
+    assert data_loader._project_root.cache_info().misses == 1
+
+
+def test_optimize_memory(data_loader, capsys):
+    pd = data_loader.pd
+    n = 1000
+    df = pd.DataFrame({
+        "small": range(n),
+        "signed": [i - 500 for i in range(n)],
+        "ratio": [i / 4 for i in range(n)],
+        "precise": [1_234_567.891 + i for i in range(n)],
+        "species": ["setosa", "virginica"] * (n // 2),
+        "ids": [f"id{i}" for i in range(n)],
+        "flag": [True, False] * (n // 2),
+    })
+
+    out = data_loader.optimize_memory(df)
+
+    assert {col: str(dtype) for col, dtype in out.dtypes.items()} == {
+        "small": "uint16",
+        "signed": "int16",
+        "ratio": "float32",
+        "precise": "float64",  # Not representable in float32: kept
+        "species": "category",
+        "ids": str(df["ids"].dtype),  # All distinct: not worth a categorical
+        "flag": "bool",
+    }
+    assert (out["species"] == df["species"]).all()
+    assert (out["ratio"] == df["ratio"]).all()
+    assert str(df["small"].dtype) == "int64"  # Input untouched
+    shrunk = ["small", "signed", "ratio", "species"]
+    assert out[shrunk].memory_usage(deep=True).sum() * 3 < df[shrunk].memory_usage(deep=True).sum()
+    assert "Memory:" in capsys.readouterr().out
+
+    assert str(data_loader.optimize_memory(df, floats=False, category_ratio=0, verbose=False)["ratio"].dtype) == "float64"
+    assert data_loader.optimize_memory(df.iloc[:0], verbose=False).empty
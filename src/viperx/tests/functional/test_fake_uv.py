@@ -0,0 +1,92 @@
+"""
+Tests for the offline uv stand-in (viperx.fake_uv):
+- `init` / `lock` / `sync` file layout (and parity with real `uv init`)
+- Invocation log (VIPERX_FAKE_UV_LOG)
+- Selection via VIPERX_UV and the `uv=` generator option
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from viperx import fake_uv
+from viperx.main import app
+from viperx.utils import resolve_uv, run_uv
+
+
+def files(root):
+    return sorted(
+        str(p.relative_to(root)) for p in root.rglob("*")
+        if p.is_file() and ".git" not in p.relative_to(root).parts
+    )
+
+
+def test_init_lock_sync_layout(temp_workspace):
+    assert fake_uv.main(["init", "--package", "--no-workspace", "my_pkg", "--name", "my-pkg"]) == 0
+    project = temp_workspace / "my_pkg"
+    assert files(project) == [
+        ".gitignore", ".python-version", "README.md", "pyproject.toml", "src/my_pkg/__init__.py",
+    ]
+    assert 'name = "my-pkg"' in (project / "pyproject.toml").read_text()
+    assert 'my-pkg = "my_pkg:main"' in (project / "pyproject.toml").read_text()
+
+    # Re-initializing fails like uv does
+    assert fake_uv.main(["init", "--package", "my_pkg"]) == 2
+
+    (project / "src").joinpath("nested").mkdir()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(project / "src" / "nested")
+        assert fake_uv.main(["sync"]) == 0
+    assert 'name = "my-pkg"' in (project / "uv.lock").read_text()
+    assert (project / ".venv" / "pyvenv.cfg").exists()
+
+
+@pytest.mark.skipif(shutil.which("uv") is None, reason="uv not installed")
+def test_init_matches_real_uv(tmp_path):
+    cmd = ["init", "--package", "--no-workspace", "my_pkg", "--name", "my-pkg"]
+    (tmp_path / "real").mkdir()
+    (tmp_path / "fake").mkdir()
+    subprocess.run(["uv", *cmd], cwd=tmp_path / "real", check=True, capture_output=True)
+    subprocess.run([sys.executable, "-m", "viperx.fake_uv", *cmd], cwd=tmp_path / "fake", check=True, capture_output=True)
+
+    assert files(tmp_path / "fake" / "my_pkg") == files(tmp_path / "real" / "my_pkg")
+
+
+def test_uv_selection(monkeypatch, tmp_path):
+    monkeypatch.delenv("VIPERX_UV", raising=False)
+    assert resolve_uv() == "uv"
+    assert resolve_uv("/opt/uv") == "/opt/uv"
+    monkeypatch.setenv("VIPERX_UV", "fake")
+    assert resolve_uv() == "fake"
+    assert resolve_uv("/opt/uv") == "/opt/uv"
+
+    # The fake runs in-process and fails like a subprocess would
+    run_uv(["init", "--package", "demo"], cwd=tmp_path, uv="fake", capture_output=True)
+    with pytest.raises(subprocess.CalledProcessError):
+        run_uv(["init", "--package", "demo"], cwd=tmp_path, uv="fake", capture_output=True)
+
+
+def test_config_apply_with_fake_uv(runner, temp_workspace, mock_git_config, monkeypatch):
+    """End-to-end apply runs offline, without uv on PATH, and logs each call."""
+    log = temp_workspace / "uv-calls.jsonl"
+    monkeypatch.setenv("VIPERX_UV", "fake")
+    monkeypatch.setenv("VIPERX_FAKE_UV_LOG", str(log))
+    monkeypatch.setattr("viperx.utils.check_builder_installed", lambda builder: False)
+    (temp_workspace / "viperx.yaml").write_text(
+        'project:\n  name: "demo"\nworkspace:\n  packages:\n    - name: "worker"\n'
+    )
+
+    result = runner.invoke(app, ["config", "-c", "viperx.yaml"])
+    assert result.exit_code == 0, result.stdout
+
+    project = temp_workspace / "demo"
+    assert (project / "src" / "demo" / "main.py").exists()
+    assert (project / "src" / "worker" / "__init__.py").exists()
+    assert "worker" in (project / "pyproject.toml").read_text()
+
+    calls = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [c["argv"][:2] for c in calls] == [["init", "--package"]] * 2
+    assert calls[0]["argv"][-3:] == ["demo", "--name", "demo"]
@@ -0,0 +1,157 @@
+"""
+Tests for fleet operations across many viperx projects:
+- Discovery with pruning (.venv, .git, node_modules)
+- Parallel migration with per-repo JSON summary
+- Consolidated dry-run diff
+- Read-only drift audit (JSON/CSV)
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from viperx.fleet import (
+    audit_fleet,
+    consolidated_diff,
+    discover_projects,
+    migrate_fleet,
+)
+from viperx.main import app
+
+
+def make_repo(path: Path, version: str = "1.0.0"):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "viperx.yaml").write_text(f'viperx_version: "{version}"\nproject:\n  name: "{path.name}"\n')
+
+
+@pytest.fixture
+def fleet(tmp_path):
+    root = tmp_path / "fleet"
+    make_repo(root / "team-a" / "svc-one")
+    make_repo(root / "team-a" / "svc-two")
+    make_repo(root / "team-b" / "lib", version="1.0.2")
+    # Must be pruned
+    make_repo(root / "team-a" / "svc-one" / ".venv" / "lib" / "vendored")
+    make_repo(root / "node_modules" / "pkg")
+    make_repo(root / ".git" / "hidden")
+    return root
+
+
+def test_discover_prunes_heavy_dirs(fleet):
+    found = [p.relative_to(fleet).as_posix() for p in discover_projects(fleet)]
+    assert found == ["team-a/svc-one", "team-a/svc-two", "team-b/lib"]
+
+
+def test_migrate_fleet_parallel(fleet):
+    summaries = migrate_fleet(fleet, "1.7.0", jobs=2)
+
+    by_project = {s["project"]: s for s in summaries}
+    assert set(by_project) == {"team-a/svc-one", "team-a/svc-two", "team-b/lib"}
+    assert by_project["team-a/svc-one"]["status"] == "ok"
+    assert by_project["team-a/svc-one"]["to_version"] == "1.0.2"
+    assert by_project["team-b/lib"]["status"] == "up-to-date"
+    assert 'viperx_version: "1.0.2"' in (fleet / "team-a" / "svc-two" / "viperx.yaml").read_text()
+    # Summary is JSON-serializable
+    json.dumps(summaries)
+
+
+def test_migrate_fleet_dry_run_consolidated_diff(fleet):
+    summaries = migrate_fleet(fleet, "1.7.0", dry_run=True, jobs=1)
+    patch = consolidated_diff(summaries)
+
+    assert "--- a/team-a/svc-one/viperx.yaml" in patch
+    assert "+++ b/team-a/svc-two/viperx.yaml" in patch
+    assert "team-b/lib" not in patch
+    # Nothing written
+    assert 'viperx_version: "1.0.0"' in (fleet / "team-a" / "svc-one" / "viperx.yaml").read_text()
+
+
+def test_migrate_fleet_reports_errors(fleet, mocker):
+    import viperx.migrations
+    real = viperx.migrations.migrate_project
+
+    def flaky(project_root, *args, **kwargs):
+        if project_root.name == "svc-two":
+            raise RuntimeError("corrupt project")
+        return real(project_root, *args, **kwargs)
+
+    mocker.patch("viperx.migrations.migrate_project", side_effect=flaky)
+    summaries = migrate_fleet(fleet, "1.7.0", jobs=1)
+
+    statuses = {s["project"]: s["status"] for s in summaries}
+    assert statuses == {"team-a/svc-one": "ok", "team-a/svc-two": "error", "team-b/lib": "up-to-date"}
+    assert "corrupt project" in summaries[1]["error"]
+
+
+def test_cli_migrate_recursive_json(runner, fleet):
+    result = runner.invoke(app, ["migrate", "--recursive", "--root", str(fleet), "--json", "--dry-run", "-j", "1"])
+    assert result.exit_code == 0, result.stdout
+    summaries = json.loads(result.stdout)
+    assert [s["project"] for s in summaries] == ["team-a/svc-one", "team-a/svc-two", "team-b/lib"]
+    assert all("diff" in s for s in summaries)
+
+
+def test_cli_migrate_recursive_diff_file(runner, fleet, tmp_path):
+    out = tmp_path / "fleet.patch"
+    result = runner.invoke(app, ["migrate", "-r", "--root", str(fleet), "--dry-run", "--diff-file", str(out), "-j", "1"])
+    assert result.exit_code == 0, result.stdout
+    assert "--- a/team-a/svc-one/viperx.yaml" in out.read_text()
+
+
+def make_audited_repo(path: Path, declared_tests: bool = True, extra_pkg: bool = False, env: bool = False):
+    """A workspace with one declared package whose files may disagree with viperx.yaml."""
+    path.mkdir(parents=True)
+    (path / "pyproject.toml").write_text('[project]\nname = "demo"\n')
+    (path / "viperx.yaml").write_text(
+        'project:\n  name: "demo"\nsettings:\n  type: "classic"\n'
+        'workspace:\n  packages:\n    - name: "worker"\n'
+        f'      use_tests: {str(declared_tests).lower()}\n      use_env: false\n'
+    )
+    pkg = path / "src" / "worker"
+    pkg.mkdir(parents=True)
+    (pkg / "tests").mkdir()
+    if env:
+        (pkg / ".env").write_text("SECRET=1\n")
+    if extra_pkg:
+        (path / "src" / "rogue").mkdir()
+
+
+@pytest.fixture
+def audited_fleet(tmp_path):
+    root = tmp_path / "repos"
+    make_audited_repo(root / "clean")
+    make_audited_repo(root / "drifted", declared_tests=False, extra_pkg=True, env=True)
+    return root
+
+
+def test_audit_fleet_detects_drift_read_only(audited_fleet):
+    before = (audited_fleet / "drifted" / "viperx.yaml").read_text()
+    summaries = {s["project"]: s for s in audit_fleet(audited_fleet, jobs=2)}
+
+    assert summaries["clean"]["status"] == "in-sync"
+    drifted = summaries["drifted"]
+    assert drifted["status"] == "drift"
+    fields = {d["field"]: d["kind"] for d in drifted["drift"]}
+    assert fields["packages.worker.use_tests"] == "MISMATCH"
+    assert fields["packages.worker.use_env"] == "MISMATCH"
+    assert fields["workspace.packages"] == "ADDED"
+    # Nothing written
+    assert (audited_fleet / "drifted" / "viperx.yaml").read_text() == before
+
+
+def test_cli_audit_csv(runner, audited_fleet, tmp_path):
+    import csv
+    out = tmp_path / "audit.csv"
+    result = runner.invoke(app, ["audit", str(audited_fleet), "--format", "csv", "-o", str(out), "-j", "1"])
+    assert result.exit_code == 0, result.stdout
+
+    rows = list(csv.DictReader(out.open()))
+    assert {r["project"] for r in rows} == {"clean", "drifted"}
+    assert any(r["field"] == "workspace.packages" and "rogue" in r["detail"] for r in rows)
+
+
+def test_cli_audit_strict_json(runner, audited_fleet):
+    result = runner.invoke(app, ["audit", str(audited_fleet), "--format", "json", "--strict", "-j", "1"])
+    assert result.exit_code == 1
+    assert json.loads(result.stdout)[1]["status"] == "drift"
@@ -0,0 +1,245 @@
+"""
+Tests for the generated config.py / __init__.py:
+- Importing the package does not load config.yaml (PEP 562 lazy exports)
+- SETTINGS is parsed on first access and snapshotted in __pycache__/
+- Later processes reuse the snapshot without importing yaml
+- Editing config.yaml invalidates the snapshot
+- Opt-in hot reload: reload() / watch() swap in new settings and .env values,
+  run on_change callbacks and keep the old settings when the file is broken
+- settings_model.py (typed settings, also over snapshotted int keys) and
+  `viperx config model [--check]`
+"""
+
+import importlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from viperx.main import app
+
+CONFIG = """
+project:
+  name: "lazy_check"
+settings:
+  use_env: true
+"""
+
+
+@pytest.fixture
+def package(runner, temp_workspace, mock_git_config, monkeypatch):
+    """A classic project generated offline; returns the package directory."""
+    monkeypatch.setenv("VIPERX_UV", "fake")
+    (temp_workspace / "viperx.yaml").write_text(CONFIG)
+    result = runner.invoke(app, ["config", "-c", "viperx.yaml"])
+    assert result.exit_code == 0, result.stdout
+    return temp_workspace / "lazy_check" / "src" / "lazy_check"
+
+
+def run(package, code):
+    """Run code in a fresh interpreter with the generated package importable."""
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=package.parent, capture_output=True, text=True, check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+PROBE = """
+import json, sys
+import lazy_check
+state = {"after_import": sorted(m for m in ("yaml", "lazy_check.config") if m in sys.modules)}
+from lazy_check import SETTINGS, get_config
+state["name"] = get_config("project_name")
+state["same"] = SETTINGS is lazy_check.config.SETTINGS
+state["yaml"] = "yaml" in sys.modules
+print(json.dumps(state))
+"""
+
+
+def test_import_is_lazy_and_snapshot_reused(package):
+    snapshot = package / "__pycache__" / "config.yaml.pickle"
+    assert not snapshot.exists()
+
+    first = run(package, PROBE)
+    assert first == {"after_import": [], "name": "lazy_check", "same": True, "yaml": True}
+    assert snapshot.exists()
+
+    # Second start: settings come from the snapshot, yaml is never imported
+    second = run(package, PROBE)
+    assert second == {"after_import": [], "name": "lazy_check", "same": True, "yaml": False}
+
+
+def test_snapshot_invalidated_when_config_changes(package):
+    run(package, PROBE)
+    config = package / "config.yaml"
+    config.write_text(config.read_text().replace('"lazy_check"', '"renamed"'))
+    stat = config.stat()
+    os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    state = run(package, PROBE)
+    assert state["name"] == "renamed"
+    assert state["yaml"] is True
+    assert run(package, PROBE)["yaml"] is False
+
+
+TYPED = """
+import json, sys
+from lazy_check import SETTINGS
+state = {"keys": [[type(k).__name__, str(k)] for k in SETTINGS["class_weights"]]}
+state["weight"] = SETTINGS["class_weights"][0]
+state["flags"] = SETTINGS["flags"][True]
+state["released"] = type(SETTINGS["released"]).__name__
+state["yaml"] = "yaml" in sys.modules
+print(json.dumps(state))
+"""
+
+
+def test_snapshot_keeps_non_str_keys_and_dates(package):
+    (package / "config.yaml").write_text(
+        "project_name: lazy_check\nreleased: 2024-01-01\n"
+        "class_weights:\n  0: 1.0\n  1: 2.5\nflags:\n  true: on\n"
+    )
+    expected = {"keys": [["int", "0"], ["int", "1"]], "weight": 1.0, "flags": True, "released": "date"}
+    assert run(package, TYPED) == {**expected, "yaml": True}  # Cold: parsed
+    assert (package / "__pycache__" / "config.yaml.pickle").exists()
+    assert run(package, TYPED) == {**expected, "yaml": False}  # From the snapshot
+
+
+def test_unknown_attribute(package):
+    code = (
+        "import json, lazy_check\n"
+        "try:\n    lazy_check.missing\nexcept AttributeError as e:\n    print(json.dumps(str(e)))"
+    )
+    assert "has no attribute 'missing'" in run(package, code)
+
+
+@pytest.fixture
+def config(package, monkeypatch):
+    """The generated config module, imported in-process."""
+    monkeypatch.syspath_prepend(str(package.parent))
+    module = importlib.import_module("lazy_check.config")
+    yield module
+    module.unwatch()
+    for name in [m for m in sys.modules if m.startswith("lazy_check")]:
+        del sys.modules[name]
+
+
+def touch(path, text):
+    """Rewrite path, making sure its mtime moves even on coarse clocks."""
+    before = path.stat().st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(before + 1_000_000_000, before + 1_000_000_000))
+
+
+def test_reload_swaps_settings_and_notifies(config, package, monkeypatch):
+    monkeypatch.delenv("LAZY_TOKEN", raising=False)
+    changes = []
+    config.on_change(lambda old, new: changes.append((old["project_name"], new["project_name"])))
+
+    first = config.SETTINGS
+    assert config.reload() is False  # Nothing changed
+    assert config.SETTINGS is first
+
+    yaml_file = package / "config.yaml"
+    touch(yaml_file, yaml_file.read_text().replace('"lazy_check"', '"renamed"'))
+    touch(package / ".env", "LAZY_TOKEN=secret\n")
+    assert config.reload() is True
+    assert config.get_config("project_name") == "renamed"
+    assert first["project_name"] == "lazy_check"  # Old dict untouched
+    assert os.environ["LAZY_TOKEN"] == "secret"
+    assert changes == [("lazy_check", "renamed")]
+
+
+def test_broken_config_keeps_current_settings(config, package, caplog):
+    assert config.get_config("project_name") == "lazy_check"
+    touch(package / "config.yaml", "project_name: [unclosed\n")
+    with caplog.at_level(logging.WARNING):
+        assert config.reload() is False
+    assert config.get_config("project_name") == "lazy_check"
+    assert "Keeping current settings" in caplog.text
+
+    # Reported once, not on every poll
+    caplog.clear()
+    assert config.reload() is False
+    assert caplog.text == ""
+
+
+def test_watch_picks_up_changes(config, package):
+    seen = []
+    config.on_change(lambda old, new: seen.append(new["project_name"]))
+    config.watch(interval=0.05)
+    config.watch(interval=0.05)  # Idempotent
+    assert [t.name for t in threading.enumerate()].count("config-watch") == 1
+
+    yaml_file = package / "config.yaml"
+    touch(yaml_file, yaml_file.read_text().replace('"lazy_check"', '"watched"'))
+    deadline = time.monotonic() + 5
+    while not seen and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert seen == ["watched"]
+    assert config.get_config("project_name") == "watched"
+
+    config.unwatch()
+    touch(yaml_file, yaml_file.read_text().replace('"watched"', '"ignored"'))
+    time.sleep(0.2)
+    assert config.get_config("project_name") == "watched"
+
+
+def test_settings_model_generated_and_follows_reload(config, package):
+    from lazy_check import settings_model
+
+    settings = settings_model.get_settings()
+    assert settings.project_name == "lazy_check"
+    assert settings_model.get_settings() is settings
+
+    yaml_file = package / "config.yaml"
+    touch(yaml_file, yaml_file.read_text().replace('"lazy_check"', '"typed"'))
+    assert config.reload() is True
+    assert settings_model.get_settings().project_name == "typed"
+
+
+MODEL_PROBE = """
+import json, sys
+from lazy_check.settings_model import get_settings
+settings = get_settings()
+print(json.dumps([settings.class_weights.key_0, settings.class_weights.key_1, "yaml" in sys.modules]))
+"""
+
+
+def test_settings_model_with_int_keys(package):
+    from viperx.settings_model import write_settings_model
+
+    touch(package / "config.yaml", "project_name: lazy_check\nclass_weights:\n  0: 1.0\n  1: 2.5\n")
+    assert write_settings_model(package, "lazy_check") is True
+    assert "_get(data, 0, path" in (package / "settings_model.py").read_text()
+    assert run(package, MODEL_PROBE) == [1.0, 2.5, True]  # Cold
+    assert run(package, MODEL_PROBE) == [1.0, 2.5, False]  # Snapshot
+
+
+def test_config_model_command(runner, package, monkeypatch):
+    monkeypatch.chdir(package.parent.parent)
+    result = runner.invoke(app, ["config", "model", "--check"])
+    assert result.exit_code == 0, result.stdout
+    assert "Up to date" in result.stdout
+
+    with open(package / "config.yaml", "a") as f:
+        f.write("\nbatch_size: 32\n")
+    result = runner.invoke(app, ["config", "model", "--check"])
+    assert result.exit_code == 1
+    assert "Outdated" in result.stdout
+    assert "batch_size" not in (package / "settings_model.py").read_text()
+
+    result = runner.invoke(app, ["config", "model"])
+    assert result.exit_code == 0, result.stdout
+    assert "batch_size: int" in (package / "settings_model.py").read_text()
+
+    (package / "config.yaml").write_text("- not\n- a mapping\n")
+    result = runner.invoke(app, ["config", "model"])
+    assert result.exit_code == 1
+    assert "must contain a mapping" in result.stdout
@@ -0,0 +1,119 @@
+"""
+Tests for the generated features.py and train.py (ML projects):
+- Rendered with the config.yaml 'model' section, not for DL projects
+- Pipeline: dtype-based preprocessing, memory= cache under the project data dir
+- Cross-validation with parallel folds and a single-threaded estimator
+- joblib persistence: atomic, compressed or memory-mappable, without the cache location
+(Runtime tests need scikit-learn and the project's data_loader deps)
+"""
+
+import importlib
+import sys
+
+import pytest
+import yaml
+
+from viperx.main import app
+
+CONFIG = """
+project:
+  name: "ml_check"
+settings:
+  type: "{type}"
+"""
+
+
+def generate(runner, temp_workspace, monkeypatch, type="ml"):
+    monkeypatch.setenv("VIPERX_UV", "fake")
+    (temp_workspace / "viperx.yaml").write_text(CONFIG.format(type=type))
+    result = runner.invoke(app, ["config", "-c", "viperx.yaml"])
+    assert result.exit_code == 0, result.stdout
+    return temp_workspace / "ml_check" / "src" / "ml_check"
+
+
+@pytest.fixture
+def train(runner, temp_workspace, mock_git_config, monkeypatch, tmp_path):
+    """The generated train module, with the config.yaml 'model' section and data dir in tmp_path."""
+    for dep in ("sklearn", "pandas", "requests", "tqdm"):
+        pytest.importorskip(dep)
+    pkg = generate(runner, temp_workspace, monkeypatch)
+    monkeypatch.syspath_prepend(str(pkg.parent))
+    module = importlib.import_module("ml_check.train")
+    config = {"model": yaml.safe_load((pkg / "config.yaml").read_text())["model"]}
+    monkeypatch.setattr(module, "get_config", lambda key, default=None: config.get(key, default))
+    monkeypatch.setattr(module, "get_cache_dir", lambda local=False: tmp_path / "data")
+    yield module
+    for name in [m for m in sys.modules if m.startswith("ml_check")]:
+        del sys.modules[name]
+
+
+def test_generated_content(runner, temp_workspace, mock_git_config, monkeypatch):
+    pkg = generate(runner, temp_workspace, monkeypatch)
+    for name in ("features.py", "train.py"):
+        compile((pkg / name).read_text(), name, "exec")
+    source = (pkg / "train.py").read_text()
+    assert "memory=memory" in source and "cross_validate(" in source
+    assert not (pkg / "pipeline.py").exists()
+
+    model = yaml.safe_load((pkg / "config.yaml").read_text())["model"]
+    assert model["n_jobs"] == -1 and model["target"] == "species"
+
+
+def test_not_generated_for_dl(runner, temp_workspace, mock_git_config, monkeypatch):
+    pkg = generate(runner, temp_workspace, monkeypatch, type="dl")
+    assert not (pkg / "features.py").exists()
+    assert "sklearn" not in (pkg / "train.py").read_text()
+    assert "model" not in yaml.safe_load((pkg / "config.yaml").read_text())
+
+
+def frame():
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    n = 60
+    x = rng.standard_normal(n)
+    return pd.DataFrame({
+        "x": x,
+        "missing": np.where(np.arange(n) % 7 == 0, np.nan, x * 2),
+        "color": pd.Categorical(rng.choice(["red", "blue"], n)),
+        "name": [f"n{i % 5}" for i in range(n)],
+        "flag": x > 0,
+        "label": np.where(x > 0, "pos", "neg"),
+    })
+
+
+def test_pipeline_cache_and_cv(train, tmp_path):
+    from ml_check.features import split_target
+
+    X, y = split_target(frame(), "label")
+    pipeline = train.build_pipeline()
+    assert pipeline.named_steps["model"].n_jobs == -1
+    assert train.pipeline_cache_dir() == tmp_path / "data" / "pipeline_cache"
+
+    pipeline.fit(X, y)
+    assert any((tmp_path / "data" / "pipeline_cache").rglob("*.pkl"))
+    assert pipeline.score(X, y) > 0.9
+
+    scores = train.evaluate(pipeline, X, y, cv_folds=3, n_jobs=2)
+    assert 0.5 < scores["score"] <= 1.0 and scores["fit_seconds"] > 0
+    # The caller's pipeline keeps its parallel estimator
+    assert pipeline.named_steps["model"].n_jobs == -1
+    assert train.build_pipeline(cache=False).memory is None
+
+
+@pytest.mark.parametrize("compress", [3, 0])
+def test_save_and_load(train, tmp_path, compress):
+    from ml_check.features import split_target
+
+    X, y = split_target(frame(), "label")
+    pipeline = train.build_pipeline(n_jobs=1).fit(X, y)
+
+    path = train.save_model(pipeline, compress=compress)
+    assert path == tmp_path / "data" / "models" / "model.joblib"
+    assert [p.name for p in path.parent.iterdir()] == ["model.joblib"]
+    assert pipeline.memory is not None
+
+    loaded = train.load_model(mmap=compress == 0)
+    assert loaded.memory is None
+    assert (loaded.predict(X) == pipeline.predict(X)).all()
@@ -0,0 +1,99 @@
+"""
+Operation-count budgets (deterministic, unlike wall-clock benchmarks):
+- Subprocesses (uv/git), TOML/YAML parses, file writes, unlinks and scans
+  performed by `viperx config -c` on create, no-op update and package add
+- `viperx config update` scan budget
+- `--stats` output
+"""
+
+import os
+
+import pytest
+
+from viperx.main import app
+from viperx.stats import collect_stats
+
+CONFIG = """
+project:
+  name: "demo"
+settings:
+  type: "ml"
+workspace:
+  packages:
+    - name: "worker"
+    - name: "api"
+"""
+
+
+def apply(runner):
+    with collect_stats() as stats:
+        result = runner.invoke(app, ["config", "-c", "viperx.yaml"])
+    assert result.exit_code == 0, result.stdout
+    return stats.summary(), stats.subprocesses()
+
+
+@pytest.fixture
+def workspace(runner, temp_workspace, mock_git_config, mock_builder_check):
+    (temp_workspace / "viperx.yaml").write_text(CONFIG)
+    return temp_workspace
+
+
+def test_create_budget(runner, workspace):
+    counts, subprocesses = apply(runner)
+
+    # One `uv init` per project/package, nothing else
+    assert subprocesses == {"uv init": 3}
+    # viperx.yaml, plus each package's config.yaml (for settings_model.py)
+    assert counts["yaml_parses"] <= 4
+    assert counts["toml_parses"] <= 1
+    assert counts["file_writes"] <= 37
+    assert counts["unlinks"] <= 10
+    assert counts["dir_scans"] <= 3
+
+
+def test_noop_update_budget(runner, workspace):
+    apply(runner)
+    os.chdir(workspace / "demo")
+    counts, subprocesses = apply(runner)
+
+    assert subprocesses == {}
+    assert counts["toml_parses"] <= 1
+    assert counts["yaml_parses"] <= 1
+    assert counts["file_writes"] == 0
+    assert counts["unlinks"] == 0
+    assert counts["dir_scans"] <= 1
+
+
+def test_add_package_budget(runner, workspace):
+    apply(runner)
+    os.chdir(workspace / "demo")
+    (workspace / "demo" / "viperx.yaml").write_text(CONFIG + '    - name: "extra"\n')
+    counts, subprocesses = apply(runner)
+
+    assert subprocesses == {"uv init": 1}
+    # pyproject.toml parsed once for scripts + testpaths updates
+    assert counts["toml_parses"] <= 1
+    assert counts["file_writes"] <= 12
+    assert counts["dir_scans"] <= 2
+
+
+def test_config_update_budget(runner, workspace):
+    apply(runner)
+    os.chdir(workspace / "demo")
+    with collect_stats() as stats:
+        result = runner.invoke(app, ["config", "update"])
+    assert result.exit_code == 0, result.stdout
+
+    counts = stats.summary()
+    assert stats.subprocesses() == {}
+    assert counts["toml_parses"] <= 1
+    assert counts["yaml_parses"] <= 1
+    assert counts["dir_scans"] <= 1
+    assert counts["file_writes"] <= 1
+
+
+def test_cli_stats_flag(runner, workspace):
+    result = runner.invoke(app, ["--stats", "config", "-c", "viperx.yaml"])
+    assert result.exit_code == 0, result.stdout
+    assert "Operation Stats" in result.stderr
+    assert "uv init" in result.stderr
@@ -0,0 +1,184 @@
+"""
+Tests for the generated pipeline.py and train.py (DL projects):
+- Rendered per framework, with their config.yaml 'pipeline' / 'training' sections
+- Not generated for ML projects
+- PyTorch DataLoader / TensorFlow tf.data options from config.yaml and overrides
+- Training loop: precision, gradient accumulation, throughput logs
+(Runtime tests need the selected framework installed; they run on CPU)
+"""
+
+import importlib
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+from viperx.main import app
+
+DL_CONFIG = """
+project:
+  name: "pipe_check"
+settings:
+  type: "{type}"
+  framework: "{framework}"
+"""
+
+
+def generate(runner, temp_workspace, monkeypatch, framework, type="dl"):
+    monkeypatch.setenv("VIPERX_UV", "fake")
+    (temp_workspace / "viperx.yaml").write_text(DL_CONFIG.format(type=type, framework=framework))
+    result = runner.invoke(app, ["config", "-c", "viperx.yaml"])
+    assert result.exit_code == 0, result.stdout
+    return temp_workspace / "pipe_check" / "src" / "pipe_check"
+
+
+@pytest.fixture
+def pipeline(runner, temp_workspace, mock_git_config, monkeypatch, request):
+    """The generated pipeline module for request.param (framework), with a settable config."""
+    framework = request.param
+    pytest.importorskip("torch" if framework == "pytorch" else "tensorflow")
+    pkg = generate(runner, temp_workspace, monkeypatch, framework)
+    monkeypatch.syspath_prepend(str(pkg.parent))
+    module = importlib.import_module("pipe_check.pipeline")
+    config = {"pipeline": yaml.safe_load((pkg / "config.yaml").read_text())["pipeline"]}
+    monkeypatch.setattr(module, "get_config", lambda key, default=None: config.get(key, default))
+    yield module
+    for name in [m for m in sys.modules if m.startswith("pipe_check")]:
+        del sys.modules[name]
+
+
+@pytest.fixture
+def train(pipeline, monkeypatch):
+    """The generated train module, sharing the pipeline's config."""
+    module = importlib.import_module("pipe_check.train")
+    config = {"training": yaml.safe_load((Path(module.__file__).parent / "config.yaml").read_text())["training"]}
+    monkeypatch.setattr(module, "get_config", lambda key, default=None: config.get(key, default))
+    return module
+
+
+@pytest.mark.parametrize("framework, entries", [
+    ("pytorch", ["def make_loader(", "torch.compile(model)", "torch.autocast("]),
+    ("tensorflow", ["def make_dataset(", "@tf.function(jit_compile=", '"mixed_bfloat16"']),
+])
+def test_generated_content(runner, temp_workspace, mock_git_config, monkeypatch, framework, entries):
+    pkg = generate(runner, temp_workspace, monkeypatch, framework)
+    source = ""
+    for name in ("pipeline.py", "train.py"):
+        module_source = (pkg / name).read_text()
+        compile(module_source, name, "exec")
+        assert ("import torch" in module_source) == (framework == "pytorch")
+        assert ("import tensorflow" in module_source) == (framework == "tensorflow")
+        source += module_source
+    assert all(entry in source for entry in entries)
+
+    config = yaml.safe_load((pkg / "config.yaml").read_text())
+    assert config["pipeline"]["batch_size"] == 32
+    assert ("prefetch_factor" in config["pipeline"]) == (framework == "pytorch")
+    assert ("shuffle_buffer" in config["pipeline"]) == (framework == "tensorflow")
+    assert config["training"]["precision"] == "auto"
+
+
+def test_no_pipeline_for_ml(runner, temp_workspace, mock_git_config, monkeypatch):
+    pkg = generate(runner, temp_workspace, monkeypatch, "pytorch", type="ml")
+    assert (pkg / "data_loader.py").exists()
+    assert not (pkg / "pipeline.py").exists()
+    assert "import torch" not in (pkg / "train.py").read_text()  # The scikit-learn one
+    assert "pipeline" not in yaml.safe_load((pkg / "config.yaml").read_text())
+
+
+def counts(stats):
+    return stats["batches"], stats["samples"]
+
+
+@pytest.mark.parametrize("pipeline", ["pytorch"], indirect=True)
+def test_torch_loader(pipeline):
+    import numpy as np
+
+    dataset = pipeline.ArrayDataset(np.arange(100, dtype=np.float64).reshape(50, 2), np.arange(50))
+    assert dataset.features.dtype == pipeline.torch.float32
+
+    loader = pipeline.make_loader(dataset, num_workers=2, batch_size=8)
+    assert loader.num_workers == 2
+    assert loader.persistent_workers and loader.prefetch_factor == 2
+    assert loader.pin_memory == pipeline.torch.cuda.is_available()
+    assert counts(pipeline.measure(loader)) == (6, 48)  # drop_last
+    assert counts(pipeline.measure(loader)) == (6, 48)  # Workers reused
+
+    # Evaluation: every sample, in order; main-process loading takes no worker options
+    pipeline.get_config("pipeline")["batch_size"] = 16
+    val = pipeline.make_loader(dataset, train=False, num_workers=0)
+    assert val.batch_size == 16 and val.prefetch_factor is None
+    _, y = next(iter(val))
+    assert y.tolist() == list(range(16))
+    assert counts(pipeline.measure(val)) == (4, 50)
+
+
+@pytest.mark.parametrize("pipeline", ["tensorflow"], indirect=True)
+def test_tf_dataset(pipeline, tmp_path):
+    import numpy as np
+
+    features = np.arange(100, dtype=np.float32).reshape(50, 2)
+
+    def preprocess(x, y):
+        return x * 2, y
+
+    train = pipeline.make_dataset(features, np.arange(50), preprocess=preprocess, batch_size=8,
+                                  cache_path=str(tmp_path / "cache" / "train"))
+    assert counts(pipeline.measure(train)) == (6, 48)  # drop_last
+    assert counts(pipeline.measure(train)) == (6, 48)  # From the cache
+    assert list((tmp_path / "cache").glob("train*"))
+
+    val = pipeline.make_dataset(features, np.arange(50), preprocess=preprocess, train=False, num_workers=0)
+    x, y = next(iter(val))
+    assert y.numpy().tolist() == list(range(32))
+    assert float(x[1][0]) == 4.0
+    assert counts(pipeline.measure(val)) == (2, 50)
+
+
+def classification_data(samples=64, features=4, classes=3):
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((samples, features), dtype=np.float32)
+    return x, (x @ rng.standard_normal((features, classes))).argmax(axis=1)
+
+
+@pytest.mark.parametrize("pipeline", ["pytorch"], indirect=True)
+@pytest.mark.parametrize("precision", ["fp32", "bf16"])
+def test_torch_fit(pipeline, train, precision, caplog):
+    torch = train.torch
+    cpu = torch.device("cpu")
+    assert train.autocast_dtype(precision, cpu) == (torch.bfloat16 if precision == "bf16" else None)
+
+    x, y = classification_data()
+    loader = pipeline.make_loader(pipeline.ArrayDataset(x, y), batch_size=8, num_workers=0)
+    model = torch.nn.Linear(4, 3)
+    before = model.weight.detach().clone()
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+    steps = []
+    optimizer.register_step_post_hook(lambda *args: steps.append(1))
+
+    with caplog.at_level(logging.INFO, logger=train.__name__):
+        trained = train.fit(model, loader, optimizer=optimizer, epochs=2, compile=False, precision=precision,
+                            accumulation_steps=3, log_every=4, device=cpu)
+
+    assert trained is model and not torch.equal(model.weight, before)
+    assert len(steps) == 2 * 3  # 8 batches per epoch: steps after batches 3, 6 and the last (partial) one
+    assert "Epoch 2 batch 4" in caplog.text and "samples/s" in caplog.text
+
+
+@pytest.mark.parametrize("pipeline", ["tensorflow"], indirect=True)
+def test_tf_fit(pipeline, train, caplog):
+    tf = train.tf
+    assert train.setup_precision("fp32") == "float32"
+    x, y = classification_data()
+    model = tf.keras.Sequential([tf.keras.Input(shape=(4,)), tf.keras.layers.Dense(3)])
+    before = model.get_weights()[0].copy()
+
+    with caplog.at_level(logging.INFO, logger=train.__name__):
+        train.fit(model, pipeline.make_dataset(x, y, batch_size=8), epochs=2, accumulation_steps=3, log_every=4)
+
+    assert (model.get_weights()[0] != before).any()
+    assert "Epoch 2 batch 4" in caplog.text and "samples/s" in caplog.text
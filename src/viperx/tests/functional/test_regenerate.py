@@ -0,0 +1,122 @@
+"""
+Tests for the render manifest and `viperx regenerate`:
+- .viperx/manifest.json written at generation (root + workspace packages)
+- Template change re-renders only affected, unedited files
+- User-edited files are reported, never overwritten
+- Up-to-date projects are left untouched
+- Files ViperX edits after rendering (pyproject.toml) are not conflicts
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from viperx.main import app
+
+CONFIG = """
+project:
+  name: "demo"
+  license: "MIT"
+
+settings:
+  type: "classic"
+  use_env: false
+  use_config: true
+  use_tests: true
+
+workspace:
+  packages:
+    - name: "worker"
+"""
+
+
+@pytest.fixture
+def project(runner, temp_workspace, mock_git_config, mock_builder_check):
+    """A generated workspace (demo + worker), cwd set to the project root."""
+    (temp_workspace / "viperx.yaml").write_text(CONFIG)
+    result = runner.invoke(app, ["config", "-c", "viperx.yaml"])
+    assert result.exit_code == 0, result.stdout
+
+    root = temp_workspace / "demo"
+    os.chdir(root)
+    return root
+
+
+def load_manifest(root: Path) -> dict:
+    return json.loads((root / ".viperx" / "manifest.json").read_text())
+
+
+def test_manifest_written_on_generation(project):
+    files = load_manifest(project)["files"]
+
+    assert files["src/demo/config.py"]["package"] == "demo"
+    assert files["src/demo/config.py"]["template"] == "config.py.j2"
+    assert files["src/worker/config.py"]["package"] == "worker"
+    assert files["src/worker/config.py"]["subpackage"] is True
+    # Contexts are stored once and shared by files
+    assert len(load_manifest(project)["contexts"]) <= 2
+
+
+def test_regenerate_up_to_date_touches_nothing(runner, project):
+    before = {p: p.stat().st_mtime_ns for p in project.rglob("*.py")}
+    result = runner.invoke(app, ["regenerate"])
+
+    assert result.exit_code == 0, result.stdout
+    assert "Nothing to change" in result.stdout
+    assert {p: p.stat().st_mtime_ns for p in project.rglob("*.py")} == before
+
+
+def test_regenerate_template_change_skips_user_edits(runner, project, tmp_path):
+    user_dir = tmp_path / "user_templates"
+    user_dir.mkdir()
+    (user_dir / "config.py.j2").write_text("# custom config for {{ package_name }}\n")
+
+    worker_config = project / "src" / "worker" / "config.py"
+    worker_config.write_text(worker_config.read_text() + "# my tweak\n")
+    readme_before = (project / "README.md").read_text()
+
+    with patch("viperx.constants.USER_TEMPLATES_DIR", user_dir):
+        dry = runner.invoke(app, ["regenerate", "--dry-run"])
+        assert dry.exit_code == 0, dry.stdout
+        assert "src/demo/config.py (template changed)" in dry.stdout
+        assert "# custom config" not in (project / "src" / "demo" / "config.py").read_text()
+
+        result = runner.invoke(app, ["regenerate"])
+
+    assert result.exit_code == 0, result.stdout
+    assert (project / "src" / "demo" / "config.py").read_text() == "# custom config for demo"
+    # Edited file reported, kept as is
+    assert "src/worker/config.py: modified since generation" in result.stdout
+    assert worker_config.read_text().endswith("# my tweak\n")
+    # Unrelated files untouched
+    assert (project / "README.md").read_text() == readme_before
+
+    entry = load_manifest(project)["files"]["src/demo/config.py"]
+    from viperx.manifest import digest_text
+    assert entry["output_digest"] == digest_text("# custom config for demo")
+
+
+def test_regenerate_after_adding_package(runner, project):
+    workspace = project.parent
+    os.chdir(workspace)
+    (workspace / "viperx.yaml").write_text(CONFIG + '    - name: "extra"\n')
+    result = runner.invoke(app, ["config", "-c", "viperx.yaml"])
+    assert result.exit_code == 0, result.stdout
+    assert "src/extra/tests" in (project / "pyproject.toml").read_text()
+
+    os.chdir(project)
+    result = runner.invoke(app, ["regenerate", "--dry-run"])
+    assert result.exit_code == 0, result.stdout
+    assert "modified since generation" not in result.stdout
+    assert "Conflicts" not in result.stdout
+
+
+def test_regenerate_without_manifest(runner, tmp_path):
+    (tmp_path / "viperx.yaml").write_text(CONFIG)
+    result = runner.invoke(app, ["regenerate", "-c", str(tmp_path / "viperx.yaml")])
+
+    assert result.exit_code == 0
+    assert "No .viperx/manifest.json found" in result.stdout
@@ -1,3 +1,4 @@
+import json
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock 
@@ -131,37 +132,116 @@ def test_full_override(tmp_path):
         assert readme == "# USER README"
         assert pyproject == "# USER PYPROJECT"
 
-def test_add_template_pack_mocked(manager, tmp_path):
-    """Test the add_template_pack logic with mocked git clone."""
+def _git(cwd, *args):
+    import subprocess
+    return subprocess.run(
+        ["git", "-c", "user.name=T", "-c", "user.email=t@example.com", *args],
+        cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def pack_repo(tmp_path):
+    """A local git repo acting as a template pack (nested .j2 files to test flattening)."""
+    repo = tmp_path / "pack_src"
+    (repo / "subdir").mkdir(parents=True)
+    (repo / "subdir" / "new.j2").write_text("NEW {{ project_name }}")
+    (repo / "root.j2").write_text("ROOT")
+    (repo / "notes.txt").write_text("not a template")
+    _git(repo, "init", "-q")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-qm", "v1")
+    _git(repo, "tag", "v1")
+    return repo
+
+
+@pytest.fixture
+def pack_manager(manager, tmp_path):
     manager.user_dir = tmp_path / "user_tmpl"
-    
-    # Simulate a downloaded repo in a temp dir
-    with patch("viperx.templates.tempfile.TemporaryDirectory") as mock_temp:
-        # We need the context manager to return a path that actually has files
-        # So we create a real temp dir for the 'mock' to return
-        real_temp_clone = tmp_path / "clone_source"
-        real_temp_clone.mkdir()
-        
-        # Create some j2 files in subfolders to test flattening
-        (real_temp_clone / "subdir").mkdir()
-        (real_temp_clone / "subdir" / "new.j2").write_text("NEW")
-        (real_temp_clone / "root.j2").write_text("ROOT")
-        
-        # Mock the __enter__ return value
-        mock_temp.return_value.__enter__.return_value = str(real_temp_clone)
-        
-        with patch("viperx.templates.subprocess.run") as mock_run:
-            manager.add_template_pack("https://git.fake/repo.git")
-            
-            # Verify git clone was called
-            mock_run.assert_called_with(
-                ["git", "clone", "--depth", "1", "https://git.fake/repo.git", str(real_temp_clone)],
-                check=True,
-                capture_output=True
-            )
-            
-            # Verify files were copied to user_dir
-            assert (manager.user_dir / "new.j2").exists()
-            assert (manager.user_dir / "root.j2").exists()
-            assert (manager.user_dir / "new.j2").read_text() == "NEW"
+    manager.packs_dir = tmp_path / "cache"
+    return manager
+
+
+def test_add_template_pack_local_repo(pack_manager, pack_repo):
+    """Install from a local file:// repo: flattened, cached by commit, recorded in index."""
+    pack_manager.add_template_pack(pack_repo.as_uri())
+
+    assert (pack_manager.user_dir / "new.j2").read_text() == "NEW {{ project_name }}"
+    assert (pack_manager.user_dir / "root.j2").read_text() == "ROOT"
+    assert not (pack_manager.user_dir / "notes.txt").exists()
+
+    commit = _git(pack_repo, "rev-parse", "HEAD")
+    index = json.loads((pack_manager.packs_dir / "index.json").read_text())
+    (entry,) = index.values()
+    assert entry["commit"] == commit
+    assert entry["refs"]["HEAD"] == commit
+    assert list((pack_manager.packs_dir / "packs").glob(f"*/{commit}/subdir/new.j2"))
+
+
+def test_add_template_pack_pinned_ref_and_incremental_update(pack_manager, pack_repo):
+    pack_manager.add_template_pack(str(pack_repo), ref="v1")
+    v1 = _git(pack_repo, "rev-parse", "v1")
+
+    (pack_repo / "root.j2").write_text("ROOT v2")
+    _git(pack_repo, "commit", "-qam", "v2")
+
+    # Pinned ref keeps the old content
+    pack_manager.add_template_pack(str(pack_repo), ref="v1")
+    assert (pack_manager.user_dir / "root.j2").read_text() == "ROOT"
+
+    # Default ref follows the branch tip via git fetch
+    pack_manager.add_template_pack(str(pack_repo))
+    assert (pack_manager.user_dir / "root.j2").read_text() == "ROOT v2"
+
+    # Pinning a commit that is already cached needs no git at all
+    with patch("viperx.templates.subprocess.run") as mock_run:
+        pack_manager.add_template_pack(str(pack_repo), ref=v1)
+        mock_run.assert_not_called()
+    assert (pack_manager.user_dir / "root.j2").read_text() == "ROOT"
+
+
+def test_add_template_pack_offline(pack_manager, pack_repo, capsys):
+    # Nothing cached yet: offline install refuses
+    pack_manager.add_template_pack(str(pack_repo), offline=True)
+    assert "not in the cache" in capsys.readouterr().out
+    assert not (pack_manager.user_dir / "root.j2").exists()
+
+    pack_manager.add_template_pack(str(pack_repo), ref="v1")
+    (pack_manager.user_dir / "root.j2").unlink()
+
+    # Source repo gone: the cache still serves the pinned ref
+    import shutil
+    shutil.rmtree(pack_repo)
+    index = json.loads((pack_manager.packs_dir / "index.json").read_text())
+    (url,) = [e["url"] for e in index.values()]
+    pack_manager.add_template_pack(url, ref="v1", offline=True)
+    assert (pack_manager.user_dir / "root.j2").read_text() == "ROOT"
+
+
+def test_add_template_pack_rejects_invalid_templates(pack_manager, pack_repo, capsys):
+    (pack_repo / "broken.j2").write_text("{% if %}")
+    _git(pack_repo, "add", ".")
+    _git(pack_repo, "commit", "-qm", "broken")
+
+    pack_manager.add_template_pack(str(pack_repo))
+
+    assert "broken.j2" in capsys.readouterr().out
+    assert not pack_manager.user_dir.exists()
+    assert not list((pack_manager.packs_dir / "packs").glob("*/*/root.j2"))
+
+
+def test_add_template_pack_rejects_non_utf8_templates(pack_manager, pack_repo, capsys):
+    (pack_repo / "latin1.j2").write_bytes("caf\u00e9 {{ x }}".encode("latin-1"))
+    _git(pack_repo, "add", ".")
+    _git(pack_repo, "commit", "-qm", "latin-1")
+
+    pack_manager.add_template_pack(str(pack_repo))
+
+    assert "latin1.j2: not UTF-8" in capsys.readouterr().out
+    assert not pack_manager.user_dir.exists()
+    assert not list((pack_manager.packs_dir / "packs").glob("*/*/root.j2"))
+
 
+def test_add_template_pack_fetch_failure(pack_manager, tmp_path, capsys):
+    pack_manager.add_template_pack((tmp_path / "missing").as_uri())
+    assert "Failed to fetch" in capsys.readouterr().out
@@ -34,7 +34,7 @@ def test_workspace_overrides(runner, temp_workspace, mock_git_config, mock_build
     
     # Verify Content (Init should import config)
     init_rich = (pkg_rich / "__init__.py").read_text()
-    assert "from .config import SETTINGS" in init_rich
+    assert '"SETTINGS", "get_config"' in init_rich
     
     # Check pkg_lean
     pkg_lean = root / "src" / "pkg_lean"
@@ -44,7 +44,7 @@ def test_workspace_overrides(runner, temp_workspace, mock_git_config, mock_build
     
     # Verify Content (Init should NOT import config)
     init_lean = (pkg_lean / "__init__.py").read_text()
-    assert "from .config import SETTINGS" not in init_lean
+    assert "SETTINGS" not in init_lean
     
     # Check Smart Test Config (Root pyproject)
     pyproject = (root / "pyproject.toml").read_text()
@@ -0,0 +1,113 @@
+"""
+Tests for the instrumentation API:
+- Fan-out of spans/counters to several backends
+- OTLP-JSON lines file exporter (parent/child spans, counters on shutdown)
+- Entry point plugins (selected by name, broken plugins ignored)
+- Wiring through the CLI (--otlp-file)
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from viperx import instrumentation
+from viperx.instrumentation import Instrument, OTLPFileExporter, count, span, traced
+
+
+class Recorder(Instrument):
+    def __init__(self):
+        self.spans = []
+        self.counters = []
+
+    def start_span(self, name, category, attributes):
+        return name
+
+    def end_span(self, handle):
+        self.spans.append(handle)
+
+    def add(self, name, value, attributes):
+        self.counters.append((name, value, attributes))
+
+
+@pytest.fixture
+def recorder():
+    rec = instrumentation.register(Recorder())
+    yield rec
+    instrumentation.shutdown()
+
+
+def test_spans_and_counters_reach_backends(recorder):
+    other = instrumentation.register(Recorder())
+
+    @traced("outer")
+    def outer():
+        with span("inner"):
+            count("viperx.files", 2, kind="toml")
+
+    outer()
+    for rec in (recorder, other):
+        assert rec.spans == ["inner", "outer"]
+        assert rec.counters == [("viperx.files", 2, {"kind": "toml"})]
+
+
+def test_otlp_file_exporter(tmp_path):
+    out = tmp_path / "spans.jsonl"
+    instrumentation.register(OTLPFileExporter(out))
+    with span("ConfigEngine.apply", path="viperx.yaml"):
+        with span("toml.parse", "parse"):
+            pass
+    count("viperx.templates.rendered", template="README.md.j2")
+    count("viperx.templates.rendered", template="README.md.j2")
+    instrumentation.shutdown()
+
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    child, parent = (line["resourceSpans"][0]["scopeSpans"][0]["spans"][0] for line in lines[:2])
+    assert child["name"] == "toml.parse"
+    assert child["parentSpanId"] == parent["spanId"]
+    assert parent["parentSpanId"] == ""
+    assert child["traceId"] == parent["traceId"]
+    assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+    assert {"key": "path", "value": {"stringValue": "viperx.yaml"}} in parent["attributes"]
+
+    (metric,) = lines[2]["resourceMetrics"][0]["scopeMetrics"][0]["metrics"]
+    assert metric["name"] == "viperx.templates.rendered"
+    assert metric["sum"]["dataPoints"][0]["asDouble"] == 2
+
+
+def test_load_plugins_by_name():
+    good = MagicMock()
+    good.name = "acme"
+    good.load.return_value = Recorder
+    broken = MagicMock()
+    broken.name = "broken"
+    broken.load.side_effect = ImportError("missing dependency")
+    skipped = MagicMock()
+    skipped.name = "other"
+
+    with patch("importlib.metadata.entry_points", return_value=[good, broken, skipped]) as eps:
+        loaded = instrumentation.load_plugins("acme,broken")
+    try:
+        eps.assert_called_once_with(group="viperx.instrumentation")
+        assert len(loaded) == 1 and isinstance(loaded[0], Recorder)
+        skipped.load.assert_not_called()
+        assert instrumentation.enabled()
+    finally:
+        instrumentation.shutdown()
+
+
+def test_cli_otlp_file(runner, temp_workspace):
+    from viperx.main import app
+    (temp_workspace / "viperx.yaml").write_text('viperx_version: "1.0.0"\nproject:\n  name: "demo"\n')
+    out = temp_workspace / "spans.jsonl"
+
+    result = runner.invoke(app, ["--otlp-file", str(out), "migrate", "--dry-run"])
+    assert result.exit_code == 0, result.stdout
+    assert not instrumentation.enabled()
+
+    names = set()
+    for line in out.read_text().splitlines():
+        for rs in json.loads(line).get("resourceSpans", []):
+            names.update(s["name"] for s in rs["scopeSpans"][0]["spans"])
+    assert "migrations.migrate_project" in names
+    assert "migration 1.0.0 -> 1.0.1" in names
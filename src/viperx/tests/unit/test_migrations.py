@@ -0,0 +1,230 @@
+"""
+Tests for the migration planner:
+- Numeric version ordering ("1.10.0" > "1.9.0")
+- Shortest path selection through the migration graph
+- Single read/write of viperx.yaml per run
+- Transactional ProjectView (lazy load, diff, atomic commit, rollback)
+- `viperx migrate` reports broken project files but lets bugs propagate
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from viperx.migrations import (
+    Migration,
+    get_project_version,
+    migrate_project,
+    parse_version,
+    plan_migrations,
+    run_migrations,
+)
+from viperx.migrations.project_view import ProjectView
+
+
+def make_migration(src: str, dst: str, changes: list[str] | None = None) -> Migration:
+    """Build an ad-hoc migration instance for planning tests."""
+    class _M(Migration):
+        from_version = src
+        to_version = dst
+        description = f"{src} -> {dst}"
+
+        def apply(self, project: ProjectView, dry_run: bool = False) -> list[str]:
+            return list(changes or [f"{src} -> {dst}"])
+
+    return _M()
+
+
+def test_parse_version_numeric_ordering():
+    assert parse_version("1.10.0") > parse_version("1.9.0")
+    assert parse_version("1.0") == parse_version("1.0.0")
+    assert parse_version("v2.1.3rc1") == (2, 1, 3)
+    assert parse_version("unknown") == ()
+
+
+def test_plan_orders_numerically():
+    m1 = make_migration("1.9.0", "1.10.0")
+    m2 = make_migration("1.10.0", "1.11.0")
+    plan = plan_migrations("1.9.0", "1.11.0", [m2, m1])
+    assert plan == [m1, m2]
+
+
+def test_plan_prefers_shortest_path():
+    a = make_migration("1.0.0", "1.1.0")
+    b = make_migration("1.1.0", "1.2.0")
+    shortcut = make_migration("1.0.0", "1.2.0")
+    plan = plan_migrations("1.0.0", "1.2.0", [a, b, shortcut])
+    assert plan == [shortcut]
+
+
+def test_plan_respects_target_and_skips_gaps():
+    old = make_migration("1.0.0", "1.0.1")
+    later = make_migration("1.5.0", "1.6.0")
+    future = make_migration("2.0.0", "2.1.0")
+    # Project at 1.3.0 jumps to 1.5.0 (no migration in between) and stops before 2.x
+    plan = plan_migrations("1.3.0", "1.9.0", [old, later, future])
+    assert plan == [later]
+
+
+def test_plan_legacy_project_starts_from_oldest():
+    a = make_migration("1.0.0", "1.0.1")
+    b = make_migration("1.0.1", "1.0.2")
+    assert plan_migrations(None, "1.7.0", [b, a]) == [a, b]
+
+
+def test_plan_up_to_date():
+    a = make_migration("1.0.0", "1.0.1")
+    assert plan_migrations("1.0.1", "1.7.0", [a]) == []
+
+
+def test_run_migrations_writes_once(tmp_path):
+    config = tmp_path / "viperx.yaml"
+    config.write_text('# header\nviperx_version: "1.0.0"\nproject:\n  name: "demo"\n')
+
+    chain = [make_migration("1.0.0", "1.0.1"), make_migration("1.0.1", "1.0.2")]
+    from viperx.migrations import project_view
+    with patch("viperx.migrations.MIGRATIONS", chain), \
+         patch.object(project_view, "atomic_write_text", wraps=project_view.atomic_write_text) as mock_write:
+        changes = run_migrations(tmp_path, "1.7.0")
+
+    assert changes == ["1.0.0 -> 1.0.1", "1.0.1 -> 1.0.2"]
+    assert mock_write.call_count == 1
+    assert get_project_version(tmp_path) == "1.0.2"
+    assert config.read_text().startswith("# header\n")
+
+
+def test_run_migrations_dry_run_does_not_write(tmp_path):
+    config = tmp_path / "viperx.yaml"
+    original = 'viperx_version: "1.0.0"\nproject:\n  name: "demo"\n'
+    config.write_text(original)
+
+    with patch("viperx.migrations.MIGRATIONS", [make_migration("1.0.0", "1.0.1")]):
+        changes = run_migrations(tmp_path, "1.7.0", dry_run=True)
+
+    assert changes == ["1.0.0 -> 1.0.1"]
+    assert config.read_text() == original
+
+
+class BumpDescription(Migration):
+    """Edits pyproject.toml through the shared view."""
+    from_version = "1.0.0"
+    to_version = "1.1.0"
+    description = "Rewrite description"
+
+    def apply(self, project: ProjectView, dry_run: bool = False) -> list[str]:
+        project.toml()["project"]["description"] = "migrated"
+        return ["description migrated"]
+
+
+class Explode(Migration):
+    from_version = "1.1.0"
+    to_version = "1.2.0"
+    description = "Always fails"
+
+    def apply(self, project: ProjectView, dry_run: bool = False) -> list[str]:
+        project.write_text("NEW_FILE.txt", "should never land")
+        raise RuntimeError("boom")
+
+
+@pytest.fixture
+def sample_project(tmp_path):
+    (tmp_path / "viperx.yaml").write_text('viperx_version: "1.0.0"\nproject:\n  name: "demo"\n')
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "demo"\ndescription = "old"\n')
+    return tmp_path
+
+
+def test_project_view_is_lazy_and_parses_once(sample_project):
+    view = ProjectView(sample_project)
+    with patch("tomlkit.parse", wraps=__import__("tomlkit").parse) as mock_parse:
+        view.toml()["project"]["description"] = "a"
+        view.toml()["project"]["name"] = "b"
+    assert mock_parse.call_count == 1
+    assert view.changed_files() == ["pyproject.toml"]
+    # Disk untouched until commit
+    assert 'description = "old"' in (sample_project / "pyproject.toml").read_text()
+
+
+def test_project_view_diff_and_commit(sample_project):
+    view = ProjectView(sample_project)
+    view.toml()["project"]["description"] = "new"
+    view.write_text("docs/NOTES.md", "hello\n")
+
+    diff = view.diff()
+    assert '-description = "old"' in diff
+    assert '+description = "new"' in diff
+    assert "--- /dev/null" in diff and "+++ b/docs/NOTES.md" in diff
+
+    assert view.commit() == ["docs/NOTES.md", "pyproject.toml"]
+    assert 'description = "new"' in (sample_project / "pyproject.toml").read_text()
+    assert (sample_project / "docs" / "NOTES.md").read_text() == "hello\n"
+    assert view.changed_files() == []
+
+
+def test_project_view_commit_restores_on_failure(sample_project):
+    view = ProjectView(sample_project)
+    view.write_text("pyproject.toml", "[project]\nname = 'changed'\n")
+    view.write_text("viperx.yaml", "broken")
+
+    calls = []
+    from viperx.migrations import project_view
+
+    def flaky_write(path, content):
+        calls.append(path.name)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        Path(path).write_text(content)
+
+    with patch.object(project_view, "atomic_write_text", side_effect=flaky_write):
+        with pytest.raises(OSError):
+            view.commit()
+
+    assert 'description = "old"' in (sample_project / "pyproject.toml").read_text()
+    assert 'viperx_version: "1.0.0"' in (sample_project / "viperx.yaml").read_text()
+
+
+def test_migrate_project_dry_run_shows_diff(sample_project):
+    with patch("viperx.migrations.MIGRATIONS", [BumpDescription()]):
+        result = migrate_project(sample_project, "1.7.0", dry_run=True)
+
+    assert result.changes == ["description migrated"]
+    assert result.to_version == "1.1.0"
+    assert sorted(result.files) == ["pyproject.toml", "viperx.yaml"]
+    assert '+description = "migrated"' in result.diff
+    assert '+viperx_version: "1.1.0"' in result.diff
+    assert 'description = "old"' in (sample_project / "pyproject.toml").read_text()
+
+
+def test_migrate_project_rolls_back_on_failure(sample_project):
+    before = (sample_project / "pyproject.toml").read_text()
+    with patch("viperx.migrations.MIGRATIONS", [BumpDescription(), Explode()]):
+        with pytest.raises(RuntimeError):
+            migrate_project(sample_project, "1.7.0")
+
+    assert (sample_project / "pyproject.toml").read_text() == before
+    assert get_project_version(sample_project) == "1.0.0"
+    assert not (sample_project / "NEW_FILE.txt").exists()
+
+
+def test_cli_migrate_reports_unparseable_project(runner, sample_project, monkeypatch):
+    from viperx.main import app
+
+    (sample_project / "pyproject.toml").write_text("[project\n")
+    monkeypatch.chdir(sample_project)
+    with patch("viperx.migrations.MIGRATIONS", [BumpDescription()]):
+        result = runner.invoke(app, ["migrate", "--to", "1.7.0"])
+
+    assert result.exit_code == 1
+    assert "Migration failed" in result.stdout
+    assert get_project_version(sample_project) == "1.0.0"
+
+
+def test_cli_migrate_propagates_unexpected_errors(runner, sample_project, monkeypatch):
+    from viperx.main import app
+
+    monkeypatch.chdir(sample_project)
+    with patch("viperx.migrations.MIGRATIONS", [BumpDescription(), Explode()]):
+        result = runner.invoke(app, ["migrate", "--to", "1.7.0"])
+
+    assert isinstance(result.exception, RuntimeError)
+    assert get_project_version(sample_project) == "1.0.0"
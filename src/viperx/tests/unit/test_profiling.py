@@ -0,0 +1,81 @@
+"""
+Tests for trace-level profiling (`viperx --profile trace.json`):
+- Spans, traced functions and phases are no-ops when disabled
+- Chrome trace-event output (complete "X" events)
+- Phases split a traced function and close on return
+- Top-N summary aggregation
+"""
+
+import json
+
+import pytest
+
+from viperx import instrumentation, profiling
+from viperx.instrumentation import phase, span, traced
+
+
+@pytest.fixture
+def profiler():
+    profiler = profiling.start()
+    yield profiler
+    profiling.stop()
+
+
+def test_disabled_records_nothing():
+    assert not instrumentation.enabled()
+    with span("noop"):
+        phase("ignored")
+    assert traced("f")(lambda: 42)() == 42
+
+
+def test_span_writes_chrome_trace(profiler, tmp_path):
+    with span("toml.parse", "parse", path="pyproject.toml"):
+        pass
+
+    out = tmp_path / "trace.json"
+    profiler.write(out)
+    (event,) = json.loads(out.read_text())["traceEvents"]
+    assert event["name"] == "toml.parse"
+    assert event["cat"] == "parse"
+    assert event["ph"] == "X"
+    assert event["dur"] >= 0
+    assert event["args"] == {"path": "pyproject.toml"}
+
+
+def test_phases_split_traced_function(profiler):
+    @traced("apply")
+    def apply():
+        phase("load")
+        phase("write")
+        return "done"
+
+    assert apply() == "done"
+    names = [e["name"] for e in profiler.events]
+    assert names == ["apply: load", "apply: write", "apply"]
+
+    events = {e["name"]: e for e in profiler.events}
+    assert events["apply: load"]["ts"] <= events["apply: write"]["ts"]
+    assert events["apply: write"]["ts"] + events["apply: write"]["dur"] <= \
+        events["apply"]["ts"] + events["apply"]["dur"] + 1
+
+
+def test_phase_closed_on_exception(profiler):
+    @traced("apply")
+    def apply():
+        phase("boom")
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        apply()
+    assert [e["name"] for e in profiler.events] == ["apply: boom", "apply"]
+
+
+def test_summary_top_n(profiler):
+    profiler.add_event("render", "render", 0, 2_000_000)
+    profiler.add_event("render", "render", 0, 1_000_000)
+    profiler.add_event("uv init", "subprocess", 0, 5_000_000)
+
+    rows = profiler.summary(top=1)
+    assert rows == [{"name": "uv init", "count": 1, "total_ms": 5.0, "max_ms": 5.0}]
+    render = profiler.summary()[1]
+    assert (render["count"], render["total_ms"], render["max_ms"]) == (2, 3.0, 2.0)
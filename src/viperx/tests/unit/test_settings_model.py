@@ -0,0 +1,91 @@
+"""
+Tests for the settings_model.py generator (viperx.settings_model):
+- Type inference (scalars, nested mappings, lists, nulls)
+- Identifier and class name sanitization
+- Generated classes: frozen, slotted, validated once in from_dict()
+"""
+
+import dataclasses
+import importlib
+import sys
+from typing import Any, Mapping
+
+import pytest
+
+from viperx.settings_model import render_settings_model
+
+SETTINGS = {
+    "project_name": "demo",
+    "threshold": 0.5,
+    "debug": False,
+    "data_cache": {"max_size_gb": 20},
+    "data_urls": {},
+    "tags": ["a", "b"],
+    "mixed": [1, "a"],
+    "optional": None,
+    "class": 1,
+    "my-key": {"data_cache": {"limit": 3}},
+}
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    """Import the rendered model from a package whose config.py holds SETTINGS."""
+    pkg = tmp_path / "demo_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "config.py").write_text(f"SETTINGS = {SETTINGS!r}\n")
+    (pkg / "settings_model.py").write_text(render_settings_model(SETTINGS, "demo_pkg"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield importlib.import_module("demo_pkg.settings_model")
+    for name in [m for m in sys.modules if m.startswith("demo_pkg")]:
+        del sys.modules[name]
+
+
+def test_inferred_fields(model):
+    hints = {f.name: f.type for f in dataclasses.fields(model.Settings)}
+    assert hints == {
+        "project_name": str,
+        "threshold": float,
+        "debug": bool,
+        "data_cache": model.DataCache,
+        "data_urls": Mapping[str, Any],
+        "tags": tuple[str, ...],
+        "mixed": tuple[Any, ...],
+        "optional": Any,
+        "class_": int,
+        "my_key": model.MyKey,
+    }
+    # Same key under another parent gets a distinct class
+    assert [f.type for f in dataclasses.fields(model.MyKey)] == [model.MyKeyDataCache]
+
+
+def test_get_settings_is_frozen_and_cached(model):
+    settings = model.get_settings()
+    assert settings.data_cache.max_size_gb == 20
+    assert settings.my_key.data_cache.limit == 3
+    assert settings.tags == ("a", "b")
+    assert model.get_settings() is settings
+    assert not hasattr(settings, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.threshold = 1.0
+
+
+def test_validation(model):
+    # Ints are accepted (and converted) for floats
+    assert model.Settings.from_dict({**SETTINGS, "threshold": 1}).threshold == 1.0
+
+    with pytest.raises(TypeError, match="'data_cache.max_size_gb' should be int, got str"):
+        model.Settings.from_dict({**SETTINGS, "data_cache": {"max_size_gb": "20"}})
+    with pytest.raises(TypeError, match="'debug' should be bool, got int"):
+        model.Settings.from_dict({**SETTINGS, "debug": 1})
+    with pytest.raises(TypeError, match=r"'tags\[1\]' should be str"):
+        model.Settings.from_dict({**SETTINGS, "tags": ["a", 2]})
+    with pytest.raises(ValueError, match="missing 'my-key.data_cache.limit'"):
+        model.Settings.from_dict({**SETTINGS, "my-key": {"data_cache": {}}})
+
+
+def test_empty_config():
+    source = render_settings_model({}, "demo_pkg")
+    compile(source, "settings_model.py", "exec")
+    assert "class Settings:" in source
@@ -4,22 +4,60 @@ ViperX Utilities - Helper Functions
 Pure utility functions for:
 - Project name sanitization (hyphens to underscores, valid Python identifiers)
 - Input validation (project names, choices)
-- Builder detection (uv, hatch)
+- Builder detection (uv, hatch) and uv executable selection
 - Git configuration reading (author name/email)
+- Atomic file writes
+- Dev dependency group edits (pyproject.toml, comments preserved)
 
-All functions are stateless and side-effect free (except git reading).
+All functions are stateless and side-effect free (except git reading and file writes).
 """
+import os
 import re
 import shutil
+import subprocess
+import tempfile
+from pathlib import Path
 from rich.console import Console
-from viperx.constants import SUPPORTED_BUILDERS
+from viperx.constants import BUILDER_UV, FAKE_UV, SUPPORTED_BUILDERS, UV_ENV_VAR
+from viperx.instrumentation import count, span
 
 console = Console()
 
+# Process umask, read once: os.umask() can only be read by setting it, which
+# would race with files created by other threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 def check_uv_installed() -> bool:
     """Check if 'uv' is installed and accessible."""
     return shutil.which("uv") is not None
 
+def resolve_uv(uv: str | None = None) -> str:
+    """
+    uv executable to run: `uv` if given, else the VIPERX_UV env var, else
+    `uv` on PATH. "fake" selects the offline stand-in (viperx.fake_uv).
+    """
+    return uv or os.environ.get(UV_ENV_VAR) or BUILDER_UV
+
+def run_uv(args: list[str], cwd: Path, uv: str = BUILDER_UV, capture_output: bool = False):
+    """
+    Run `uv <args>` in cwd, raising CalledProcessError on failure.
+    The fake stand-in runs in-process: no interpreter start-up, no network.
+    """
+    if uv != FAKE_UV:
+        subprocess.run([uv, *args], cwd=cwd, check=True, capture_output=capture_output)
+        return
+
+    import contextlib
+    import io
+
+    from viperx import fake_uv
+    output = io.StringIO() if capture_output else None
+    with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+        status = fake_uv.main(list(args), cwd=cwd)
+    if status:
+        raise subprocess.CalledProcessError(status, [uv, *args])
+
 def sanitize_project_name(name: str) -> str:
     """
     Sanitize the project name to be a valid Python package name.
@@ -78,8 +116,10 @@ def get_author_from_git() -> tuple[str, str]:
         import git
         # Robust way using git command wrapper
         reader = git.Git().config
-        name = reader("--global", "--get", "user.name")
-        email = reader("--global", "--get", "user.email")
+        with span("subprocess: git config", "subprocess"):
+            name = reader("--global", "--get", "user.name")
+        with span("subprocess: git config", "subprocess"):
+            email = reader("--global", "--get", "user.email")
         
         # strip newlines if any
         return (name.strip() if name else "Nameless", 
@@ -87,3 +127,59 @@ def get_author_from_git() -> tuple[str, str]:
     except Exception:
         # Fallback if git call fails
         return "Nameless", "nameless@example.com"
+
+
+def write_text(path: Path, content: str, append: bool = False):
+    """
+    Write (or append) text to a file, counted as one `viperx.fs.writes`.
+    Generation and sync write project files through here (or atomic_write_text).
+    """
+    count("viperx.fs.writes")
+    with open(path, "a" if append else "w") as f:
+        f.write(content)
+
+
+def atomic_write_text(path: Path, content: str):
+    """
+    Write text to a file atomically.
+    Content goes to a temporary file in the same directory, then replaces the
+    target with os.replace(), so readers never observe a half-written file.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write_text(tmp_name, content)
+        if path.exists():
+            shutil.copymode(path, tmp_name)
+        else:
+            # mkstemp creates 0600 files; use the regular umask-based mode instead
+            os.chmod(tmp_name, 0o666 & ~_UMASK)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def add_dev_requirement(pyproject_path: Path, requirement: str) -> bool:
+    """
+    Add requirement to [dependency-groups] dev of a pyproject.toml (comments preserved).
+    Returns False, leaving the file untouched, if it does not exist or already
+    requires the same distribution.
+    """
+    import tomlkit
+    pyproject_path = Path(pyproject_path)
+    if not pyproject_path.exists():
+        return False
+    with span("toml.parse", "parse", path=pyproject_path):
+        doc = tomlkit.parse(pyproject_path.read_text())
+    name = re.split(r"[<>=!~;\[ ]", requirement, maxsplit=1)[0].lower()
+    groups = doc.setdefault("dependency-groups", tomlkit.table())
+    dev = groups.setdefault("dev", tomlkit.array())
+    if any(re.split(r"[<>=!~;\[ ]", str(req), maxsplit=1)[0].lower() == name for req in dev):
+        return False
+    dev.append(requirement)
+    dev.multiline(True)
+    atomic_write_text(pyproject_path, doc.as_string())
+    return True